@@ -0,0 +1,55 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Garde-fou sur le coût d'import du cœur de résolution : mesure `import src.solver` dans un
+# interpréteur neuf (python -X importtime), vérifie qu'aucun module graphique n'est chargé et
+# que le temps cumulé reste sous le seuil. Code de sortie non nul en cas de régression.
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+FORBIDDEN = ("tkinter", "matplotlib", "pandas", "mpl_toolkits", "PIL")
+DEFAULT_MODULE = "src.solver"
+DEFAULT_BUDGET_MS = 400.0
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module=DEFAULT_MODULE, runs=5):
+    # Retourne (temps cumulé médian en ms, ensemble des modules importés)
+    totals, modules = [], set()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=ROOT, capture_output=True, text=True, check=True)
+        total = 0
+        for match in _LINE.finditer(proc.stderr):
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.add(name)
+            if len(indent) == 1:  # modules de premier niveau : le cumul inclut leurs dépendances
+                total += int(cumulative_us)
+        totals.append(total / 1000)
+    totals.sort()
+    return totals[len(totals) // 2], modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure le coût d'import du cœur de résolution")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    elapsed_ms, modules = measure(args.module, args.runs)
+    leaked = sorted(name for name in modules if name.split(".")[0] in FORBIDDEN)
+    print(f"import {args.module} : {elapsed_ms:.1f} ms (budget {args.budget_ms:.0f} ms), {len(modules)} modules")
+    if leaked:
+        print(f"ÉCHEC : modules d'interface importés : {', '.join(leaked)}")
+        return 1
+    if elapsed_ms > args.budget_ms:
+        print("ÉCHEC : budget d'import dépassé")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
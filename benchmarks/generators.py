@@ -0,0 +1,85 @@
+import numpy as np
+
+# Générateurs reproductibles (graine fixe) de réseaux de collecte des déchets, extensions du modèle
+# de Marrakech : quartiers x installations x flux de déchets. Une variable x_d_f_s = tonnes du flux s
+# envoyées du quartier d vers l'installation f, pour les seuls couples (installation, flux) compatibles.
+# Les modèles sont produits sous forme texte (objectif + contraintes) pour mesurer aussi l'analyse.
+
+FACILITY_TYPES = ("recyclage", "incinération", "compostage")
+PROCESSING_COST = (500.0, 800.0, 600.0)  # DH/tonne, comme la ligne budget du modèle de Marrakech
+# Flux par catégorie (s % 3) : recyclables, organiques, résiduels -> types d'installation acceptés
+ACCEPTED_TYPES = ({0, 1}, {1, 2}, {1})
+TRANSPORT_RATE = 2.0  # DH/tonne/km
+CITY_SIZE_KM = 30.0
+
+# Familles de taille croissante : (quartiers, installations, flux, lignes de traitement minimal)
+FAMILIES = {
+    "small": (4, 3, 3, True),
+    "medium": (12, 6, 6, True),
+    "large": (40, 15, 9, False),
+    "xlarge": (120, 60, 12, False),
+}
+
+
+def waste_network(districts, facilities, streams, minimum_share=True, seed=0):
+    # Retourne (objectif, contraintes, agrégat) : le modèle au format texte de model_parser, et pour le
+    # tracé le modèle agrégé à 3 variables (tonnes par type d'installation) avec le type de chaque variable.
+    # Objectif : maximiser la valeur des tonnes traitées moins le coût de transport.
+    # Contraintes : production par quartier et par flux, capacité par installation, budget global
+    # (traitement + transport) et, si minimum_share, un traitement minimal par quartier (lignes ">=").
+    rng = np.random.default_rng(seed)
+    facility_type = np.arange(facilities) % len(FACILITY_TYPES)
+    category = np.arange(streams) % len(ACCEPTED_TYPES)
+    compatible = np.array([[facility_type[f] in ACCEPTED_TYPES[category[s]] for s in range(streams)]
+                           for f in range(facilities)])
+
+    district_xy = rng.uniform(0, CITY_SIZE_KM, (districts, 2))
+    facility_xy = rng.uniform(0, CITY_SIZE_KM, (facilities, 2))
+    distance = np.linalg.norm(district_xy[:, None, :] - facility_xy[None, :, :], axis=2)
+    production = np.round(rng.uniform(5, 60, (districts, streams)), 1)  # tonnes/jour
+    value = np.round(rng.uniform(80, 160, streams), 1)  # DH/tonne traitée
+
+    d_idx, f_idx, s_idx = np.nonzero(np.broadcast_to(compatible[None, :, :], (districts, facilities, streams)))
+    names = [f"x_{d}_{f}_{s}" for d, f, s in zip(d_idx, f_idx, s_idx)]
+    transport = TRANSPORT_RATE * distance[d_idx, f_idx]
+    profit = np.round(value[s_idx] - transport, 2)
+    unit_cost = np.round(np.take(PROCESSING_COST, facility_type[f_idx]) + transport, 2)
+
+    def linear(coeffs, variables):
+        return " + ".join(f"{coeff:g}{names[j]}" for coeff, j in zip(coeffs, variables)).replace("+ -", "- ")
+
+    objective = linear(profit, range(len(names)))
+    constraints = []
+    supply = d_idx * streams + s_idx
+    for d in range(districts):
+        for s in range(streams):
+            variables = np.flatnonzero(supply == d * streams + s)
+            if variables.size:
+                constraints.append(f"{linear(np.ones(variables.size), variables)} <= {production[d, s]:g}")
+    total_by_type = np.array([production[:, category == 0].sum() * 0.5 + production[:, category == 2].sum() * 0.2,
+                              production.sum() * 0.5, production[:, category == 1].sum() * 0.6])
+    per_type_count = np.bincount(facility_type, minlength=len(FACILITY_TYPES))
+    capacity = np.round(total_by_type[facility_type] / per_type_count[facility_type]
+                        * rng.uniform(0.6, 1.2, facilities), 1)
+    for f in range(facilities):
+        variables = np.flatnonzero(f_idx == f)
+        constraints.append(f"{linear(np.ones(variables.size), variables)} <= {capacity[f]:g}")
+    budget = round(0.7 * production.sum() * float(np.mean(PROCESSING_COST)), 0)
+    constraints.append(f"{linear(unit_cost, range(len(names)))} <= {budget:g}")
+    if minimum_share:
+        for d in range(districts):
+            variables = np.flatnonzero(d_idx == d)
+            constraints.append(f"{linear(np.ones(variables.size), variables)} >= {0.3 * production[d].sum():.1f}")
+    # Agrégat x, y, z (recyclage, incinération, compostage) : capacité cumulée par type, production totale
+    type_capacity = np.bincount(facility_type, weights=capacity, minlength=len(FACILITY_TYPES))
+    aggregate = {
+        "variable_type": facility_type[f_idx],
+        "A": np.vstack([np.eye(len(FACILITY_TYPES)), np.ones(len(FACILITY_TYPES))]),
+        "b": np.append(type_capacity, production.sum()),
+    }
+    return objective, constraints, aggregate
+
+
+def family(name, seed=0):
+    districts, facilities, streams, minimum_share = FAMILIES[name]
+    return waste_network(districts, facilities, streams, minimum_share, seed)
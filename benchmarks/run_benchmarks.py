@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from benchmarks.generators import FAMILIES, family
+from data.marrakech_data import OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT
+
+# Banc d'essai des étapes analyse -> résolution -> sensibilité -> rendu sur des modèles générés de taille
+# croissante (3 à ~50 000 variables). Chaque cas tourne dans un interpréteur neuf pour que le pic de mémoire
+# (RSS) lui soit propre ; les temps retenus sont les meilleurs sur --repeat essais. Les résultats sont
+# comparés à une référence JSON (baseline.json) : code de sortie non nul en cas de régression.
+#
+#   python benchmarks/run_benchmarks.py                 # cas par défaut, comparaison à la référence
+#   python benchmarks/run_benchmarks.py --all           # y compris xlarge (~48 000 variables)
+#   python benchmarks/run_benchmarks.py --save-baseline # enregistre la nouvelle référence
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+CASES = ("marrakech",) + tuple(FAMILIES)
+DEFAULT_CASES = ("marrakech", "small", "medium", "large")
+# Simplexe révisé (creux, "<=" seulement) au-delà de la taille où le tableau dense reste raisonnable
+REVISED_CASES = ("large", "xlarge")
+TIME_TOLERANCE = 0.5  # régression si plus lent de 50 % (machines partagées bruitées)...
+TIME_FLOOR = 0.005  # ... et d'au moins 5 ms
+RSS_TOLERANCE = 0.25
+
+
+def _best(function, repeat):
+    best, result = np.inf, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _model(case):
+    if case == "marrakech":
+        return OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT, None
+    return family(case)
+
+
+def run_case(case, repeat=3):
+    # Mesure les quatre étapes d'un cas dans le processus courant
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from src.instrumentation import SolveStats
+    from src.model_parser import parse_model
+    from src.revised_simplex import simplex_revised
+    from src.sensitivity import sensitivity_analysis
+    from src.simplex_solver import OPTIMAL, parse_constraint, solve_tableau
+    from src.visualization import PlotController
+
+    objective, constraints, aggregate = _model(case)
+    revised = case in REVISED_CASES
+    variables = ("x", "y", "z") if case == "marrakech" else ()
+    stages = {}
+
+    stages["parse"], (c, A, b, senses, names) = _best(
+        lambda: parse_model(objective, constraints, variables=variables, sparse=revised), repeat)
+    if case == "marrakech":
+        # Interface historique x, y, z (comparée à la référence, non affichée dans le tableau)
+        stages["parse_constraint"], _ = _best(lambda: [parse_constraint(row) for row in constraints], repeat)
+
+    stats = SolveStats()
+    if revised:
+        stages["solve"], (solution, z, _) = _best(lambda: simplex_revised(c, A, b, stats=stats), repeat)
+        status = OPTIMAL if solution is not None else _
+        basis = None
+    else:
+        stages["solve"], (status, solution, z, _, basis) = _best(
+            lambda: solve_tableau(c, A, b, senses, stats=stats), repeat)
+
+    if basis is not None and status == OPTIMAL:
+        stages["sensitivity"], _ = _best(lambda: sensitivity_analysis(c, A, b, senses, basis=basis), repeat)
+
+    if status == OPTIMAL:
+        if aggregate is None:
+            plot_solution, plot_A, plot_b = solution, A, b
+        else:
+            plot_solution = np.bincount(aggregate["variable_type"], weights=solution, minlength=3)
+            plot_A, plot_b = aggregate["A"], aggregate["b"]
+
+        def render():
+            # Premier tracé complet puis une mise à jour (blitting) de la solution
+            fig = Figure(figsize=(10, 6), dpi=100)
+            controller = PlotController(fig, FigureCanvasAgg(fig))
+            controller.update(plot_solution, plot_A, plot_b)
+            controller.update(plot_solution * 0.999, plot_A, plot_b)
+
+        stages["render"], _ = _best(render, repeat)
+
+    return {
+        "variables": len(c),
+        "constraints": len(b),
+        "method": "revised" if revised else "tableau",
+        "status": status,
+        "objective": None if z is None else float(z),
+        "pivots": stats.pivots,
+        "stages": stages,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_isolated(case, repeat):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", case, "--repeat", str(repeat)],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance=TIME_TOLERANCE):
+    # Liste des régressions : temps d'étape, pivots (déterministes à graine fixe) et pic de mémoire
+    regressions = []
+    for case, current in results.items():
+        reference = baseline.get("cases", {}).get(case)
+        if reference is None:
+            continue
+        for stage, elapsed in current["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is not None and elapsed > before * (1 + tolerance) and elapsed - before > TIME_FLOOR:
+                regressions.append(f"{case}/{stage} : {before * 1e3:.1f} ms -> {elapsed * 1e3:.1f} ms")
+        if current["pivots"] != reference["pivots"]:
+            regressions.append(f"{case} : {reference['pivots']} -> {current['pivots']} pivots")
+        if current["status"] != reference["status"]:
+            regressions.append(f"{case} : statut {reference['status']} -> {current['status']}")
+        if current["peak_rss_kb"] > reference["peak_rss_kb"] * (1 + RSS_TOLERANCE):
+            regressions.append(f"{case} : RSS {reference['peak_rss_kb'] / 1024:.0f} Mo -> "
+                               f"{current['peak_rss_kb'] / 1024:.0f} Mo")
+    return regressions
+
+
+def format_row(case, result, reference=None):
+    cells = [f"{case:<10}", f"{result['variables']:>6} var", f"{result['constraints']:>5} lig",
+             f"{result['method']:<7}", f"{result['pivots']:>5} piv"]
+    for stage in ("parse", "solve", "sensitivity", "render"):
+        elapsed = result["stages"].get(stage)
+        if elapsed is None:
+            cells.append(f"{stage} {'-':>9}")
+            continue
+        cell = f"{stage} {elapsed * 1e3:>7.1f}ms"
+        before = None if reference is None else reference["stages"].get(stage)
+        if before:
+            cell += f" ({elapsed / before:4.2f}x)"
+        cells.append(cell)
+    cells.append(f"RSS {result['peak_rss_kb'] / 1024:.0f} Mo")
+    return "  ".join(cells)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai du solveur sur des réseaux de déchets générés")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(DEFAULT_CASES))
+    parser.add_argument("--all", action="store_true", help="Tous les cas, y compris xlarge")
+    parser.add_argument("--repeat", type=int, default=3, help="Essais par étape (meilleur temps retenu)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=TIME_TOLERANCE,
+                        help="Ralentissement relatif toléré par étape")
+    parser.add_argument("--save-baseline", action="store_true", help="Écrire les résultats comme référence")
+    parser.add_argument("--output", help="Écrire aussi les résultats bruts dans ce fichier JSON")
+    parser.add_argument("--child", choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.repeat)))
+        return 0
+
+    cases = CASES if args.all else args.cases
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    results = {}
+    for case in cases:
+        results[case] = run_isolated(case, args.repeat)
+        print(format_row(case, results[case], baseline.get("cases", {}).get(case)), flush=True)
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as handle:
+                report["cases"] = {**json.load(handle).get("cases", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Référence enregistrée : {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not baseline:
+        print("Aucune référence : lancer avec --save-baseline pour en créer une")
+    for regression in regressions:
+        print(f"RÉGRESSION : {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,4 +6,6 @@ CONSTRAINTS_DEFAULT = [
     "0x + 1y + 0z <= 600",          # Capacité d'incinération (tonnes/jour)
     "0x + 0y + 1z <= 400",          # Capacité de compostage (tonnes/jour)
     "1x + 1y + 1z <= 1644"          # Total des déchets produits par jour
-]
\ No newline at end of file
+]
+
+PRODUCTION_ROW = 4  # Contrainte de production : les déchets non traités sont reportés au lendemain (planification)
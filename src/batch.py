@@ -0,0 +1,180 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from data.marrakech_data import OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT
+from src.model_io import load_model
+from src.model_parser import parse_model
+from src.batched_simplex import simplex_batched
+from src.simplex_solver import OPTIMAL
+from src.solution_cache import SolutionCache
+from src.warm_start import WarmStartSolver
+
+# Balayage de scénarios sans interface : chaque ligne de la grille (CSV ou Parquet) remplace
+# certains seconds membres (colonnes b1..bm, numérotées comme les contraintes de l'interface)
+# et/ou coefficients de l'objectif (colonnes c_<variable>). Les autres valeurs viennent du modèle de base.
+
+DEFAULT_CHUNK_SIZE = 256
+
+_base_model = None  # Modèle de base, transmis une seule fois à chaque processus
+_cache = None  # Cache de solutions propre à chaque processus (base sqlite partagée)
+
+
+def default_model():
+    return parse_model(OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT, variables=("x", "y", "z"))
+
+
+def _init_worker(model, cache_path=None):
+    global _base_model, _cache
+    _base_model = model
+    _cache = SolutionCache(path=cache_path) if cache_path is not None else None
+
+
+def load_scenarios(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Lit la grille par blocs ; le Parquet nécessite pyarrow ou fastparquet.
+    # pandas n'est importé qu'ici : le reste du module n'en dépend pas.
+    import pandas as pd
+    if str(path).endswith(".parquet"):
+        frame = pd.read_parquet(path)
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start:start + chunk_size]
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def scenario_arrays(frame, model):
+    # Convertit un bloc de la grille en (identifiants, C (k, n), B (k, m))
+    c, A, b, senses, names = model
+    k = len(frame)
+    C = np.tile(c, (k, 1))
+    B = np.tile(b, (k, 1))
+    columns = {f"c_{name}": j for j, name in enumerate(names)}
+    for column in frame.columns:
+        if column == "scenario":
+            continue
+        if column in columns:
+            C[:, columns[column]] = frame[column].to_numpy(dtype=float)
+        elif column.startswith("b") and column[1:].isdigit() and 1 <= int(column[1:]) <= b.size:
+            B[:, int(column[1:]) - 1] = frame[column].to_numpy(dtype=float)
+        else:
+            raise ValueError(f"Colonne de scénario inconnue : '{column}'")
+    if "scenario" in frame.columns:
+        ids = frame["scenario"].tolist()
+    else:
+        ids = frame.index.tolist()
+    return ids, C, B
+
+
+def solve_chunk(ids, C, B, model=None, vectorized=False, cache=None):
+    # Résout un bloc de scénarios ; le solveur est ré-optimisé à chaud d'un scénario au suivant,
+    # ou tout le bloc est pivoté en une fois par simplex_batched quand le modèle s'y prête (<=, b >= 0).
+    # Hors mode vectorisé, les scénarios déjà présents dans le cache ne sont pas recalculés.
+    c, A, b, senses, names = model if model is not None else _base_model
+    cache = cache if cache is not None else _cache
+    if vectorized and np.all(senses == "<=") and np.all(B >= 0):
+        solutions, z, status, pivots = simplex_batched(C, A, B)
+        return [[scenario, status_k, z_k] + list(solution) + [pivots_k]
+                for scenario, status_k, z_k, solution, pivots_k in zip(ids, status, z, solutions, pivots)]
+    solver = None
+    rows = []
+    for scenario, c_k, b_k in zip(ids, C, B):
+        hit = cache.get(c_k, A, b_k, senses) if cache is not None else None
+        if hit is not None:
+            status, z, solution, _ = hit
+            pivots = 0
+        else:
+            if solver is None:
+                solver = WarmStartSolver(c_k, A, b_k, senses)
+                solution, z, _ = solver.result()
+            else:
+                solution, z, _ = solver.update(c_k, A, b_k, senses)
+            status, pivots = solver.status, solver.pivots
+            if cache is not None:
+                cache.put(c_k, A, b_k, senses, status, z, solution, solver.basis if solution is not None else None,
+                          commit=False)
+        if solution is None:
+            rows.append([scenario, status, np.nan] + [np.nan] * len(names) + [pivots])
+        else:
+            rows.append([scenario, OPTIMAL, z] + list(solution) + [pivots])
+    if cache is not None:
+        cache.flush()
+    return rows
+
+
+def run_sweep(scenarios, output_path, model=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+              vectorized=False, cache_path=None):
+    # scenarios : chemin de la grille ou itérable de DataFrames. Les résultats sont écrits au fil de l'eau.
+    # Retourne un dictionnaire de statistiques (nombre de scénarios, durée, résolutions par seconde).
+    model = model if model is not None else default_model()
+    chunks = load_scenarios(scenarios, chunk_size) if isinstance(scenarios, (str, os.PathLike)) else scenarios
+    workers = workers if workers is not None else os.cpu_count() or 1
+    names = model[4]
+    done = 0
+    start = time.perf_counter()
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["scenario", "status", "objective"] + list(names) + ["pivots"])
+
+        def write(rows):
+            nonlocal done
+            writer.writerows(rows)
+            done += len(rows)
+            if progress is not None:
+                progress(done, time.perf_counter() - start)
+
+        if workers <= 1:
+            cache = SolutionCache(path=cache_path) if cache_path is not None else None
+            for frame in chunks:
+                write(solve_chunk(*scenario_arrays(frame, model), model=model, vectorized=vectorized, cache=cache))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model, cache_path)) as pool:
+                pending = set()
+                for frame in chunks:
+                    pending.add(pool.submit(solve_chunk, *scenario_arrays(frame, model), vectorized=vectorized))
+                    # Nombre borné de blocs en vol pour ne pas charger toute la grille en mémoire
+                    if len(pending) >= 2 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(future.result())
+                for future in pending:
+                    write(future.result())
+
+    elapsed = time.perf_counter() - start
+    return {"scenarios": done, "seconds": elapsed, "solves_per_sec": done / elapsed if elapsed > 0 else float("inf")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage de scénarios budget/capacité en parallèle")
+    parser.add_argument("grid", help="Grille de scénarios (.csv ou .parquet)")
+    parser.add_argument("output", help="Fichier CSV de résultats")
+    parser.add_argument("--model", help="Modèle de base (.lp, .mps ou texte : objectif puis une contrainte "
+                                        "par ligne) ; par défaut les données de Marrakech")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (1 = sans pool)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Scénarios par bloc")
+    parser.add_argument("--cache", help="Base sqlite de solutions réutilisée d'une exécution à l'autre")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Pivoter chaque bloc en une seule opération NumPy (contraintes <= et b >= 0)")
+    args = parser.parse_args(argv)
+
+    model = default_model() if args.model is None else load_model(args.model, sparse=False)[:5]
+
+    def progress(done, elapsed):
+        print(f"\r{done} scénarios résolus ({done / elapsed:.0f} résolutions/s)", end="", file=sys.stderr)
+
+    stats = run_sweep(args.grid, args.output, model=model, workers=args.workers,
+                      chunk_size=args.chunk_size, progress=progress, vectorized=args.vectorized,
+                      cache_path=args.cache)
+    print(file=sys.stderr)
+    print(f"{stats['scenarios']} scénarios en {stats['seconds']:.2f} s "
+          f"({stats['solves_per_sec']:.1f} résolutions/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
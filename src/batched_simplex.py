@@ -0,0 +1,81 @@
+import numpy as np
+
+from src.simplex_solver import MAX_ITER_REACHED, OPTIMAL, TOL, UNBOUNDED
+
+
+def simplex_batched(C, A, B, max_iter=None):
+    # Résout K programmes linéaires de même structure (max c_k^T x sous A_k x <= b_k, x >= 0, b_k >= 0)
+    # en empilant les K tableaux dans un seul tableau (K, m+1, n+m+2) pivoté en bloc.
+    # C : (K, n) ; A : (m, n) partagée ou (K, m, n) ; B : (K, m).
+    # Retourne (solutions (K, n), z (K,), statuts (K,), pivots (K,)) ; solutions et z valent NaN en cas d'échec.
+    C = np.atleast_2d(np.asarray(C, dtype=float))
+    B = np.atleast_2d(np.asarray(B, dtype=float))
+    A = np.asarray(A, dtype=float)
+    K, n = C.shape
+    m = B.shape[1]
+    if B.shape[0] != K:
+        raise ValueError(f"C et B doivent avoir le même nombre de scénarios ({K} != {B.shape[0]})")
+    if np.any(B < 0):
+        raise ValueError("Le simplexe vectorisé suppose b >= 0 (base d'écart initiale)")
+    if max_iter is None:
+        max_iter = 50 * (n + m) + 100
+
+    tableau = np.zeros((K, m + 1, n + m + 2))  # Z, vars, slack, b
+    tableau[:, 0, 0] = 1
+    tableau[:, 0, 1:n + 1] = -C
+    tableau[:, 1:, 1:n + 1] = A
+    tableau[:, np.arange(1, m + 1), np.arange(n + 1, n + m + 1)] = 1
+    tableau[:, 1:, -1] = B
+    basis = np.tile(np.arange(n, n + m), (K, 1))
+
+    status = np.full(K, OPTIMAL, dtype=object)
+    pivots = np.zeros(K, dtype=np.int64)
+    active = np.arange(K)  # problèmes pas encore terminés
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        T = tableau[active]
+        k = np.arange(active.size)
+
+        # Pricing de Dantzig pour tous les problèmes actifs ; ceux déjà optimaux sont retirés
+        reduced = T[:, 0, 1:-1]
+        pivot_col = np.argmin(reduced, axis=1)
+        improving = reduced[k, pivot_col] < -TOL
+
+        # Test du ratio vectorisé
+        column = T[k, 1:, pivot_col + 1]
+        ratios = np.full(column.shape, np.inf)
+        np.divide(T[:, 1:, -1], column, out=ratios, where=column > TOL)
+        bounded = np.any(ratios < np.inf, axis=1)
+        status[active[improving & ~bounded]] = UNBOUNDED
+
+        go = improving & bounded
+        if not np.all(go):
+            T, k = T[go], np.arange(np.count_nonzero(go))
+            pivot_col, ratios = pivot_col[go], ratios[go]
+            active = active[go]
+            if active.size == 0:
+                break
+        pivot_row = np.argmin(ratios, axis=1) + 1
+
+        # Pivot masqué : une ligne pivot et une élimination par problème, en une seule opération
+        T[k, pivot_row] /= T[k, pivot_row, pivot_col + 1][:, None]
+        factors = T[k, :, pivot_col + 1]
+        factors[k, pivot_row] = 0
+        T -= factors[:, :, None] * T[k, pivot_row][:, None, :]
+
+        tableau[active] = T
+        basis[active, pivot_row - 1] = pivot_col
+        pivots[active] += 1
+    else:
+        status[active] = MAX_ITER_REACHED
+
+    solutions = np.zeros((K, n + m))
+    np.put_along_axis(solutions, basis, tableau[:, 1:, -1], axis=1)
+    solutions = solutions[:, :n]
+    z = tableau[:, 0, -1].copy()
+    failed = status != OPTIMAL
+    solutions[failed] = np.nan
+    z[failed] = np.nan
+    return solutions, z, status, pivots
@@ -0,0 +1,297 @@
+import copy
+import heapq
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.simplex_solver import INFEASIBLE, OPTIMAL
+from src.warm_start import WarmStartSolver
+
+# Programmes linéaires en nombres entiers (variables entières ou binaires) par séparation et évaluation.
+# Chaque nœud ajoute une contrainte de branchement x_j <= floor(v) ou x_j >= ceil(v) au modèle de son
+# parent. Pour développer un nœud, son tableau optimal est reconstruit une seule fois depuis sa base ;
+# chaque enfant en part et ajoute sa ligne par WarmStartSolver.add_constraint (la logique de la ligne
+# entre en base, puis simplexe dual), sans nouvelle factorisation. Les nœuds ouverts sont rangés dans une file de
+# priorité par borne (meilleure borne d'abord). Avec workers > 1, les meilleurs nœuds sont confiés à un
+# pool de processus qui explorent chacun un sous-arbre (au plus subtree_nodes nœuds) et renvoient les
+# nœuds restants ; la solution entière courante (incumbent) est partagée à chaque envoi.
+
+FEASIBLE = "Solution entière réalisable (limite atteinte avant la preuve d'optimalité)"
+NO_INTEGER_SOLUTION = "Aucune solution entière trouvée avant la limite"
+INTEGRALITY_TOL = 1e-6
+DEFAULT_GAP = 1e-6  # écart relatif entre borne et solution entière en deçà duquel on s'arrête
+SUBTREE_NODES = 200
+
+_problem = None  # Modèle transmis une seule fois à chaque processus du pool
+
+
+def _init_worker(problem):
+    global _problem
+    _problem = problem
+
+
+def _node_model(problem, rows):
+    # Modèle d'un nœud : contraintes d'origine suivies des contraintes de branchement
+    c, A, b, senses = problem["c"], problem["A"], problem["b"], problem["senses"]
+    if not rows:
+        return c, A, b, senses
+    branch = np.zeros((len(rows), c.size))
+    branch[np.arange(len(rows)), [j for j, _, _ in rows]] = 1.0
+    return (c, np.vstack([A, branch]), np.concatenate([b, [value for _, _, value in rows]]),
+            np.concatenate([senses, [sense for _, sense, _ in rows]]))
+
+
+def _node_result(solver, rows):
+    # (borne, lignes, base, solution) d'une relaxation résolue, ou None si elle n'est pas optimale
+    solution, z, _ = solver.result()
+    if solution is None:
+        return None, solver.status
+    return (float(z), rows, solver.basis.copy(), solution), OPTIMAL
+
+
+def _solve_node(problem, rows, basis=None):
+    # Relaxation d'un nœud ; retourne (borne, lignes, base, solution) ou None si infaisable
+    return _node_result(WarmStartSolver(*_node_model(problem, rows), basis=basis), rows)
+
+
+def _branch(parent, rows, j, sense, limit):
+    # Enfant ré-optimisé par le simplexe dual depuis le tableau optimal du parent. add_constraint remplace
+    # les tableaux du solveur par de nouveaux tableaux avant de pivoter : une copie superficielle suffit.
+    child = copy.copy(parent)
+    coeffs = np.zeros(parent.n_vars)
+    coeffs[j] = 1.0
+    child.add_constraint(coeffs, sense, limit)
+    return _node_result(child, rows + ((j, sense, limit),))
+
+
+def _fractional(solution, integer):
+    # Variable entière la plus fractionnaire, ou -1 si la solution est entière
+    frac = np.abs(solution - np.round(solution))
+    frac[~integer] = 0.0
+    j = int(np.argmax(np.where(frac > INTEGRALITY_TOL, -np.abs(frac - 0.5), -np.inf)))
+    return j if frac[j] > INTEGRALITY_TOL else -1
+
+
+def _rounded_candidate(problem, solution):
+    # Heuristique d'arrondi : variables entières arrondies vers le bas puis au plus proche ;
+    # retourne le premier point réalisable trouvé, ou None
+    A, b, senses, integer = problem["A"], problem["b"], problem["senses"], problem["integer"]
+    tol = 1e-9 * max(1.0, np.abs(b).max(initial=0.0))
+    for rounding in (np.floor, np.round):
+        candidate = solution.copy()
+        candidate[integer] = rounding(candidate[integer] + INTEGRALITY_TOL)
+        lhs = A @ candidate
+        feasible = np.where(senses == "<=", lhs <= b + tol, np.where(senses == ">=", lhs >= b - tol,
+                                                                     np.abs(lhs - b) <= tol))
+        if np.all(feasible) and np.all(candidate >= 0):
+            return candidate
+    return None
+
+
+class _Search:
+    # Exploration meilleure-borne d'abord ; sert au processus principal comme aux processus du pool
+
+    def __init__(self, problem, incumbent_value=-math.inf, incumbent=None, gap=DEFAULT_GAP):
+        self.problem = problem
+        self.incumbent_value = incumbent_value
+        self.incumbent = incumbent
+        self.gap = gap
+        self.heap = []
+        self.nodes = 0
+        self._seq = 0
+
+    def cutoff(self):
+        # Un nœud dont la borne ne dépasse pas ce seuil ne peut pas améliorer l'incumbent au-delà de l'écart
+        if self.incumbent is None:
+            return -math.inf
+        return self.incumbent_value + max(1e-9, self.gap * abs(self.incumbent_value))
+
+    def push(self, node):
+        if node[0] > self.cutoff():
+            heapq.heappush(self.heap, (-node[0], self._seq, node))
+            self._seq += 1
+
+    def pop(self):
+        # Meilleur nœud encore utile, ou None
+        while self.heap:
+            node = heapq.heappop(self.heap)[2]
+            if node[0] > self.cutoff():
+                return node
+        return None
+
+    def bound(self):
+        return max(-self.heap[0][0], self.incumbent_value) if self.heap else self.incumbent_value
+
+    def offer(self, value, solution):
+        if solution is not None and (self.incumbent is None or value > self.incumbent_value):
+            self.incumbent_value, self.incumbent = value, solution
+
+    def expand(self, node):
+        # Traite un nœud : nouvelle solution entière, ou deux enfants ré-optimisés à chaud
+        self.nodes += 1
+        bound, rows, basis, solution = node
+        j = _fractional(solution, self.problem["integer"])
+        if j < 0:
+            integer = self.problem["integer"]
+            solution = solution.copy()
+            solution[integer] = np.round(solution[integer])
+            self.offer(float(self.problem["c"] @ solution), solution)
+            return
+        candidate = _rounded_candidate(self.problem, solution)
+        if candidate is not None:
+            self.offer(float(self.problem["c"] @ candidate), candidate)
+        value = solution[j]
+        parent = WarmStartSolver(*_node_model(self.problem, rows), basis=basis)
+        for sense, limit in (("<=", math.floor(value)), (">=", math.ceil(value))):
+            child, _ = _branch(parent, rows, j, sense, float(limit))
+            if child is not None:
+                self.push(child)
+
+    def run(self, node_limit=None, deadline=None, stop=None):
+        # Explore jusqu'à épuisement, limite de nœuds ou échéance ; stop() peut interrompre plus tôt
+        explored = 0
+        while self.heap:
+            if node_limit is not None and explored >= node_limit:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            if stop is not None and stop():
+                break
+            node = self.pop()
+            if node is None:
+                break
+            self.expand(node)
+            explored += 1
+        return explored
+
+    def open_nodes(self):
+        return [entry[2] for entry in self.heap if entry[2][0] > self.cutoff()]
+
+
+def _explore_subtree(node, incumbent_value, incumbent, node_limit, time_left, gap):
+    # Exécuté dans un processus du pool : explore un sous-arbre et renvoie ce qui reste à explorer
+    search = _Search(_problem, incumbent_value, incumbent, gap)
+    search.push(node)
+    deadline = None if time_left is None else time.monotonic() + time_left
+    search.run(node_limit, deadline)
+    return search.incumbent_value, search.incumbent, search.open_nodes(), search.nodes
+
+
+def _mask(selection, n):
+    # Masque booléen à partir d'un masque ou d'une liste d'indices (éventuellement vide)
+    selection = np.asarray(selection)
+    if selection.dtype == bool:
+        return selection.copy()
+    mask = np.zeros(n, dtype=bool)
+    mask[selection.astype(int)] = True
+    return mask
+
+
+def relative_gap(bound, incumbent_value):
+    if math.isinf(incumbent_value):
+        return math.inf
+    return max(bound - incumbent_value, 0.0) / max(abs(incumbent_value), 1e-10)
+
+
+def branch_and_bound(c, A, b, senses=None, integer=None, binary=None, time_limit=None, gap=DEFAULT_GAP,
+                     node_limit=None, workers=1, subtree_nodes=SUBTREE_NODES, progress=None, mp_context=None):
+    # Maximise c^T x sous A x (<=, >=, =) b, x >= 0, x_j entier pour j dans integer (toutes les variables
+    # si None) et x_j dans {0, 1} pour j dans binary. integer/binary : masques booléens ou indices.
+    # progress(nœuds, meilleure valeur entière, borne, écart relatif) est appelé au fil de l'exploration ;
+    # il peut lever SolveCancelled. Retourne (statut, solution, z, infos) avec infos = nœuds explorés,
+    # borne, écart et durée ; statut vaut OPTIMAL (à l'écart près), FEASIBLE, NO_INTEGER_SOLUTION ou
+    # l'échec de la relaxation (infaisable, non borné). mp_context : contexte multiprocessing du pool.
+    started = time.monotonic()
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    # Les nœuds sont ré-optimisés sur un tableau dense : une matrice creuse (CSCMatrix, scipy) est densifiée
+    A = np.asarray(A.toarray() if hasattr(A, "toarray") else A, dtype=float).reshape(b.size, c.size)
+    senses = np.array(["<="] * b.size if senses is None else senses, dtype="<U2")
+    n = c.size
+    mask = np.ones(n, dtype=bool) if integer is None else _mask(integer, n)
+    if binary is not None:
+        binary_mask = _mask(binary, n)
+        mask |= binary_mask
+        ones = np.flatnonzero(binary_mask)
+        bounds = np.zeros((ones.size, n))
+        bounds[np.arange(ones.size), ones] = 1.0
+        A = np.vstack([A, bounds])
+        b = np.concatenate([b, np.ones(ones.size)])
+        senses = np.concatenate([senses, np.full(ones.size, "<=")])
+    problem = {"c": c, "A": A, "b": b, "senses": senses, "integer": mask}
+    deadline = None if time_limit is None else started + time_limit
+
+    def info(search):
+        bound = search.bound()
+        return {"nodes": search.nodes, "bound": bound, "gap": relative_gap(bound, search.incumbent_value),
+                "seconds": time.monotonic() - started}
+
+    root, status = _solve_node(problem, ())
+    search = _Search(problem, gap=gap)
+    if root is None:
+        return status, None, None, info(search)
+    search.push(root)
+
+    pending = {}  # sous-arbres confiés au pool -> borne de leur racine
+
+    def global_bound():
+        return max([search.bound()] + list(pending.values()))
+
+    def report():
+        if progress is not None:
+            bound = global_bound()
+            progress(search.nodes, search.incumbent_value, bound, relative_gap(bound, search.incumbent_value))
+
+    def limit_reached():
+        return ((node_limit is not None and search.nodes >= node_limit)
+                or (deadline is not None and time.monotonic() >= deadline))
+
+    def done():
+        return relative_gap(global_bound(), search.incumbent_value) <= gap or limit_reached()
+
+    def step_report():
+        report()
+        return done()
+
+    if workers <= 1:
+        search.run(stop=step_report)
+    else:
+        # Montée en charge séquentielle jusqu'à disposer d'assez de nœuds ouverts pour le pool
+        search.run(stop=lambda: step_report() or len(search.heap) >= 2 * workers)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_worker,
+                                   initargs=(problem,))
+        try:
+            while (search.heap or pending) and not done():
+                while len(pending) < workers:
+                    node = search.pop()
+                    if node is None:
+                        break
+                    time_left = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                    future = pool.submit(_explore_subtree, node, search.incumbent_value, search.incumbent,
+                                         subtree_nodes, time_left, gap)
+                    pending[future] = node[0]
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del pending[future]
+                    value, solution, remaining, explored = future.result()
+                    search.offer(value, solution)
+                    search.nodes += explored
+                    for node in remaining:
+                        search.push(node)
+                report()
+            for node_bound in pending.values():
+                # Sous-arbres abandonnés (limite atteinte) : leur borne reste dans l'écart final
+                search.push((node_bound, (), None, None))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    result = info(search)
+    exhausted = not search.heap
+    if search.incumbent is None:
+        return (INFEASIBLE if exhausted else NO_INTEGER_SOLUTION), None, None, result
+    proven = exhausted or result["gap"] <= gap
+    return (OPTIMAL if proven else FEASIBLE), search.incumbent, search.incumbent_value, result
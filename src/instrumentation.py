@@ -0,0 +1,103 @@
+import time
+
+import numpy as np
+
+# Instrumentation des résolutions : une instance de SolveStats passée à solve_tableau, simplex_revised ou
+# WarmStartSolver active le chronométrage (pricing, test du ratio, élimination), le comptage des pivots
+# (dégénérés compris), la mémoire maximale des tableaux et la détection de cyclage. Sans instance, les
+# boucles de pivot ne font qu'un test `stats is not None` par étape.
+
+clock = time.perf_counter
+DEGENERATE_TOL = 1e-9  # pas (ratio) en dessous duquel un pivot est dégénéré
+
+
+class SolveStats:
+
+    def __init__(self, on_pivot=None, on_phase=None):
+        # on_pivot(stats, entrante, sortante, pas) après chaque pivot ; on_phase(stats, phase) à chaque
+        # début de phase ("phase I", "phase II", "primal", "dual", "révisé")
+        self.on_pivot = on_pivot
+        self.on_phase = on_phase
+        self.reset()
+
+    def reset(self):
+        self.pivots = 0
+        self.degenerate_pivots = 0
+        self.bound_flips = 0  # changements de borne sans pivot (variables bornées)
+        self.pricing_time = 0.0
+        self.ratio_time = 0.0
+        self.elimination_time = 0.0
+        self.total_time = 0.0
+        self.peak_memory = 0
+        self.cycling_detected = False
+        self.phase = None
+        self._degenerate_bases = set()
+        self._started = None
+
+    @property
+    def running(self):
+        return self._started is not None
+
+    def begin(self):
+        # Début d'une résolution : compteurs remis à zéro
+        self.reset()
+        self._started = clock()
+
+    def lap(self):
+        # Temps total depuis begin() ; peut être appelé plusieurs fois, le dernier appel fait foi
+        if self._started is not None:
+            self.total_time = clock() - self._started
+
+    def end(self):
+        self.lap()
+        self._started = None
+
+    def enter_phase(self, phase):
+        self.phase = phase
+        self._degenerate_bases.clear()
+        if self.on_phase is not None:
+            self.on_phase(self, phase)
+
+    def track_memory(self, nbytes):
+        if nbytes > self.peak_memory:
+            self.peak_memory = int(nbytes)
+
+    def record_pivot(self, basis, entering, leaving, step):
+        # Une base déjà rencontrée pendant une suite de pivots dégénérés signale un cyclage ;
+        # un pivot non dégénéré améliore strictement l'objectif et remet la suite à zéro
+        self.pivots += 1
+        if step <= DEGENERATE_TOL:
+            self.degenerate_pivots += 1
+            key = np.sort(basis).tobytes()
+            if key in self._degenerate_bases:
+                self.cycling_detected = True
+            self._degenerate_bases.add(key)
+        else:
+            self._degenerate_bases.clear()
+        if self.on_pivot is not None:
+            self.on_pivot(self, int(entering), int(leaving), float(step))
+
+    def as_dict(self):
+        return {
+            "pivots": self.pivots,
+            "degenerate_pivots": self.degenerate_pivots,
+            "bound_flips": self.bound_flips,
+            "pricing_time": self.pricing_time,
+            "ratio_time": self.ratio_time,
+            "elimination_time": self.elimination_time,
+            "total_time": self.total_time,
+            "peak_memory": self.peak_memory,
+            "cycling_detected": self.cycling_detected,
+        }
+
+    def summary(self):
+        # Ligne de synthèse pour l'interface et la ligne de commande
+        line = (f"{self.pivots} pivots ({self.degenerate_pivots} dégénérés) — "
+                f"pricing {self.pricing_time * 1e3:.2f} ms, ratio {self.ratio_time * 1e3:.2f} ms, "
+                f"élimination {self.elimination_time * 1e3:.2f} ms, total {self.total_time * 1e3:.2f} ms — "
+                f"mémoire max {self.peak_memory / 1024:.1f} Ko")
+        if self.bound_flips:
+            line += f" — {self.bound_flips} changements de borne"
+        if self.cycling_detected:
+            line += " — cyclage détecté"
+        return line
@@ -1,17 +1,24 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import queue
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, font
+from tkinter import ttk, messagebox, filedialog, font
 from data.marrakech_data import OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT
-from src.simplex_solver import parse_constraint, simplex_manual
-from src.visualization import plot_solution
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import pandas as pd
+from src.solver import (OPTIMAL, SolutionCache, SolveCancelled, SolveStats, WarmStartSolver, branch_and_bound,
+                        format_milp, format_sensitivity, load_model, parse_model, sensitivity_analysis, to_text,
+                        write_model)
+from src.tableau_viewer import TableauViewer
 # PIL import removed as it's not currently needed
 # from PIL import Image, ImageTk
 
+VARIABLES = ("x", "y", "z")
+VARIABLE_LABELS = {"x": "Recyclage", "y": "Incinération", "z": "Compostage"}
+MAX_GUI_ROWS = 200  # au-delà, un modèle importé se résout en ligne de commande
+MODEL_FILETYPES = [("CPLEX LP", "*.lp"), ("MPS libre", "*.mps"), ("Texte", "*.txt")]
+
 # Interface Tkinter with modern styling
 root = tk.Tk()
 root.title("Optimisation des déchets - Marrakech")
@@ -79,12 +86,19 @@ objective_entry = ttk.Entry(input_card, width=40, font=normal_font)
 objective_entry.insert(0, OBJECTIVE_DEFAULT)
 objective_entry.pack(fill=tk.X, pady=(0, 10))
 
+# Variables entières (ouverture d'installations, nombre de camions...) : séparation et évaluation
+ttk.Label(input_card, text="Variables entières", style='Subheader.TLabel').pack(anchor=tk.W)
+ttk.Label(input_card, text="Format: x, z (vide = relaxation continue)", font=("Segoe UI", 9, "italic")).pack(anchor=tk.W, pady=(0, 5))
+
+integer_entry = ttk.Entry(input_card, width=40, font=normal_font)
+integer_entry.pack(fill=tk.X, pady=(0, 10))
+
 # Constraints section with card-like appearance
 constraints_card = ttk.Frame(input_frame, padding="15 15 15 15")
 constraints_card.pack(fill=tk.X)
 
 ttk.Label(constraints_card, text="Contraintes", style='Subheader.TLabel').pack(anchor=tk.W)
-ttk.Label(constraints_card, text="Format: 500x + 800y + 600z <= 1500000", font=("Segoe UI", 9, "italic")).pack(anchor=tk.W, pady=(0, 10))
+ttk.Label(constraints_card, text="Format: 500x + 800y + 600z <= 1500000 (ou >=, =)", font=("Segoe UI", 9, "italic")).pack(anchor=tk.W, pady=(0, 10))
 
 constraints_frame = ttk.Frame(constraints_card)
 constraints_frame.pack(fill=tk.X, pady=5)
@@ -115,44 +129,246 @@ def add_constraint():
     entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
     constraint_entries.append(entry)
 
+def read_integer_entry():
+    return [name.strip() for name in integer_entry.get().replace(";", ",").split(",") if name.strip()]
+
+def import_model():
+    # Remplace le modèle saisi par celui d'un fichier .lp, .mps ou texte
+    path = filedialog.askopenfilename(filetypes=[("Modèles", "*.lp *.mps *.txt")] + MODEL_FILETYPES)
+    if not path:
+        return
+    try:
+        c, A, b, senses, names, integer = load_model(path)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Erreur", f"Import impossible : {str(e)}")
+        return
+    if len(b) > MAX_GUI_ROWS:
+        messagebox.showinfo("Modèle volumineux",
+                            f"{len(b)} contraintes : trop pour la saisie ligne à ligne.\n"
+                            f"Résolution en ligne de commande : python -m src.solver \"{path}\" --method revised --cache")
+        return
+    objective, constraints = to_text(c, A, b, senses, names)
+    objective_entry.delete(0, tk.END)
+    objective_entry.insert(0, objective)
+    integer_entry.delete(0, tk.END)
+    integer_entry.insert(0, ", ".join(integer))
+    for entry in constraint_entries:
+        entry.master.destroy()
+    constraint_entries.clear()
+    for constraint in constraints:
+        add_constraint()
+        constraint_entries[-1].insert(0, constraint)
+
+def export_model():
+    # Écrit le modèle saisi au format choisi par l'extension
+    path = filedialog.asksaveasfilename(defaultextension=".lp", filetypes=MODEL_FILETYPES)
+    if not path:
+        return
+    try:
+        c, A, b, senses, names = parse_model(objective_entry.get(), [entry.get() for entry in constraint_entries],
+                                             variables=VARIABLES)
+        integer = read_integer_entry()
+        unknown = [name for name in integer if name not in names]
+        if unknown:
+            raise ValueError(f"Variable entière inconnue : {', '.join(unknown)}")
+        write_model(path, c, A, b, senses, names, integer)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Erreur", f"Export impossible : {str(e)}")
+
+# Solveur persistant réutilisé d'un clic "Calculer" à l'autre ; un seul calcul l'utilise à la fois
+warm_solver = None
+solver_lock = threading.Lock()
+# Statistiques de la dernière résolution (pivots, temps par étape, mémoire), affichées en synthèse
+solve_stats = SolveStats()
+
+# Cache des modèles déjà résolus, conservé sur disque entre deux lancements
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "marrakech_dechets", "solutions.sqlite")
+solution_cache = SolutionCache(path=CACHE_PATH)
+
+# Calcul en arrière-plan : le thread de travail publie ses messages dans une file lue par root.after
+result_queue = queue.Queue()
+current_job = {"id": 0, "cancel": None}
+POLL_INTERVAL_MS = 50
+# Séparation et évaluation : durée maximale. L'exploration reste séquentielle dans l'interface : un fork
+# depuis ce processus (Tk et thread de travail) n'est pas sûr, et "spawn" ré-exécuterait ce script en
+# ouvrant une fenêtre par processus. Le pool de processus reste disponible en ligne de commande
+# (python -m src.solver --workers).
+MILP_TIME_LIMIT = 60.0
+
+def solve_integer(job_id, cancel_event, c, A, b, senses, names, integer_names):
+    # Programme en nombres entiers : ni cache, ni base conservée, ni analyse de sensibilité
+    unknown = [name for name in integer_names if name not in names]
+    if unknown:
+        raise ValueError(f"Variable entière inconnue : {', '.join(unknown)}")
+    last_report = [0.0]
+    
+    def progress(nodes, incumbent, bound, gap):
+        if cancel_event.is_set():
+            raise SolveCancelled()
+        now = time.monotonic()
+        if now - last_report[0] >= POLL_INTERVAL_MS / 1000:
+            last_report[0] = now
+            result_queue.put(("nodes", job_id, nodes, incumbent, bound, gap))
+    
+    status, solution, objective_value, info = branch_and_bound(
+        c, A, b, senses, integer=[names.index(name) for name in integer_names], time_limit=MILP_TIME_LIMIT,
+        progress=progress)
+    result_queue.put(("done", job_id, {
+        "A": A, "b": b, "senses": senses, "names": names, "solution": solution,
+        "objective_value": objective_value, "tableaux": [] if solution is not None else status,
+        "report": None, "status": status, "stats": format_milp(info),
+    }))
+
+def solve_job(job_id, cancel_event, objective, constraints, integer_names=()):
+    # Exécuté hors du thread Tk : analyse, résolution et sensibilité, sans toucher aux widgets
+    global warm_solver
+    
+    last_report = [0.0]
+    
+    def progress(pivots, z):
+        if cancel_event.is_set():
+            raise SolveCancelled()
+        # Au plus un message de progression par intervalle de scrutation
+        now = time.monotonic()
+        if now - last_report[0] >= POLL_INTERVAL_MS / 1000:
+            last_report[0] = now
+            result_queue.put(("progress", job_id, pivots, z))
+    
+    try:
+        # Compilation directe de l'objectif et des contraintes en tableaux NumPy
+        c, A, b, senses, names = parse_model(objective, constraints, variables=VARIABLES)
+        if integer_names:
+            solve_integer(job_id, cancel_event, c, A, b, senses, names, integer_names)
+            return
+        
+        with solver_lock:
+            if cancel_event.is_set():
+                raise SolveCancelled()
+            # Modèle déjà résolu (éventuellement avec ses contraintes dans un autre ordre) : réponse immédiate
+            hit = solution_cache.get(c, A, b, senses)
+            if hit is not None:
+                status, objective_value, solution, basis = hit
+                report = None
+                if status == OPTIMAL:
+                    report = sensitivity_analysis(c, A, b, senses, basis=basis)
+                result_queue.put(("done", job_id, {
+                    "A": A, "b": b, "senses": senses, "names": names, "solution": solution,
+                    "objective_value": objective_value, "tableaux": [] if status == OPTIMAL else status,
+                    "report": report, "stats": "Solution lue dans le cache",
+                }))
+                return
+            # Ré-optimisation à chaud depuis la base précédente quand seul b, c ou l'ajout de contraintes change
+            if warm_solver is None:
+                # Au premier calcul, une base en cache d'un modèle de même structure sert de départ
+                warm_solver = WarmStartSolver(c, A, b, senses, record_history=True, progress=progress,
+                                              basis=solution_cache.warm_basis(c, A, b, senses), stats=solve_stats)
+                solution, objective_value, tableaux = warm_solver.result()
+            else:
+                warm_solver.progress = progress
+                try:
+                    solution, objective_value, tableaux = warm_solver.update(c, A, b, senses)
+                except Exception:
+                    # Base interrompue en plein pivot : le prochain calcul repart à froid
+                    warm_solver = None
+                    raise
+            report = None
+            if solution is not None:
+                # Prix duaux, coûts réduits et plages de validité lus dans la base optimale
+                report = sensitivity_analysis(c, A, b, senses, basis=warm_solver.basis)
+            solution_cache.put(c, A, b, senses, warm_solver.status, objective_value, solution,
+                               warm_solver.basis if solution is not None else None)
+        
+        result_queue.put(("done", job_id, {
+            "A": A, "b": b, "senses": senses, "names": names, "solution": solution,
+            "objective_value": objective_value, "tableaux": tableaux, "report": report,
+            "stats": solve_stats.summary(),
+        }))
+    except SolveCancelled:
+        result_queue.put(("cancelled", job_id))
+    except Exception as e:
+        result_queue.put(("error", job_id, e))
+
 # Fonction pour calculer et afficher les résultats
 def calculate():
     objective = objective_entry.get()
     constraints = [entry.get() for entry in constraint_entries]
+    integer = read_integer_entry()
+    
+    # Un nouveau clic remplace le calcul en cours
+    if current_job["cancel"] is not None:
+        current_job["cancel"].set()
+    current_job["id"] += 1
+    current_job["cancel"] = threading.Event()
+    
+    # Show a loading message
+    result_text.delete(1.0, tk.END)
+    result_text.insert(tk.END, "Calcul en cours...\n")
+    progress_label.configure(text="Calcul en cours...")
+    cancel_button.state(["!disabled"])
+    
+    threading.Thread(target=solve_job, daemon=True,
+                     args=(current_job["id"], current_job["cancel"], objective, constraints, integer)).start()
+
+def cancel_calculation():
+    if current_job["cancel"] is not None:
+        current_job["cancel"].set()
+
+def poll_results():
+    # Traite les messages du thread de travail ; ceux d'un calcul remplacé sont ignorés
+    try:
+        while True:
+            message = result_queue.get_nowait()
+            kind, job_id = message[0], message[1]
+            if job_id != current_job["id"]:
+                continue
+            if kind == "progress":
+                progress_label.configure(text=f"Pivot {message[2]} — F = {message[3]:.2f}")
+                continue
+            if kind == "nodes":
+                show_branch_progress(*message[2:])
+                continue
+            cancel_button.state(["disabled"])
+            current_job["cancel"] = None
+            if kind == "done":
+                progress_label.configure(text=message[2]["stats"])
+                show_results(message[2])
+            elif kind == "cancelled":
+                progress_label.configure(text="Calcul annulé")
+                result_text.delete(1.0, tk.END)
+                result_text.insert(tk.END, "Calcul annulé.\n")
+            else:
+                progress_label.configure(text="")
+                messagebox.showerror("Erreur", f"Une erreur est survenue : {str(message[2])}")
+    except queue.Empty:
+        pass
+    root.after(POLL_INTERVAL_MS, poll_results)
+
+def show_branch_progress(nodes, incumbent, bound, gap):
+    # Avancement de la séparation et évaluation, dans le panneau des résultats
+    found = incumbent != float("-inf")
+    progress_label.configure(text=f"{nodes} nœuds — écart {gap:.2%}" if found else f"{nodes} nœuds")
+    result_text.delete(1.0, tk.END)
+    result_text.insert(tk.END, "Séparation et évaluation en cours...\n")
+    result_text.insert(tk.END, f"• Nœuds explorés : {nodes}\n")
+    result_text.insert(tk.END, f"• Meilleure solution entière : {incumbent:.2f}\n" if found
+                       else "• Meilleure solution entière : aucune pour l'instant\n")
+    result_text.insert(tk.END, f"• Borne supérieure : {bound:.2f}\n")
+    if found:
+        result_text.insert(tk.END, f"• Écart relatif : {gap:.2%}\n")
+
+def show_results(payload):
+    solution, objective_value, tableaux = payload["solution"], payload["objective_value"], payload["tableaux"]
+    A, b, names = payload["A"], payload["b"], payload["names"]
     
     try:
-        # Show a loading message
-        result_text.delete(1.0, tk.END)
-        result_text.insert(tk.END, "Calcul en cours...\n")
-        root.update()
-        
-        # Parse objective function for 3 variables
-        terms = [term.strip() for term in objective.split('+')]
-        c = [0, 0, 0]  # Initialize coefficients for x, y, z
-        
-        for term in terms:
-            if 'x' in term:
-                c[0] = float(term.replace("x", "").strip() or 1)
-            elif 'y' in term:
-                c[1] = float(term.replace("y", "").strip() or 1)
-            elif 'z' in term:
-                c[2] = float(term.replace("z", "").strip() or 1)
-        
-        A = []
-        b = []
-        for constraint in constraints:
-            coeffs, limit = parse_constraint(constraint)
-            A.append(coeffs)
-            b.append(limit)
-        
-        solution, objective_value, tableaux = simplex_manual(c, A, b)
-        
         if solution is None:
-            messagebox.showerror("Erreur", "Problème non borné ou insoluble.")
+            # Rien n'est affiché pour un modèle infaisable ou non borné
+            result_text.delete(1.0, tk.END)
+            result_text.insert(tk.END, f"{tableaux}\n")
+            tableau_viewer.clear()
+            messagebox.showerror("Erreur", f"{tableaux}.")
             return
         
-        x, y, z = solution
-        
         # Afficher les résultats avec un meilleur formatage
         result_text.delete(1.0, tk.END)
         
@@ -160,32 +376,38 @@ def calculate():
         result_text.insert(tk.END, "RÉSULTATS DE L'OPTIMISATION\n", "title")
         result_text.insert(tk.END, "\n")
         
-        result_text.insert(tk.END, "Solution optimale:\n", "subtitle")
-        result_text.insert(tk.END, f"• Recyclage (x): {x:.2f} tonnes\n", "result")
-        result_text.insert(tk.END, f"• Incinération (y): {y:.2f} tonnes\n", "result")
-        result_text.insert(tk.END, f"• Compostage (z): {z:.2f} tonnes\n", "result")
+        status = payload.get("status", OPTIMAL)
+        result_text.insert(tk.END, "Solution optimale:\n" if status == OPTIMAL else f"{status}:\n", "subtitle")
+        for name, value in zip(names, solution):
+            label = VARIABLE_LABELS.get(name, name)
+            result_text.insert(tk.END, f"• {label} ({name}): {value:.2f} tonnes\n", "result")
         result_text.insert(tk.END, f"• Total traité (F): {objective_value:.2f} tonnes\n\n", "result_highlight")
         
+        if payload["report"] is not None:
+            result_text.insert(tk.END, "Analyse de sensibilité:\n", "subtitle")
+            for line in format_sensitivity(payload["report"], names):
+                result_text.insert(tk.END, f"{line}\n", "result")
+        else:
+            # Pas de prix duaux pour un programme en nombres entiers
+            result_text.insert(tk.END, f"{payload['stats']}\n", "result")
+        result_text.insert(tk.END, "\n")
+        
         # Configurer les styles de texte
         result_text.tag_configure("title", font=("Segoe UI", 12, "bold"), foreground="#212121")
         result_text.tag_configure("subtitle", font=("Segoe UI", 11, "bold"), foreground="#424242")
         result_text.tag_configure("result", font=("Segoe UI", 10), foreground="#212121")
         result_text.tag_configure("result_highlight", font=("Segoe UI", 10, "bold"), foreground="#4CAF50")
         
-        # Ajouter les tableaux avec un formatage amélioré
-        result_text.insert(tk.END, "Tableaux de résolution:\n", "subtitle")
-        
-        var_names = ["F", "x", "y", "z"] + [f"s{i+1}" for i in range(len(b))] + ["b"]
-        for idx, tab in enumerate(tableaux):
-            df = pd.DataFrame(tab, columns=var_names)
-            result_text.insert(tk.END, f"Tableau {idx+1}:\n", "table_title")
-            result_text.insert(tk.END, f"{df.to_string(index=False)}\n\n", "table_content")
+        # Les tableaux sont formatés à la demande, page par page, dans le visualiseur dédié
+        result_text.insert(tk.END, f"Tableaux de résolution: {len(tableaux)} (voir ci-dessous)\n", "subtitle")
+        var_names = ["F"] + names + [f"s{i+1}" for i in range(len(b))] + ["b"]
+        tableau_viewer.set_tableaux(tableaux, var_names)
         
-        result_text.tag_configure("table_title", font=("Segoe UI", 10, "italic"), foreground="#616161")
-        result_text.tag_configure("table_content", font=("Consolas", 9))
-        
-        # Mettre à jour le graphique
-        plot_solution(solution, A, b, canvas, fig)
+        # Mettre à jour le graphique (uniquement pour le modèle à 3 variables x, y, z) ;
+        # le canvas Tk ne peut être dessiné que depuis le thread principal
+        if len(names) == len(VARIABLES):
+            ensure_figure()
+            plot_controller.update(solution, A, b, payload["senses"])
         
     except Exception as e:
         messagebox.showerror("Erreur", f"Une erreur est survenue : {str(e)}")
@@ -196,6 +418,19 @@ buttons_frame.pack(fill=tk.X, pady=15)
 
 ttk.Button(buttons_frame, text="+ Ajouter une contrainte", command=add_constraint, style='Secondary.TButton').pack(side=tk.LEFT, padx=(0, 10))
 ttk.Button(buttons_frame, text="Calculer la solution optimale", command=calculate, style='Primary.TButton').pack(side=tk.LEFT)
+cancel_button = ttk.Button(buttons_frame, text="Annuler", command=cancel_calculation, style='Secondary.TButton')
+cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+cancel_button.state(["disabled"])
+
+# Import / export des modèles (CPLEX LP, MPS libre, texte)
+file_buttons_frame = ttk.Frame(input_frame)
+file_buttons_frame.pack(fill=tk.X, pady=(0, 15))
+ttk.Button(file_buttons_frame, text="Importer un modèle...", command=import_model, style='Secondary.TButton').pack(side=tk.LEFT, padx=(0, 10))
+ttk.Button(file_buttons_frame, text="Exporter le modèle...", command=export_model, style='Secondary.TButton').pack(side=tk.LEFT)
+
+# Progression du calcul en arrière-plan
+progress_label = ttk.Label(input_frame, text="", font=("Segoe UI", 9, "italic"))
+progress_label.pack(anchor=tk.W)
 
 # Right column - Results and visualization in a scrollable container
 # Create a canvas with scrollbar for the right side
@@ -226,6 +461,15 @@ text_scrollbar = ttk.Scrollbar(results_card, orient="vertical", command=result_t
 text_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 result_text.config(yscrollcommand=text_scrollbar.set)
 
+# Historique des tableaux, paginé
+tableaux_card = ttk.Frame(results_frame, padding="15 15 15 15", style='Card.TFrame')
+tableaux_card.pack(fill=tk.X, expand=True, pady=(0, 15))
+
+ttk.Label(tableaux_card, text="Tableaux de résolution", style='Subheader.TLabel').pack(anchor=tk.W, pady=(0, 10))
+
+tableau_viewer = TableauViewer(tableaux_card)
+tableau_viewer.pack(fill=tk.BOTH, expand=True)
+
 # Visualization section with enhanced card-like appearance
 visualization_card = ttk.Frame(results_frame, style='Visualization.TFrame')
 visualization_card.pack(fill=tk.X, expand=True, pady=(0, 20))
@@ -237,9 +481,27 @@ graph_container = ttk.Frame(visualization_card)
 graph_container.pack(fill=tk.BOTH, expand=True)
 
 # Graphique avec meilleur style
-fig = plt.Figure(figsize=(10, 6), dpi=100, facecolor='#ffffff')
-canvas = FigureCanvasTkAgg(fig, master=graph_container)
-canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+# Créé au premier tracé : matplotlib n'est importé que sur le chemin interactif qui en a besoin
+fig = None
+canvas = None
+plot_controller = None
+graph_placeholder = ttk.Label(graph_container, text="Le graphique s'affichera après le calcul.",
+                              font=("Segoe UI", 9, "italic"))
+graph_placeholder.pack(pady=20)
+
+def ensure_figure():
+    # Les artistes du graphique persistent d'un calcul à l'autre ; seules leurs données sont mises à jour
+    global fig, canvas, plot_controller
+    if fig is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from src.visualization import PlotController
+        graph_placeholder.destroy()
+        fig = Figure(figsize=(10, 6), dpi=100, facecolor='#ffffff')
+        canvas = FigureCanvasTkAgg(fig, master=graph_container)
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        plot_controller = PlotController(fig, canvas)
+    return fig, canvas
 
 # Configure the canvas to update scroll region when the frame size changes
 def configure_scroll_region(event):
@@ -272,4 +534,5 @@ def on_window_resize(event):
 root.bind("<Configure>", on_window_resize)
 
 # Lancer l'application
+root.after(POLL_INTERVAL_MS, poll_results)
 root.mainloop()
\ No newline at end of file
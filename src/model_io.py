@@ -0,0 +1,542 @@
+import json
+import math
+import os
+import re
+import shutil
+from array import array
+
+import numpy as np
+
+from src.model_parser import VariableIndex, parse_model_file
+from src.sparse import CSCMatrix
+
+# Import/export des modèles aux formats CPLEX-LP et MPS libre, en plus du format texte de model_parser.
+# Les fichiers sont lus en flux, par blocs de lignes : les non-zéros vont directement dans des tampons
+# typés (array) convertis sans copie en tableaux NumPy, puis en A creuse (CSCMatrix) ou dense.
+# Conventions du solveur : maximisation (un objectif à minimiser est changé de signe) et variables >= 0 ;
+# les bornes des variables deviennent des contraintes, une borne inférieure négative est refusée.
+# Un cache binaire (un fichier .npy par tableau, relu mappé en mémoire) rend quasi instantané le
+# rechargement d'un gros modèle tant que le fichier source n'a pas changé.
+
+FORMATS = (".lp", ".mps", ".txt")
+CHUNK_BYTES = 1 << 20  # taille approximative d'un bloc de lignes lu en une fois
+CACHE_SUFFIX = ".npycache"
+CACHE_VERSION = 1
+TERMS_PER_LINE = 8  # termes par ligne des fichiers écrits (les lecteurs LP limitent la longueur des lignes)
+
+_SENSES = ("<=", ">=", "=")
+_SENSE_CODES = {"<=": 0, "=<": 0, "<": 0, ">=": 1, "=>": 1, ">": 1, "=": 2}
+_MPS_ROW_TYPES = {"L": 0, "G": 1, "E": 2}
+_OBJECTIVE, _IGNORED = -1, -2  # lignes MPS particulières : objectif, autres lignes N
+
+_LP_SECTIONS = {
+    "maximize": "max", "maximum": "max", "max": "max",
+    "minimize": "min", "minimum": "min", "min": "min",
+    "subject to": "rows", "such that": "rows", "st": "rows", "s.t.": "rows", "st.": "rows",
+    "bounds": "bounds", "bound": "bounds",
+    "general": "integer", "generals": "integer", "gen": "integer",
+    "binary": "binary", "binaries": "binary", "bin": "binary",
+    "end": "end",
+}
+_LP_TOKEN = re.compile(
+    r"\s*(?:(<=|>=|=<|=>|<|>|=)|([+-])|((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?\b)"
+    r"|([A-Za-z_!\"#$%&()/,.;?@'`{}|~][^\s+\-*<>=:^\\]*)|(\*))",
+    re.IGNORECASE,
+)
+_LP_LABEL = re.compile(r"\s*[^\s:+\-<>=]+\s*:")
+_MPS_SECTIONS = ("NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA")
+
+
+def _lines(path):
+    # Lignes du fichier, lues par blocs d'environ CHUNK_BYTES octets
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.readlines(CHUNK_BYTES)
+            if not chunk:
+                return
+            yield from chunk
+
+
+class _Rows:
+    # Tampons typés des non-zéros (ligne, colonne, valeur), des seconds membres et des sens
+
+    def __init__(self):
+        self.rows = array("q")
+        self.cols = array("q")
+        self.vals = array("d")
+        self.b = array("d")
+        self.senses = array("b")
+
+    def add(self, row, col, val):
+        self.rows.append(row)
+        self.cols.append(col)
+        self.vals.append(val)
+
+    def close(self, sense, rhs):
+        # Termine la ligne courante ; retourne l'indice de la suivante
+        self.b.append(rhs)
+        self.senses.append(sense)
+        return len(self.b)
+
+
+def _set_bound(bounds, name, sense, value):
+    lower, upper = bounds.get(name, (0.0, math.inf))
+    if sense != 0:
+        lower = value
+    if sense != 1:
+        upper = value
+    bounds[name] = (lower, upper)
+
+
+def _bound_rows(bounds, index, rows):
+    # Bornes des variables ajoutées comme contraintes après celles du modèle
+    m = len(rows.b)
+    for name, (lower, upper) in bounds.items():
+        if lower < 0:
+            raise ValueError(f"Variable '{name}' : borne inférieure négative non prise en charge (variables >= 0)")
+        j = index.get(name)
+        if lower == upper:
+            rows.add(m, j, 1.0)
+            m = rows.close(2, lower)
+            continue
+        if lower > 0:
+            rows.add(m, j, 1.0)
+            m = rows.close(1, lower)
+        if upper < math.inf:
+            rows.add(m, j, 1.0)
+            m = rows.close(0, upper)
+
+
+def _coalesce(rows, cols, vals, n):
+    # Additionne les coefficients répétés d'une même variable dans une même ligne
+    key = rows * max(n, 1) + cols
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if key.size else np.zeros(0, dtype=np.int64)
+    if first.size == key.size:
+        return rows, cols, vals
+    key = key[first]
+    return key // max(n, 1), key % max(n, 1), np.add.reduceat(vals[order], first)
+
+
+def _build(obj_cols, obj_vals, rows, index, integer, maximize, sparse):
+    # Une variable citée seulement parmi les entières est déclarée avant de dimensionner c et A
+    integer = sorted(index.get(name) for name in integer)
+    n = len(index)
+    c = np.zeros(n)
+    np.add.at(c, np.frombuffer(obj_cols, dtype=np.int64), np.frombuffer(obj_vals))
+    if not maximize:
+        c = 0.0 - c
+    m = len(rows.b)
+    r, j, v = _coalesce(np.frombuffer(rows.rows, dtype=np.int64), np.frombuffer(rows.cols, dtype=np.int64),
+                        np.frombuffer(rows.vals), n)
+    if sparse:
+        A = CSCMatrix.from_coo(r, j, v, (m, n))
+    else:
+        A = np.zeros((m, n))
+        A[r, j] = v
+    b = np.frombuffer(rows.b).copy()
+    senses = np.array(_SENSES)[np.frombuffer(rows.senses, dtype=np.int8)] if m else np.empty(0, dtype="<U2")
+    return c, A, b, senses, index.names, [index.names[j] for j in integer]
+
+
+def _lp_tokens(line, lineno):
+    pos = 0
+    while pos < len(line):
+        match = _LP_TOKEN.match(line, pos)
+        if match is None or match.end() == pos:
+            if line[pos:].strip():
+                raise ValueError(f"Ligne {lineno} : symbole inattendu près de '{line[pos:].strip()}'")
+            return
+        sense, sign, number, name, _ = match.groups()
+        if sense:
+            yield "sense", _SENSE_CODES[sense]
+        elif sign:
+            yield "sign", -1.0 if sign == "-" else 1.0
+        elif number:
+            yield "number", float(number)
+        elif name:
+            yield "name", name
+        pos = match.end()
+
+
+def _lp_bound(line, lineno, bounds):
+    # Ligne de la section Bounds : x <= u, x >= l, x = v, l <= x <= u (valeurs signées, inf admis)
+    items, sign = [], 1.0
+    for kind, value in _lp_tokens(line, lineno):
+        if kind == "sign":
+            sign = value
+            continue
+        items.append((kind, sign * value if kind == "number" else value))
+        sign = 1.0
+    kinds = tuple(kind for kind, _ in items)
+    if kinds == ("name", "name") and items[1][1].lower() == "free":
+        raise ValueError(f"Ligne {lineno} : variable libre '{items[0][1]}' non prise en charge (variables >= 0)")
+    flip = {0: 1, 1: 0, 2: 2}
+    if kinds == ("name", "sense", "number"):
+        _set_bound(bounds, items[0][1], items[1][1], items[2][1])
+    elif kinds in (("number", "sense", "name"), ("number", "sense", "name", "sense", "number")):
+        _set_bound(bounds, items[2][1], flip[items[1][1]], items[0][1])
+        if len(items) == 5:
+            _set_bound(bounds, items[2][1], items[3][1], items[4][1])
+    else:
+        raise ValueError(f"Ligne {lineno} : borne illisible '{line.strip()}'")
+
+
+def read_lp(path, sparse=True):
+    # Lit un fichier CPLEX-LP. Retourne (c, A, b, senses, names, integer), integer étant la liste des
+    # variables entières (sections General et Binary ; une variable binaire reçoit aussi x <= 1).
+    index = VariableIndex()
+    obj_cols, obj_vals = array("q"), array("d")
+    rows = _Rows()
+    bounds, integer = {}, {}
+    section, maximize = None, True
+    m = 0
+    sign, coeff, sense = 1.0, None, None
+    for lineno, line in enumerate(_lines(path), 1):
+        line = line.split("\\", 1)[0]
+        key = " ".join(line.lower().split())
+        if not key:
+            continue
+        if key in _LP_SECTIONS:
+            if sense is not None:
+                raise ValueError(f"Ligne {lineno} : second membre manquant avant '{line.strip()}'")
+            section = _LP_SECTIONS[key]
+            if section in ("max", "min"):
+                maximize = section == "max"
+                section = "objective"
+            if section == "end":
+                break
+            sign, coeff = 1.0, None
+            continue
+        if section in ("objective", "rows"):
+            if coeff is None and sense is None and sign == 1.0:
+                label = _LP_LABEL.match(line)
+                if label is not None:
+                    line = line[label.end():]
+            for kind, value in _lp_tokens(line, lineno):
+                if kind == "sign":
+                    sign *= value
+                elif kind == "number":
+                    if sense is not None:
+                        m = rows.close(sense, sign * value)
+                        sign, coeff, sense = 1.0, None, None
+                    else:
+                        coeff = value if coeff is None else coeff * value
+                elif kind == "name":
+                    if sense is not None:
+                        raise ValueError(f"Ligne {lineno} : variable '{value}' dans le second membre")
+                    j = index.get(value)
+                    value = sign * (1.0 if coeff is None else coeff)
+                    if section == "objective":
+                        obj_cols.append(j)
+                        obj_vals.append(value)
+                    else:
+                        rows.add(m, j, value)
+                    sign, coeff = 1.0, None
+                elif section == "objective":
+                    raise ValueError(f"Ligne {lineno} : comparaison inattendue dans l'objectif")
+                elif coeff is not None:
+                    raise ValueError(f"Ligne {lineno} : terme constant avant la comparaison non pris en charge")
+                else:
+                    sense = value
+        elif section == "bounds":
+            _lp_bound(line, lineno, bounds)
+        elif section in ("integer", "binary"):
+            for name in line.split():
+                integer[name] = None
+                if section == "binary":
+                    lower, upper = bounds.get(name, (0.0, math.inf))
+                    bounds[name] = (lower, min(upper, 1.0))
+        else:
+            raise ValueError(f"Ligne {lineno} : contenu hors section ('{line.strip()}')")
+    _bound_rows(bounds, index, rows)
+    return _build(obj_cols, obj_vals, rows, index, integer, maximize, sparse)
+
+
+def read_mps(path, sparse=True):
+    # Lit un fichier MPS libre (champs séparés par des blancs). Retourne (c, A, b, senses, names, integer).
+    # Objectif : première ligne N, minimisé sauf section OBJSENSE MAX ; entiers : marqueurs INTORG/INTEND
+    # et bornes BV, LI, UI. Les sections RANGES et les bornes MI, FR, SC ne sont pas prises en charge.
+    index = VariableIndex()
+    obj_cols, obj_vals = array("q"), array("d")
+    rows = _Rows()
+    row_index, codes = {}, array("b")
+    bounds, integer = {}, {}
+    section, maximize, in_integer_block = None, False, False
+    b = None
+    for lineno, line in enumerate(_lines(path), 1):
+        fields = line.split()
+        if not fields or line[0] == "*":
+            continue
+        if not line[0].isspace() and fields[0].upper() in _MPS_SECTIONS:
+            section = fields[0].upper()
+            if section == "OBJSENSE" and len(fields) > 1:
+                maximize = fields[1].upper() in ("MAX", "MAXIMIZE")
+            elif section == "RANGES":
+                raise ValueError(f"Ligne {lineno} : section RANGES non prise en charge")
+            elif section == "ENDATA":
+                break
+            continue
+        if section == "COLUMNS":
+            if len(fields) >= 3 and fields[1].strip("'\"").upper() == "MARKER":
+                in_integer_block = fields[2].strip("'\"").upper() == "INTORG"
+                continue
+            j = index.get(fields[0])
+            if in_integer_block:
+                integer[fields[0]] = None
+            for k in range(1, len(fields) - 1, 2):
+                r = row_index.get(fields[k])
+                if r is None:
+                    raise ValueError(f"Ligne {lineno} : ligne '{fields[k]}' non déclarée dans ROWS")
+                if r >= 0:
+                    rows.add(r, j, float(fields[k + 1]))
+                elif r == _OBJECTIVE:
+                    obj_cols.append(j)
+                    obj_vals.append(float(fields[k + 1]))
+        elif section == "ROWS":
+            kind, name = fields[0].upper(), fields[1]
+            if kind == "N":
+                row_index[name] = _IGNORED if _OBJECTIVE in row_index.values() else _OBJECTIVE
+            elif kind in _MPS_ROW_TYPES:
+                row_index[name] = len(codes)
+                codes.append(_MPS_ROW_TYPES[kind])
+            else:
+                raise ValueError(f"Ligne {lineno} : type de ligne '{fields[0]}' inconnu")
+        elif section == "RHS":
+            if b is None:
+                b = np.zeros(len(codes))
+            # Nom du jeu de seconds membres facultatif : paires (ligne, valeur) en fin de ligne
+            for k in range(len(fields) % 2, len(fields) - 1, 2):
+                r = row_index.get(fields[k])
+                if r is None:
+                    raise ValueError(f"Ligne {lineno} : ligne '{fields[k]}' non déclarée dans ROWS")
+                if r >= 0:
+                    b[r] = float(fields[k + 1])
+        elif section == "BOUNDS":
+            kind = fields[0].upper()
+            if kind in ("FR", "MI", "SC"):
+                raise ValueError(f"Ligne {lineno} : borne {kind} non prise en charge (variables >= 0)")
+            has_value = kind not in ("BV", "PL")
+            name = fields[-2] if has_value else fields[-1]
+            value = float(fields[-1]) if has_value else None
+            if kind in ("BV", "LI", "UI"):
+                integer[name] = None
+            if kind == "BV":
+                bounds[name] = (0.0, 1.0)
+            elif kind in ("UP", "UI"):
+                _set_bound(bounds, name, 0, value)
+            elif kind in ("LO", "LI"):
+                _set_bound(bounds, name, 1, value)
+            elif kind == "FX":
+                _set_bound(bounds, name, 2, value)
+            elif kind != "PL":
+                raise ValueError(f"Ligne {lineno} : type de borne '{fields[0]}' inconnu")
+        elif section == "OBJSENSE":
+            maximize = fields[0].upper() in ("MAX", "MAXIMIZE")
+        elif section != "NAME":
+            raise ValueError(f"Ligne {lineno} : contenu hors section ('{line.strip()}')")
+    rows.b.frombytes((np.zeros(len(codes)) if b is None else b).tobytes())
+    rows.senses = codes
+    _bound_rows(bounds, index, rows)
+    return _build(obj_cols, obj_vals, rows, index, integer, maximize, sparse)
+
+
+def _num(value):
+    # Nombre le plus court relu à l'identique
+    text = repr(float(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _row_major(A, n):
+    # (début de chaque ligne, colonnes, valeurs) des non-zéros rangés par ligne
+    A = CSCMatrix.from_any(A, n)
+    order = np.argsort(A.indices, kind="stable")
+    starts = np.zeros(A.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(A.indices, minlength=A.shape[0]), out=starts[1:])
+    return starts, A._col_of_nz[order], A.data[order]
+
+
+def _write_terms(f, cols, vals, names):
+    if cols.size == 0:
+        # Une expression LP contient au moins un terme
+        f.write(f" 0 {names[0]}")
+        return
+    for k, (j, value) in enumerate(zip(cols.tolist(), vals.tolist())):
+        if k and k % TERMS_PER_LINE == 0:
+            f.write("\n  ")
+        f.write(f" {'-' if value < 0 else '+'} {_num(abs(value))} {names[j]}")
+
+
+def _model_arrays(c, A, b, senses, names):
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    senses = np.array(["<="] * b.size if senses is None else senses, dtype="<U2")
+    names = list(names) if names is not None else [f"x{j + 1}" for j in range(c.size)]
+    return c, b, senses, names
+
+
+def write_lp(path, c, A, b, senses=None, names=None, integer=()):
+    # Écrit le modèle (maximisation, variables >= 0) au format CPLEX-LP ; A dense ou CSCMatrix
+    c, b, senses, names = _model_arrays(c, A, b, senses, names)
+    starts, cols, vals = _row_major(A, c.size)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\\ Maximisation, variables >= 0\nMaximize\n obj:")
+        objective = np.flatnonzero(c)
+        _write_terms(f, objective, c[objective], names)
+        f.write("\nSubject To\n")
+        for i in range(b.size):
+            f.write(f" c{i + 1}:")
+            _write_terms(f, cols[starts[i]:starts[i + 1]], vals[starts[i]:starts[i + 1]], names)
+            f.write(f" {senses[i]} {_num(b[i])}\n")
+        integer = list(integer)
+        if integer:
+            f.write("General\n")
+            for k in range(0, len(integer), TERMS_PER_LINE):
+                f.write(f" {' '.join(integer[k:k + TERMS_PER_LINE])}\n")
+        f.write("End\n")
+
+
+def write_mps(path, c, A, b, senses=None, names=None, integer=(), name="MODELE"):
+    # Écrit le modèle au format MPS libre, avec OBJSENSE MAX ; entiers entre marqueurs INTORG/INTEND
+    c, b, senses, names = _model_arrays(c, A, b, senses, names)
+    A = CSCMatrix.from_any(A, c.size)
+    row_type = {"<=": "L", ">=": "G", "=": "E"}
+    integer = set(integer)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"NAME {name}\nOBJSENSE\n    MAX\nROWS\n N obj\n")
+        for i in range(b.size):
+            f.write(f" {row_type[senses[i]]} c{i + 1}\n")
+        f.write("COLUMNS\n")
+        in_integer_block = False
+        for j, column in enumerate(names):
+            if (column in integer) != in_integer_block:
+                in_integer_block = not in_integer_block
+                f.write(f"    MARKER 'MARKER' '{'INTORG' if in_integer_block else 'INTEND'}'\n")
+            rows, values = A.column(j)
+            if c[j] != 0 or rows.size == 0:
+                f.write(f"    {column} obj {_num(c[j])}\n")
+            for i, value in zip(rows.tolist(), values.tolist()):
+                f.write(f"    {column} c{i + 1} {_num(value)}\n")
+        if in_integer_block:
+            f.write("    MARKER 'MARKER' 'INTEND'\n")
+        f.write("RHS\n")
+        for i in np.flatnonzero(b).tolist():
+            f.write(f"    RHS c{i + 1} {_num(b[i])}\n")
+        f.write("ENDATA\n")
+
+
+def to_text(c, A, b, senses=None, names=None):
+    # Modèle au format texte de model_parser : (objectif, liste des contraintes)
+    c, b, senses, names = _model_arrays(c, A, b, senses, names)
+    starts, cols, vals = _row_major(A, c.size)
+
+    def linear(columns, values):
+        if columns.size == 0:
+            return f"0{names[0]}"
+        terms = []
+        for j, value in zip(columns.tolist(), values.tolist()):
+            name = names[j]
+            # '3e1' serait lu comme le nombre 30 : le nom est alors séparé par '*'
+            term = f"{_num(abs(value))}{'*' if name[0] in 'eE' else ''}{name}"
+            sign = "-" if value < 0 else "+"
+            terms.append((f"-{term}" if value < 0 else term) if not terms else f"{sign} {term}")
+        return " ".join(terms)
+
+    objective = np.flatnonzero(c)
+    constraints = [f"{linear(cols[starts[i]:starts[i + 1]], vals[starts[i]:starts[i + 1]])} {senses[i]} {_num(b[i])}"
+                   for i in range(b.size)]
+    return linear(objective, c[objective]), constraints
+
+
+def write_text(path, c, A, b, senses=None, names=None, integer=()):
+    # Format texte de parse_model_file (les variables entières n'y sont pas représentées)
+    objective, constraints = to_text(c, A, b, senses, names)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{objective}\n")
+        for constraint in constraints:
+            f.write(f"{constraint}\n")
+
+
+def _source_stamp(path):
+    info = os.stat(path)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def save_cache(directory, c, A, b, senses, names, integer=(), source=None):
+    # Un fichier .npy par tableau (A en CSC) et un meta.json ; écrit à côté puis renommé
+    A = CSCMatrix.from_any(A, len(c))
+    column = {name: j for j, name in enumerate(names)}
+    temporary = f"{directory}.tmp{os.getpid()}"
+    os.makedirs(temporary, exist_ok=True)
+    arrays = {
+        "c": np.asarray(c, dtype=float), "b": np.asarray(b, dtype=float),
+        "senses": np.asarray(senses, dtype="<U2"), "names": np.asarray(names, dtype=str),
+        "data": A.data, "indices": A.indices, "indptr": A.indptr,
+        "integer": np.asarray([column[name] for name in integer], dtype=np.int64),
+    }
+    for key, values in arrays.items():
+        np.save(os.path.join(temporary, f"{key}.npy"), values, allow_pickle=False)
+    meta = {"version": CACHE_VERSION, "shape": list(A.shape),
+            "source": None if source is None else _source_stamp(source)}
+    with open(os.path.join(temporary, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.replace(temporary, directory)
+
+
+def load_cache(directory, source=None):
+    # Tableaux du cache mappés en mémoire (A en CSCMatrix), ou None si absent, d'une autre version
+    # ou plus ancien que le fichier source
+    try:
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    if source is not None and meta.get("source") != _source_stamp(source):
+        return None
+
+    def load(key):
+        return np.load(os.path.join(directory, f"{key}.npy"), mmap_mode="r", allow_pickle=False)
+
+    names = load("names").tolist()
+    A = CSCMatrix(load("data"), load("indices"), load("indptr"), meta["shape"])
+    return (load("c"), A, load("b"), load("senses"), names, [names[j] for j in load("integer").tolist()])
+
+
+def cache_path(path):
+    return path + CACHE_SUFFIX
+
+
+def load_model(path, sparse=True, cache=False):
+    # Modèle .lp, .mps ou texte (parse_model_file) selon l'extension ; retourne
+    # (c, A, b, senses, names, integer). cache=True : relit le cache binaire s'il est à jour, sinon
+    # analyse le fichier puis écrit le cache (en silence si le dossier n'est pas accessible en écriture).
+    if cache:
+        model = load_cache(cache_path(path), source=path)
+        if model is not None:
+            c, A, b, senses, names, integer = model
+            return c, (A if sparse else A.toarray()), b, senses, names, integer
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".lp":
+        model = read_lp(path, sparse=sparse)
+    elif extension == ".mps":
+        model = read_mps(path, sparse=sparse)
+    else:
+        model = parse_model_file(path, sparse=sparse) + ([],)
+    if cache:
+        try:
+            save_cache(cache_path(path), *model, source=path)
+        except OSError:
+            pass
+    return model
+
+
+def write_model(path, c, A, b, senses=None, names=None, integer=()):
+    # Écrit le modèle au format choisi par l'extension (.lp, .mps, sinon texte)
+    extension = os.path.splitext(path)[1].lower()
+    writer = {".lp": write_lp, ".mps": write_mps}.get(extension, write_text)
+    writer(path, c, A, b, senses, names, integer)
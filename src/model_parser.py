@@ -0,0 +1,152 @@
+import re
+
+import numpy as np
+
+from src.sparse import CSCMatrix
+
+# Un terme : signe optionnel, coefficient optionnel (1 par défaut), '*' optionnel, nom de variable
+_TERM = re.compile(
+    r"\s*([+-]?)\s*((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)?\s*\*?\s*([A-Za-z_][A-Za-z0-9_]*)\s*"
+)
+_SENSE = re.compile(r"(<=|>=|=<|=>|=)")
+_SENSE_ALIASES = {"=<": "<=", "=>": ">="}
+
+FORMAT_HELP = "Format invalide. Utilisez par ex. '500x + 800y + 600z <= 1500000'"
+
+
+class VariableIndex:
+    # Table internée nom de variable -> indice de colonne, dans l'ordre d'apparition
+
+    def __init__(self, names=()):
+        self.columns = {}
+        self.names = []
+        for name in names:
+            self.get(name)
+
+    def get(self, name):
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = len(self.names)
+            self.names.append(name)
+        return column
+
+    def __len__(self):
+        return len(self.names)
+
+
+class _GrowableCOO:
+    # Tampons NumPy préalloués (doublés au besoin) pour les triplets (ligne, colonne, valeur)
+
+    def __init__(self, capacity=1024):
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.cols = np.empty(capacity, dtype=np.int64)
+        self.vals = np.empty(capacity)
+        self.size = 0
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > self.rows.size:
+            capacity = max(needed, 2 * self.rows.size)
+            for name in ("rows", "cols", "vals"):
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:self.size] = old[:self.size]
+                setattr(self, name, new)
+
+    def extend(self, row, cols, vals):
+        k = len(cols)
+        self._reserve(k)
+        self.rows[self.size:self.size + k] = row
+        self.cols[self.size:self.size + k] = cols
+        self.vals[self.size:self.size + k] = vals
+        self.size += k
+
+
+def parse_expression(expr, index):
+    # Compile une expression linéaire en (colonnes, coefficients) ; les doublons sont additionnés
+    terms = {}
+    pos = 0
+    expr = expr.strip()
+    if not expr:
+        raise ValueError(FORMAT_HELP)
+    while pos < len(expr):
+        match = _TERM.match(expr, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"{FORMAT_HELP} (terme illisible près de '{expr[pos:]}')")
+        sign, coeff, name = match.groups()
+        if pos > 0 and not sign:
+            raise ValueError(f"{FORMAT_HELP} (opérateur manquant avant '{name}')")
+        value = float(coeff) if coeff else 1.0
+        if sign == "-":
+            value = -value
+        column = index.get(name)
+        terms[column] = terms.get(column, 0.0) + value
+        pos = match.end()
+    return list(terms.keys()), list(terms.values())
+
+
+def parse_linear_constraint(constraint_str, index):
+    # Retourne (colonnes, coefficients, sens, second membre) pour une contrainte quelconque
+    parts = _SENSE.split(constraint_str)
+    if len(parts) != 3:
+        raise ValueError(FORMAT_HELP)
+    left, sense, right = parts
+    cols, vals = parse_expression(left, index)
+    try:
+        rhs = float(right.strip())
+    except ValueError:
+        raise ValueError(f"{FORMAT_HELP} (second membre '{right.strip()}' non numérique)")
+    return cols, vals, _SENSE_ALIASES.get(sense, sense), rhs
+
+
+def _iter_lines(lines):
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield line
+
+
+def parse_model(objective, constraints, variables=(), sparse=False):
+    # Compile l'objectif et les contraintes en une seule passe (les contraintes peuvent être un itérable
+    # paresseux, par ex. un fichier). Retourne (c, A, b, senses, var_names) ; A est dense ou CSCMatrix.
+    index = VariableIndex(variables)
+    obj_cols, obj_vals = parse_expression(objective, index)
+
+    coo = _GrowableCOO()
+    capacity = len(constraints) if hasattr(constraints, "__len__") else 1024
+    b = np.empty(max(capacity, 1))
+    senses = np.empty(max(capacity, 1), dtype="<U2")
+    m = 0
+    for line in _iter_lines(constraints):
+        try:
+            cols, vals, sense, rhs = parse_linear_constraint(line, index)
+        except ValueError as e:
+            raise ValueError(f"Contrainte {m + 1} : {e}")
+        if m == b.size:
+            b = np.resize(b, 2 * m)
+            senses = np.resize(senses, 2 * m)
+        coo.extend(m, cols, vals)
+        b[m] = rhs
+        senses[m] = sense
+        m += 1
+
+    n = len(index)
+    c = np.zeros(n)
+    np.add.at(c, obj_cols, obj_vals)
+    if sparse:
+        A = CSCMatrix.from_coo(coo.rows[:coo.size], coo.cols[:coo.size], coo.vals[:coo.size], (m, n))
+    else:
+        A = np.zeros((m, n))
+        A[coo.rows[:coo.size], coo.cols[:coo.size]] = coo.vals[:coo.size]
+    return c, A, b[:m].copy(), senses[:m].copy(), index.names
+
+
+def parse_model_file(path, variables=(), sparse=True):
+    # Fichier texte : première ligne utile = objectif (maximisé), puis une contrainte par ligne.
+    # Les lignes vides et les commentaires '#' sont ignorés ; le fichier est lu en flux.
+    with open(path, encoding="utf-8") as f:
+        lines = _iter_lines(f)
+        objective = next(lines, None)
+        if objective is None:
+            raise ValueError(f"{path} : fichier de modèle vide")
+        return parse_model(objective, lines, variables=variables, sparse=sparse)
@@ -0,0 +1,114 @@
+import numpy as np
+
+# Règles de pivot pour les simplexes en tableau (solve_tableau, WarmStartSolver) :
+# - choix de la variable entrante (pricing) : Dantzig, Bland, steepest-edge exact, devex, partiel ;
+# - test du ratio : classique (plus petit ratio) ou de Harris en deux passes, qui tolère une violation
+#   de l'ordre de `delta` pour choisir, parmi les ratios quasi égaux, le pivot de plus grand module.
+# Après une suite de pivots dégénérés, la règle de Bland prend le relais jusqu'à la fin de la phase :
+# elle garantit la terminaison là où Dantzig peut cycler.
+
+PRICING_RULES = ("dantzig", "bland", "steepest", "devex", "partial")
+RATIO_TESTS = ("textbook", "harris")
+DEFAULT_PRICING = "dantzig"
+DEFAULT_RATIO_TEST = "harris"
+BLAND_AFTER = 50  # pivots dégénérés consécutifs avant de basculer sur la règle de Bland
+PARTIAL_MIN_WINDOW = 16
+
+
+def check_rules(pricing, ratio_test):
+    if pricing not in PRICING_RULES:
+        raise ValueError(f"Règle de pricing inconnue '{pricing}' (attendu : {', '.join(PRICING_RULES)})")
+    if ratio_test not in RATIO_TESTS:
+        raise ValueError(f"Test du ratio inconnu '{ratio_test}' (attendu : {', '.join(RATIO_TESTS)})")
+
+
+class Pricer:
+    # État du pricing pour une phase : poids devex, fenêtre du pricing partiel, bascule sur Bland
+
+    def __init__(self, rule, n_cols, tol):
+        self.rule = rule
+        self.tol = tol
+        self.weights = np.ones(n_cols) if rule == "devex" else None
+        self.window = max(PARTIAL_MIN_WINDOW, -(-n_cols // 8))
+        self.offset = 0
+        self.degenerate_streak = 0
+
+    @property
+    def bland(self):
+        return self.rule == "bland" or self.degenerate_streak >= BLAND_AFTER
+
+    def choose(self, reduced, columns):
+        # Indice (dans reduced) de la colonne entrante, ou -1 si aucune n'améliore l'objectif.
+        # reduced : coûts réduits (négatif = améliorant) ; columns() : colonnes du tableau, calculées
+        # seulement pour steepest-edge.
+        eligible = reduced < -self.tol
+        if not np.any(eligible):
+            return -1
+        if self.bland:
+            return int(np.argmax(eligible))
+        if self.rule == "steepest":
+            gamma = 1.0 + np.einsum("ij,ij->j", columns(), columns())
+            scores = np.where(eligible, reduced * reduced / gamma, -1.0)
+            return int(np.argmax(scores))
+        if self.rule == "devex":
+            scores = np.where(eligible, reduced * reduced / self.weights, -1.0)
+            return int(np.argmax(scores))
+        if self.rule == "partial":
+            n = reduced.size
+            for start in range(self.offset, self.offset + n, self.window):
+                window = np.arange(start, min(start + self.window, self.offset + n)) % n
+                candidates = window[eligible[window]]
+                if candidates.size:
+                    self.offset = (start + self.window) % n
+                    return int(candidates[np.argmin(reduced[candidates])])
+            return -1
+        return int(np.argmin(reduced))
+
+    def pivoted(self, q, pivot_row, leaving, step, degenerate_tol):
+        # pivot_row : ligne pivot avant élimination, sur les mêmes colonnes que reduced ;
+        # leaving : indice (dans reduced) de la sortante, ou -1 si elle n'est pas une colonne éligible
+        if step <= degenerate_tol:
+            self.degenerate_streak += 1
+        else:
+            self.degenerate_streak = 0
+        if self.weights is not None:
+            alpha = pivot_row[q]
+            w_q = self.weights[q]
+            self.weights = np.maximum(self.weights, (pivot_row / alpha) ** 2 * w_q)
+            if leaving >= 0:
+                self.weights[leaving] = max(w_q / alpha ** 2, 1.0)
+
+
+def ratio_test(column, rhs, tol, rule=DEFAULT_RATIO_TEST, delta=0.0, basis=None, upper=None):
+    # Ligne sortante (indice dans column) et pas, ou (-1, inf) si la direction est non bornée.
+    # Classique : plus petit rhs/column parmi column > tol, ex aequo départagés par le plus petit indice
+    # de base si basis est fourni (règle de Bland). Harris : ratios relâchés de delta en première passe,
+    # puis plus grand pivot parmi les lignes dont le ratio exact ne dépasse pas ce seuil.
+    # upper (bornes supérieures des variables de base, inf si aucune) : une ligne où column < -tol bloque
+    # aussi le pas quand sa variable de base atteint sa borne, au ratio (upper - rhs) / -column.
+    if upper is None:
+        eligible = column > tol
+        room, alpha = np.maximum(rhs, 0.0), column
+    else:
+        rising = (column < -tol) & np.isfinite(upper)
+        eligible = (column > tol) | rising
+        room = np.maximum(np.where(rising, upper - rhs, rhs), 0.0)
+        alpha = np.abs(column)
+    if not np.any(eligible):
+        return -1, np.inf
+    ratios = np.full(column.shape, np.inf)
+    np.divide(room, alpha, out=ratios, where=eligible)
+    if rule == "harris" and basis is None:
+        relaxed = np.full(column.shape, np.inf)
+        np.divide(room + delta, alpha, out=relaxed, where=eligible)
+        bound = relaxed.min()
+        candidates = np.flatnonzero(ratios <= bound)
+        r = int(candidates[np.argmax(alpha[candidates])])
+        return r, ratios[r]
+    best = ratios.min()
+    if basis is not None:
+        ties = np.flatnonzero(ratios <= best + tol * max(1.0, best))
+        r = int(ties[np.argmin(basis[ties])])
+    else:
+        r = int(np.argmin(ratios))
+    return r, ratios[r]
@@ -0,0 +1,297 @@
+import argparse
+import csv
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from data.marrakech_data import PRODUCTION_ROW
+from src.batch import default_model, load_scenarios, scenario_arrays
+from src.branch_and_bound import FEASIBLE
+from src.model_io import load_model
+from src.simplex_solver import OPTIMAL
+from src.solver import solve
+from src.sparse import CSCMatrix
+from src.warm_start import WarmStartSolver
+
+# Planification sur plusieurs jours. Le modèle d'un jour (c, A, b, sens) est répété sur T jours, avec
+# les seconds membres prévus pour chaque jour (budget, production...). Chaque ligne reportée i reçoit
+# une variable de stock s_t >= 0 : la part non traitée le jour t passe au jour t + 1,
+#     A_i x_t + s_t - s_{t-1} (sens_i) b_{i,t},   s_0 = stock initial (porté au second membre),
+# avec au besoin une ligne de capacité s_t <= capacité et un coût de stockage dans l'objectif.
+# La matrice est en escalier : un bloc A par jour sur la diagonale, couplé au jour suivant uniquement
+# par les colonnes de stock. Colonnes du jour t : n variables puis k stocks ; lignes du jour t : m lignes
+# puis les k capacités éventuelles.
+#
+# En mode glissant, seule une fenêtre de quelques jours est optimisée ; chaque matin, les décisions du
+# premier jour sont arrêtées, la fenêtre avance d'un jour et les prévisions sont mises à jour. Le modèle
+# de la fenêtre garde la même structure (seul b change) : il est ré-optimisé à chaud depuis la base
+# précédente décalée d'un jour, au lieu d'être reconstruit et résolu à froid.
+
+
+def _per_stock(value, k):
+    return np.broadcast_to(np.asarray(value, dtype=float), (k,)).copy()
+
+
+def horizon_model(c, A, b, senses, forecasts, carried=(), initial_stock=0.0, storage_capacity=np.inf,
+                  holding_cost=0.0, names=None, sparse=False):
+    # Modèle sur T = len(forecasts) jours ; forecasts (T, m) : seconds membres de chaque jour (b répété si
+    # forecasts est un entier T). carried : indices des lignes reportées ; initial_stock, storage_capacity
+    # et holding_cost : scalaires ou une valeur par ligne reportée. Retourne (c, A, b, sens, noms) ;
+    # A est une CSCMatrix si sparse, dense sinon.
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n, m = c.size, b.size
+    senses = np.array(["<="] * m if senses is None else senses, dtype="<U2")
+    names = list(names) if names is not None else [f"x{j + 1}" for j in range(n)]
+    forecasts = np.tile(b, (forecasts, 1)) if np.isscalar(forecasts) else np.asarray(forecasts, dtype=float)
+    if forecasts.ndim != 2 or forecasts.shape[1] != m:
+        raise ValueError(f"Prévisions de forme {forecasts.shape}, attendu (jours, {m})")
+    carried = np.asarray(carried, dtype=int).reshape(-1)
+    k = carried.size
+    T = forecasts.shape[0]
+    capacity = _per_stock(storage_capacity, k)
+    limited = np.flatnonzero(np.isfinite(capacity))
+    n_day, m_day = n + k, m + limited.size
+
+    # Blocs diagonaux : les non-zéros du modèle d'un jour, répétés avec un décalage par jour
+    matrix = CSCMatrix.from_any(A if isinstance(A, CSCMatrix) or hasattr(A, "tocsc")
+                                else np.asarray(A, dtype=float).reshape(m, n), n)
+    r, j, v = matrix.indices, matrix._col_of_nz, matrix.data
+    stock = np.arange(k)
+    day_r = np.concatenate([r, carried, m + np.arange(limited.size)])
+    day_j = np.concatenate([j, n + stock, n + limited])
+    day_v = np.concatenate([v, np.ones(k), np.ones(limited.size)])
+    days = np.arange(T)
+    rows = (day_r[None, :] + m_day * days[:, None]).ravel()
+    cols = (day_j[None, :] + n_day * days[:, None]).ravel()
+    vals = np.tile(day_v, T)
+    # Couplage : le stock de la veille alimente la ligne reportée du jour
+    linked = days[1:]
+    rows = np.concatenate([rows, (carried[None, :] + m_day * linked[:, None]).ravel()])
+    cols = np.concatenate([cols, (n + stock[None, :] + n_day * (linked[:, None] - 1)).ravel()])
+    vals = np.concatenate([vals, -np.ones(linked.size * k)])
+    shape = (m_day * T, n_day * T)
+    if sparse:
+        big_A = CSCMatrix.from_coo(rows, cols, vals, shape)
+    else:
+        big_A = np.zeros(shape)
+        big_A[rows, cols] = vals
+
+    big_b = np.column_stack([forecasts, np.tile(capacity[limited], (T, 1))]).ravel()
+    big_b[carried] += _per_stock(initial_stock, k)
+    big_c = np.tile(np.concatenate([c, -_per_stock(holding_cost, k)]), T)
+    big_senses = np.tile(np.concatenate([senses, np.full(limited.size, "<=")]), T).astype("<U2")
+    big_names = [f"{name}_j{t + 1}" for t in range(T)
+                 for name in names + [f"stock{i + 1}" for i in carried]]
+    return big_c, big_A, big_b, big_senses, big_names
+
+
+def split_plan(solution, n, k, days):
+    # (décisions (jours, n), stocks (jours, k)) à partir d'une solution du modèle sur plusieurs jours
+    per_day = np.asarray(solution, dtype=float).reshape(days, n + k)
+    return per_day[:, :n], per_day[:, n:]
+
+
+def day_objective(c, holding_cost, decisions, stock):
+    # Part d'un jour dans l'objectif de l'horizon : c x moins le coût du stock reporté au lendemain
+    return float(c @ decisions - holding_cost @ stock)
+
+
+def plan_horizon(c, A, b, senses, forecasts, carried=(), initial_stock=0.0, storage_capacity=np.inf,
+                 holding_cost=0.0, names=None, method="tableau", presolve=False, stats=None, integer=()):
+    # Résout tout l'horizon d'un coup (voir src.solver.solve) ; le résultat contient en plus decisions et
+    # stock (une ligne par jour). La présolution fait des capacités de stockage des bornes du simplexe.
+    # integer : variables entières du modèle d'un jour (noms ou indices), entières chaque jour de l'horizon.
+    big_c, big_A, big_b, big_senses, big_names = horizon_model(
+        c, A, b, senses, forecasts, carried, initial_stock, storage_capacity, holding_cost, names,
+        sparse=method == "revised")
+    k = np.asarray(carried, dtype=int).size
+    n_day = len(c) + k
+    days = big_c.size // n_day
+    names = list(names) if names is not None else [f"x{j + 1}" for j in range(len(c))]
+    columns = [names.index(j) if isinstance(j, str) else int(j) for j in integer]
+    integer = [j + t * n_day for t in range(days) for j in columns]
+    result = solve(big_c, big_A, big_b, big_senses, names=big_names, method=method, stats=stats,
+                   presolve=presolve, integer=integer)
+    decisions, stock = split_plan(result["solution"], len(c), k, days) if result["solution"] is not None \
+        else (None, None)
+    result.update(decisions=decisions, stock=stock)
+    return result
+
+
+class RollingHorizon:
+    # Planification glissante sur une fenêtre de `window` jours. forecasts (D, m) : prévisions des seconds
+    # membres jour par jour (la dernière est répétée au-delà) ; les autres paramètres comme horizon_model.
+    # shift_basis=False ré-optimise depuis la base précédente sans la décaler (simplexe dual seul).
+
+    def __init__(self, c, A, b, senses, forecasts, window, carried=(), initial_stock=0.0,
+                 storage_capacity=np.inf, holding_cost=0.0, names=None, stats=None, shift_basis=True):
+        self.c = np.asarray(c, dtype=float)
+        self.names = list(names) if names is not None else [f"x{j + 1}" for j in range(self.c.size)]
+        self.forecasts = np.array(forecasts, dtype=float)
+        if self.forecasts.ndim != 2 or self.forecasts.shape[1] != len(b) or window < 1:
+            raise ValueError(f"Prévisions de forme {self.forecasts.shape}, attendu (jours, {len(b)}) "
+                             f"et une fenêtre d'au moins un jour")
+        self.window = int(window)
+        self.carried = np.asarray(carried, dtype=int).reshape(-1)
+        self.stock = _per_stock(initial_stock, self.carried.size)
+        self.holding_cost = _per_stock(holding_cost, self.carried.size)
+        self.shift_basis = shift_basis
+        self.day = 0
+        # Un dictionnaire par jour arrêté : day, status, objective (voir day_objective), decisions, stock
+        self.committed = []
+        big_c, big_A, big_b, big_senses, _ = horizon_model(
+            self.c, A, b, senses, self._window_forecasts(), self.carried, self.stock, storage_capacity,
+            holding_cost, self.names)
+        self._capacity_rhs = big_b[len(b):big_b.size // self.window]
+        self.solver = WarmStartSolver(big_c, big_A, big_b, big_senses, stats=stats)
+
+    @property
+    def n_day(self):
+        return self.c.size + self.carried.size
+
+    @property
+    def m_day(self):
+        return self.solver.n_constraints // self.window
+
+    def _window_forecasts(self):
+        days = np.minimum(self.day + np.arange(self.window), self.forecasts.shape[0] - 1)
+        return self.forecasts[days]
+
+    def _window_rhs(self):
+        b = np.column_stack([self._window_forecasts(),
+                             np.tile(self._capacity_rhs, (self.window, 1))]).ravel()
+        b[self.carried] += self.stock
+        return b
+
+    def _shifted_basis(self):
+        # Base de la fenêtre précédente décalée d'un jour : chaque ligne reprend la variable de base de la
+        # même ligne du lendemain, le dernier jour garde la sienne ; à défaut, l'écart de la ligne
+        basis = self.solver.basis
+        N, M = self.n_day * self.window, self.solver.n_constraints
+        is_logical = basis >= N
+        day = np.where(is_logical, (basis - N) // self.m_day, basis // self.n_day)
+        shifted = basis - np.where(is_logical, self.m_day, self.n_day)
+        new = np.concatenate([np.where(day[self.m_day:] >= 1, shifted[self.m_day:], -1),
+                              np.where(day[-self.m_day:] == self.window - 1, basis[-self.m_day:], -1)])
+        logical = N + np.arange(M)
+        new[new < 0] = logical[new < 0]
+        seen = set()
+        for r, q in enumerate(new.tolist()):
+            if q in seen:
+                if N + r in seen:
+                    return None
+                new[r] = N + r
+            seen.add(int(new[r]))
+        return new
+
+    def plan(self):
+        # Plan de la fenêtre courante : status, objective, decisions (window, n), stock (window, k),
+        # day (premier jour de la fenêtre) et pivots de la dernière ré-optimisation
+        solution, objective, _ = self.solver.result()
+        plan = {"day": self.day, "status": self.solver.status, "pivots": self.solver.pivots,
+                "objective": None if objective is None else float(objective), "decisions": None, "stock": None}
+        if solution is not None:
+            plan["decisions"], plan["stock"] = split_plan(solution, self.c.size, self.carried.size, self.window)
+        return plan
+
+    def advance(self, forecasts=None):
+        # Arrête les décisions du premier jour, avance la fenêtre d'un jour et ré-optimise à chaud.
+        # forecasts (optionnel, (r, m)) : prévisions mises à jour à partir du nouveau premier jour.
+        # Retourne le plan de la nouvelle fenêtre.
+        plan = self.plan()
+        day = {"day": self.day, "status": plan["status"], "objective": None, "decisions": None,
+               "stock": self.stock.copy()}
+        if plan["decisions"] is not None:
+            day.update(objective=day_objective(self.c, self.holding_cost, plan["decisions"][0], plan["stock"][0]),
+                       decisions=plan["decisions"][0], stock=plan["stock"][0])
+            self.stock = plan["stock"][0].copy()
+        self.committed.append(day)
+        self.day += 1
+        if forecasts is not None:
+            forecasts = np.atleast_2d(np.asarray(forecasts, dtype=float))
+            last = self.day + forecasts.shape[0]
+            if last > self.forecasts.shape[0]:
+                padding = np.tile(self.forecasts[-1], (last - self.forecasts.shape[0], 1))
+                self.forecasts = np.vstack([self.forecasts, padding])
+            self.forecasts[self.day:last] = forecasts
+        b = self._window_rhs()
+        basis = self._shifted_basis() if self.shift_basis and self.solver.status == OPTIMAL else None
+        self.solver.set_rhs(b, basis)
+        return self.plan()
+
+    def run(self, days):
+        # Avance de `days` jours ; retourne les jours arrêtés pendant ce parcours
+        start = len(self.committed)
+        for _ in range(days):
+            self.advance()
+        return self.committed[start:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Planification sur plusieurs jours avec stock reporté")
+    parser.add_argument("--model", help="Modèle d'un jour (.lp, .mps ou texte) ; par défaut les données de "
+                                        "Marrakech")
+    parser.add_argument("--forecasts", help="Prévisions (.csv ou .parquet) : une ligne par jour, colonnes "
+                                            "b1..bm comme pour le balayage de scénarios")
+    parser.add_argument("--days", type=int, default=7, help="Nombre de jours planifiés")
+    parser.add_argument("--window", type=int, help="Fenêtre glissante (jours) ; sans elle, tout l'horizon "
+                                                   "est résolu d'un coup")
+    parser.add_argument("--carry", type=int, nargs="+", metavar="LIGNE",
+                        help="Contraintes reportées d'un jour à l'autre (numérotées à partir de 1) ; par "
+                             "défaut la production de déchets du modèle de Marrakech")
+    parser.add_argument("--initial-stock", type=float, default=0.0, help="Stock au début du premier jour")
+    parser.add_argument("--storage-capacity", type=float, default=np.inf, help="Capacité de stockage")
+    parser.add_argument("--holding-cost", type=float, default=0.0, help="Coût d'une unité stockée un jour")
+    parser.add_argument("--output", help="Fichier CSV du plan (un jour par ligne)")
+    args = parser.parse_args(argv)
+
+    model = default_model() if args.model is None else load_model(args.model, sparse=False)
+    c, A, b, senses, names = model[:5]
+    integer = list(model[5]) if len(model) > 5 else []
+    if integer and args.window is not None:
+        parser.error(f"Variables entières ({', '.join(integer)}) : la planification glissante ne traite que "
+                     f"des modèles continus, résoudre l'horizon d'un coup (sans --window)")
+    model = model[:5]
+    forecasts = np.tile(b, (args.days, 1))
+    if args.forecasts is not None:
+        frames = [scenario_arrays(frame, model)[2] for frame in load_scenarios(args.forecasts)]
+        forecasts = np.vstack(frames)[:args.days]
+    carried = [PRODUCTION_ROW] if args.carry is None else [row - 1 for row in args.carry]
+    options = dict(carried=carried, initial_stock=args.initial_stock, storage_capacity=args.storage_capacity,
+                   holding_cost=args.holding_cost, names=names)
+
+    if args.window is None:
+        result = plan_horizon(c, A, b, senses, forecasts, integer=integer, **options)
+        if result["solution"] is None:
+            print(f"Échec : {result['status']}")
+            return 1
+        holding_cost = _per_stock(args.holding_cost, len(carried))
+        days = [{"day": t, "status": result["status"], "objective": day_objective(c, holding_cost, decisions, stock),
+                 "decisions": decisions, "stock": stock}
+                for t, (decisions, stock) in enumerate(zip(result["decisions"], result["stock"]))]
+    else:
+        planner = RollingHorizon(c, A, b, senses, forecasts, args.window, **options)
+        days = planner.run(forecasts.shape[0])
+
+    header = ["jour", "statut", "objectif"] + list(names) + [f"stock{i + 1}" for i in carried]
+    lines = []
+    for day in days:
+        values = [np.nan] * len(names) if day["decisions"] is None else list(day["decisions"])
+        lines.append([day["day"] + 1, day["status"], day["objective"]] + values + list(day["stock"]))
+    if args.output is not None:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(lines)
+    else:
+        print("\t".join(header))
+        for line in lines:
+            print("\t".join(f"{value:.6g}" if isinstance(value, float) else str(value) for value in line))
+    failed = sum(day["status"] not in (OPTIMAL, FEASIBLE) for day in days)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
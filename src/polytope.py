@@ -0,0 +1,92 @@
+from itertools import combinations
+
+import numpy as np
+
+# Géométrie du domaine réalisable en 3 variables, sans dépendance autre que NumPy :
+# énumération vectorisée des sommets (intersection de trois plans, un seul np.linalg.solve empilé),
+# puis enveloppe convexe facette par facette : chaque demi-espace actif porte un polygone dont les
+# sommets sont triés angulairement autour de leur barycentre.
+
+REL_TOL = 1e-7
+
+
+def halfspaces(A, b, senses=None):
+    # Demi-espaces G x <= h normalisés (lignes de norme 1), avec x >= 0, et l'indice de la ligne d'origine
+    # (-1 pour la non-négativité) ; une égalité donne deux demi-espaces opposés
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    m, n = A.shape
+    senses = np.array(["<="] * m if senses is None else senses, dtype="<U2")
+    upper = senses != ">="
+    lower = senses != "<="
+    G = np.vstack([A[upper], -A[lower], -np.eye(n)])
+    h = np.concatenate([b[upper], -b[lower], np.zeros(n)])
+    origin = np.concatenate([np.flatnonzero(upper), np.flatnonzero(lower), np.full(n, -1)])
+    norms = np.linalg.norm(G, axis=1)
+    keep = norms > 0
+    return G[keep] / norms[keep, None], h[keep] / norms[keep], origin[keep]
+
+
+def enumerate_vertices(G, h):
+    # Tous les points où trois plans se coupent et qui satisfont tous les demi-espaces
+    n = G.shape[1]
+    triples = np.array(list(combinations(range(G.shape[0]), n)), dtype=np.intp).reshape(-1, n)
+    if triples.size == 0:
+        return np.empty((0, n))
+    M = G[triples]
+    regular = np.abs(np.linalg.det(M)) > 1e-12
+    M, rhs = M[regular], h[triples[regular]]
+    if M.shape[0] == 0:
+        return np.empty((0, n))
+    points = np.linalg.solve(M, rhs[..., None])[..., 0]
+    scale = max(1.0, np.abs(h).max(initial=0.0))
+    feasible = np.all(points @ G.T <= h + REL_TOL * scale, axis=1)
+    points = points[feasible]
+    if points.shape[0] == 0:
+        return points
+    # Sommets dégénérés (plus de trois plans actifs) : une seule occurrence
+    keys = np.round(points / (REL_TOL * scale * 10)).astype(np.int64)
+    _, first = np.unique(keys, axis=0, return_index=True)
+    return points[np.sort(first)]
+
+
+def hull_faces(vertices, G, h, origin):
+    # Polygones (sommets ordonnés) du bord, chacun associé à la ligne de contrainte qui le porte
+    faces, owners = [], []
+    if vertices.shape[0] < 4:
+        return faces, owners
+    scale = max(1.0, np.abs(vertices).max())
+    tight = np.abs(vertices @ G.T - h) <= REL_TOL * scale * 10
+    seen = set()
+    for k in range(G.shape[0]):
+        on_face = np.flatnonzero(tight[:, k])
+        key = tuple(on_face)
+        if on_face.size < 3 or key in seen:
+            continue
+        seen.add(key)
+        points = vertices[on_face]
+        center = points.mean(axis=0)
+        u = points[0] - center
+        u /= np.linalg.norm(u)
+        w = np.cross(G[k], u)
+        offsets = points - center
+        order = np.argsort(np.arctan2(offsets @ w, offsets @ u))
+        faces.append(points[order])
+        owners.append(int(origin[k]))
+    return faces, owners
+
+
+def feasible_polytope(A, b, senses=None, margin=100.0):
+    # Sommets et facettes du domaine {A x (sens) b, x >= 0}. Un domaine non borné est coupé par une
+    # boîte dépassant de `margin` les sommets trouvés (ou `margin` si aucun) ; ses faces ont l'indice -2.
+    G, h, origin = halfspaces(A, b, senses)
+    n = G.shape[1]
+    vertices = enumerate_vertices(G, h)
+    extent = vertices.max(axis=0) if vertices.shape[0] else np.zeros(n)
+    box = extent + margin
+    G_box = np.vstack([G, np.eye(n)])
+    h_box = np.concatenate([h, box])
+    origin_box = np.concatenate([origin, np.full(n, -2)])
+    vertices = enumerate_vertices(G_box, h_box)
+    faces, owners = hull_faces(vertices, G_box, h_box, origin_box)
+    return vertices, faces, owners
@@ -0,0 +1,328 @@
+import numpy as np
+
+from src.simplex_solver import INFEASIBLE
+from src.sparse import CSCMatrix
+
+# Présolution : réduit le modèle (max c^T x sous A x (<=, >=, =) b, x >= 0) avant la boucle de pivots.
+# - lignes vides : supprimées (ou infaisabilité détectée) ;
+# - lignes à une seule variable : deviennent des bornes ; seule la borne supérieure la plus serrée est
+#   rendue au solveur, comme borne native (bounds=True, pour solve_tableau) ou sous la forme d'une ligne
+#   x_j <= u ; une borne inférieure l > 0 est absorbée par le changement de variable x_j = l + x'_j ;
+# - variables fixées (l = u) et colonnes vides : retirées, leur apport passe dans b et dans l'objectif ;
+# - lignes redondantes d'après l'activité min/max permise par les bornes : supprimées ;
+# - lignes parallèles (doublons, lignes dominées) : seules les plus serrées sont gardées ;
+# - mise à l'échelle géométrique des lignes et colonnes (puissances de 2, sans erreur d'arrondi) ;
+# - lignes à second membre négatif multipliées par -1 (sens inversé).
+# Les lignes du modèle réduit sont donc des lignes d'origine (ou des bornes tirées d'une ligne
+# d'origine) : Postsolve ramène solution, prix duaux, base et libellés des tableaux au modèle d'origine.
+
+PRESOLVE_TOL = 1e-9
+MAX_PASSES = 20
+SCALING_PASSES = 4
+_FLIP = {"<=": ">=", ">=": "<=", "=": "="}
+
+
+class Postsolve:
+    # Correspondance entre le modèle réduit et le modèle d'origine (n variables, m lignes)
+
+    def __init__(self, n, m):
+        self.n, self.m = n, m
+        self.status = None  # INFEASIBLE si la présolution prouve l'infaisabilité
+        self.cols = np.arange(n)  # variable d'origine de chaque variable du modèle réduit
+        self.rows = np.arange(m)  # ligne d'origine de chaque ligne du modèle réduit
+        self.row_factor = np.ones(m)  # coefficient de la ligne d'origine d'une borne (1 sinon)
+        self.values = np.zeros(n)  # valeur des variables retirées, borne inférieure (décalage) des autres
+        self.offset = 0.0  # constante ajoutée à l'objectif
+        self.lower_row = np.full(n, -1)  # ligne d'origine de la borne inférieure, -1 si 0 par défaut
+        self.upper_row = np.full(n, -1)
+        self.lower_coeff = np.ones(n)
+        self.upper_coeff = np.ones(n)
+        self.row_scale = np.ones(m)
+        self.col_scale = np.ones(n)
+        self.removed_rows = 0
+        self.removal_order = []  # variables retirées, dans l'ordre de la présolution
+        self.upper = None  # bornes supérieures du modèle réduit si elles ne sont pas des lignes (bounds=True)
+
+    def solution(self, reduced):
+        x = self.values.copy()
+        x[self.cols] += self.col_scale * np.asarray(reduced, dtype=float)
+        return x
+
+    def objective(self, reduced):
+        return float(reduced) + self.offset
+
+    def duals(self, reduced, c, A):
+        # Prix duaux du modèle d'origine à partir de ceux du modèle réduit : une ligne supprimée vaut 0,
+        # sauf la ligne-borne active d'une variable retirée ou décalée, qui reçoit son coût réduit.
+        # Les variables retirées sont traitées à rebours : la ligne-borne d'une variable retirée plus tard
+        # peut contenir une variable retirée plus tôt.
+        c = np.asarray(c, dtype=float)
+        A = CSCMatrix.from_any(A, self.n)
+        y = np.zeros(self.m)
+        y[self.rows] = self.row_scale * np.asarray(reduced, dtype=float) / self.row_factor
+        kept = np.zeros(self.n, dtype=bool)
+        kept[self.cols] = True
+        tol = PRESOLVE_TOL * max(1.0, np.abs(c).max(initial=0.0))
+        for j in self.cols.tolist() + self.removal_order[::-1]:
+            lower, upper = self.lower_row[j], self.upper_row[j]
+            if lower < 0 and upper < 0:
+                continue
+            rows, values = A.column(j)
+            d = c[j] - values @ y[rows]
+            if lower >= 0 and lower == upper:
+                y[lower] = d / self.lower_coeff[j]
+            elif upper >= 0 and d > tol and (not kept[j] or self.upper is not None):
+                y[upper] = d / self.upper_coeff[j]
+            elif lower >= 0 and d < -tol:
+                y[lower] = d / self.lower_coeff[j]
+        return y
+
+    def basis(self, reduced, solution, duals):
+        # Base optimale du modèle d'origine (indices comme solve_tableau : j < n variable, n + i écart de
+        # la ligne i) : base réduite, plus une colonne par ligne supprimée ; une variable retirée ou décalée
+        # non nulle, ou hors base à sa borne supérieure native, prend la place de l'écart de sa ligne-borne
+        # active
+        n_reduced = self.cols.size
+        basis = [int(self.cols[q]) if q < n_reduced else self.n + int(self.rows[q - n_reduced]) for q in reduced]
+        slack = np.ones(self.m, dtype=bool)
+        slack[self.rows] = False
+        kept = np.zeros(self.n, dtype=bool)
+        kept[self.cols] = True
+        in_basis = set(basis)
+        tol = PRESOLVE_TOL * max(1.0, np.abs(solution).max(initial=0.0))
+        at_upper = np.zeros(self.n, dtype=bool)
+        if self.upper is not None:
+            limit = self.values[self.cols] + self.col_scale * self.upper
+            at_upper[self.cols] = np.isfinite(limit) & (solution[self.cols] >= limit - tol)
+        for j in range(self.n):
+            lower, upper = int(self.lower_row[j]), int(self.upper_row[j])
+            if kept[j]:
+                taken = upper if at_upper[j] and upper >= 0 else lower
+                if taken >= 0 and j not in in_basis:
+                    basis.append(j)
+                    slack[taken] = False
+                continue
+            active = [i for i in (lower, upper) if i >= 0 and duals[i] != 0]
+            if solution[j] > tol or active:
+                basis.append(j)
+                taken = active[0] if active else (lower if lower >= 0 else upper)
+                slack[taken] = False
+        basis.extend(self.n + np.flatnonzero(slack))
+        return np.array(basis, dtype=int)
+
+    def labels(self, names):
+        # Colonnes des tableaux du modèle réduit : F, variables gardées, écarts (numérotés comme les
+        # lignes d'origine), b
+        return (["F"] + [names[j] for j in self.cols] + [f"s{i + 1}" for i in self.rows] + ["b"])
+
+    def summary(self):
+        if self.status is not None:
+            return f"Présolution : {self.status}"
+        return f"Présolution : {self.m} -> {self.rows.size} lignes, {self.n} -> {self.cols.size} variables"
+
+
+def _midpoint(low, high):
+    # Milieu de [low, high] (en log2), 0 pour une ligne ou colonne sans coefficient
+    middle = np.zeros(low.size)
+    present = np.isfinite(low)
+    middle[present] = (low[present] + high[present]) / 2
+    return middle
+
+
+def _geometric_scaling(r, j, v, m, n):
+    # Facteurs (puissances de 2) ramenant les coefficients de chaque ligne et colonne autour de 1
+    row_scale, col_scale = np.ones(m), np.ones(n)
+    magnitude = np.log2(np.abs(v))
+    for _ in range(SCALING_PASSES):
+        scaled = magnitude + np.log2(row_scale)[r] + np.log2(col_scale)[j]
+        low = np.full(m, np.inf)
+        high = np.full(m, -np.inf)
+        np.minimum.at(low, r, scaled)
+        np.maximum.at(high, r, scaled)
+        row_scale *= np.exp2(-np.round(_midpoint(low, high)))
+        scaled = magnitude + np.log2(row_scale)[r] + np.log2(col_scale)[j]
+        low = np.full(n, np.inf)
+        high = np.full(n, -np.inf)
+        np.minimum.at(low, j, scaled)
+        np.maximum.at(high, j, scaled)
+        col_scale *= np.exp2(-np.round(_midpoint(low, high)))
+    return row_scale, col_scale
+
+
+def _parallel_rows(r, j, v, rhs, senses, tol):
+    # Lignes à supprimer parmi les lignes parallèles (mêmes coefficients à un facteur près) : on garde la
+    # borne supérieure et la borne inférieure les plus serrées de chaque groupe. Retourne (lignes, faisable).
+    order = np.lexsort((j, r))
+    r, j, v = r[order], j[order], v[order]
+    starts = np.flatnonzero(np.r_[True, r[1:] != r[:-1]]) if r.size else np.zeros(0, dtype=int)
+    ends = np.r_[starts[1:], r.size].astype(int)
+    groups = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if end - start < 2:
+            continue
+        factor = v[start]
+        key = (j[start:end].tobytes(), np.round(v[start:end] / factor, 12).tobytes())
+        groups.setdefault(key, []).append((int(r[start]), factor))
+    dropped = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        upper, lower = None, None
+        for i, factor in members:
+            limit = rhs[i] / factor
+            sense = senses[i] if factor > 0 else _FLIP[senses[i]]
+            equality = sense == "="
+            if sense != ">=" and (upper is None or (limit, not equality) < upper[:2]):
+                upper = (limit, not equality, i)
+            if sense != "<=" and (lower is None or (limit, equality) > lower[:2]):
+                lower = (limit, equality, i)
+        if upper is not None and lower is not None and lower[0] > upper[0] + tol * max(1.0, abs(upper[0])):
+            return [], False
+        keep = {bound[2] for bound in (upper, lower) if bound is not None}
+        dropped.extend(i for i, _ in members if i not in keep)
+    return dropped, True
+
+
+def presolve(c, A, b, senses=None, scale=True, bounds=False):
+    # Retourne (c, A, b, senses) réduits et le Postsolve correspondant. A réduite est dense si A l'est,
+    # CSCMatrix sinon. Si postsolve.status vaut INFEASIBLE, le modèle réduit n'est pas à résoudre.
+    # bounds=True : les bornes supérieures restent dans postsolve.upper (à passer à solve_tableau) au lieu
+    # de devenir des lignes.
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n, m = c.size, b.size
+    sparse = isinstance(A, CSCMatrix) or hasattr(A, "tocsc")
+    matrix = CSCMatrix.from_any(A if sparse else np.asarray(A, dtype=float).reshape(m, n), n)
+    nonzero = matrix.data != 0
+    r, j, v = matrix.indices[nonzero], matrix._col_of_nz[nonzero], matrix.data[nonzero]
+    senses = np.array(["<="] * m if senses is None else senses, dtype="<U2")
+    post = Postsolve(n, m)
+    lower, upper = np.zeros(n), np.full(n, np.inf)
+    row_alive, col_alive = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+    rhs = b.copy()
+
+    def infeasible():
+        post.status = INFEASIBLE
+        return (c, A, b, senses), post
+
+    for _ in range(MAX_PASSES):
+        changed = False
+        alive = row_alive[r] & col_alive[j]
+        count = np.bincount(r[alive], minlength=m)
+        slack_tol = PRESOLVE_TOL * np.maximum(1.0, np.abs(rhs))
+
+        empty = row_alive & (count == 0)
+        if np.any(empty & (((senses == "<=") & (rhs < -slack_tol)) | ((senses == ">=") & (rhs > slack_tol))
+                           | ((senses == "=") & (np.abs(rhs) > slack_tol)))):
+            return infeasible()
+        changed |= bool(np.any(empty))
+        row_alive &= ~empty
+
+        # Lignes à une variable -> bornes (la plus serrée l'emporte, avec sa ligne d'origine)
+        single = row_alive & (count == 1)
+        for e in np.flatnonzero(alive & single[r]).tolist():
+            i, col, a = int(r[e]), int(j[e]), float(v[e])
+            limit = rhs[i] / a
+            sense = senses[i] if a > 0 else _FLIP[senses[i]]
+            if sense != ">=" and limit < upper[col]:
+                upper[col], post.upper_row[col], post.upper_coeff[col] = limit, i, a
+            if sense != "<=" and limit > lower[col]:
+                lower[col], post.lower_row[col], post.lower_coeff[col] = limit, i, a
+            row_alive[i] = False
+            changed = True
+        if np.any(col_alive & (lower > upper + PRESOLVE_TOL * np.maximum(1.0, np.abs(upper)))):
+            return infeasible()
+
+        # Variables fixées et colonnes vides (une colonne vide non bornée à coût positif reste au solveur)
+        alive = row_alive[r] & col_alive[j]
+        col_count = np.bincount(j[alive], minlength=n)
+        fixed = col_alive & (upper - lower <= PRESOLVE_TOL * np.maximum(1.0, np.abs(lower)))
+        idle = col_alive & ~fixed & (col_count == 0) & ~((c > 0) & np.isinf(upper))
+        removed = fixed | idle
+        if np.any(removed):
+            post.values[removed] = np.where(idle & (c > 0), upper, lower)[removed]
+            moved = alive & removed[j]
+            rhs -= np.bincount(r[moved], weights=v[moved] * post.values[j[moved]], minlength=m)
+            post.offset += float(c[removed] @ post.values[removed])
+            col_alive &= ~removed
+            post.removal_order.extend(np.flatnonzero(removed).tolist())
+            changed = True
+
+        # Lignes redondantes ou infaisables d'après l'activité min/max permise par les bornes
+        alive = row_alive[r] & col_alive[j]
+        low = np.where(v > 0, v * lower[j], v * upper[j])
+        high = np.where(v > 0, v * upper[j], v * lower[j])
+        low_activity = np.bincount(r[alive], weights=low[alive], minlength=m)
+        high_activity = np.bincount(r[alive], weights=high[alive], minlength=m)
+        slack_tol = PRESOLVE_TOL * np.maximum(1.0, np.abs(rhs))
+        if np.any(row_alive & (((senses != ">=") & (low_activity > rhs + slack_tol))
+                               | ((senses != "<=") & (high_activity < rhs - slack_tol)))):
+            return infeasible()
+        redundant = row_alive & (((senses == "<=") & (high_activity <= rhs + slack_tol))
+                                 | ((senses == ">=") & (low_activity >= rhs - slack_tol)))
+        changed |= bool(np.any(redundant))
+        row_alive &= ~redundant
+
+        alive = row_alive[r] & col_alive[j]
+        dropped, feasible = _parallel_rows(r[alive], j[alive], v[alive], rhs, senses, PRESOLVE_TOL)
+        if not feasible:
+            return infeasible()
+        if dropped:
+            row_alive[dropped] = False
+            changed = True
+        if not changed:
+            break
+
+    # Changement de variable x_j = l_j + x'_j pour les bornes inférieures des variables gardées
+    cols = np.flatnonzero(col_alive)
+    rows = np.flatnonzero(row_alive)
+    shifted = col_alive & (lower > 0)
+    post.values[shifted] = lower[shifted]
+    alive = row_alive[r] & col_alive[j]
+    moved = alive & shifted[j]
+    rhs -= np.bincount(r[moved], weights=v[moved] * lower[j[moved]], minlength=m)
+    post.offset += float(c[shifted] @ lower[shifted])
+
+    # Modèle réduit : lignes gardées puis, sans bornes natives, une ligne x'_j <= u_j - l_j par borne
+    # supérieure finie
+    column_of = np.full(n, -1)
+    column_of[cols] = np.arange(cols.size)
+    row_of = np.full(m, -1)
+    row_of[rows] = np.arange(rows.size)
+    bounded = cols[np.isfinite(upper[cols])] if not bounds else np.zeros(0, dtype=int)
+    red_r = np.concatenate([row_of[r[alive]], rows.size + np.arange(bounded.size)])
+    red_j = np.concatenate([column_of[j[alive]], column_of[bounded]])
+    red_v = np.concatenate([v[alive], np.ones(bounded.size)])
+    red_b = np.concatenate([rhs[rows], upper[bounded] - lower[bounded]])
+    red_senses = np.concatenate([senses[rows], np.full(bounded.size, "<=")]).astype("<U2")
+    red_c = c[cols]
+    post.cols = cols
+    post.rows = np.concatenate([rows, post.upper_row[bounded]]).astype(int)
+    post.row_factor = np.concatenate([np.ones(rows.size), post.upper_coeff[bounded]])
+    post.removed_rows = m - rows.size
+    shape = (red_b.size, cols.size)
+
+    post.row_scale, post.col_scale = np.ones(shape[0]), np.ones(shape[1])
+    if scale and red_v.size:
+        post.row_scale, post.col_scale = _geometric_scaling(red_r, red_j, red_v, *shape)
+        red_v = red_v * post.row_scale[red_r] * post.col_scale[red_j]
+        red_b = red_b * post.row_scale
+        red_c = red_c * post.col_scale
+    if bounds:
+        post.upper = (upper[cols] - lower[cols]) / post.col_scale
+    # Seconds membres positifs : une ligne rendue négative (par le décalage des bornes inférieures) est
+    # multipliée par -1 et change de sens ; le signe est porté par row_scale pour les prix duaux
+    flip = red_b < 0
+    if np.any(flip):
+        sign = np.where(flip, -1.0, 1.0)
+        post.row_scale = post.row_scale * sign
+        red_v = red_v * sign[red_r]
+        red_b = red_b * sign
+        red_senses = np.where(flip, np.vectorize(_FLIP.get, otypes=["<U2"])(red_senses), red_senses)
+
+    if sparse:
+        reduced_A = CSCMatrix.from_coo(red_r, red_j, red_v, shape)
+    else:
+        reduced_A = np.zeros(shape)
+        reduced_A[red_r, red_j] = red_v
+    return (red_c, reduced_A, red_b, red_senses), post
@@ -0,0 +1,187 @@
+import numpy as np
+
+from src.instrumentation import clock
+from src.simplex_solver import MAX_ITER_REACHED, UNBOUNDED
+from src.sparse import CSCMatrix
+
+TOL = 1e-9
+REFACTOR_FREQUENCY = 64  # Nombre de mises à jour produit-forme avant réinversion de la base
+
+
+class BasisFactor:
+    # Inverse de la base sous forme produit (PFI) : B^-1 = E_k ... E_1.
+    # Chaque matrice êta est stockée de façon creuse (ligne pivot, pivot, indices, valeurs).
+
+    def __init__(self, m):
+        self.m = m
+        self.etas = []
+        self.nbytes = 0  # taille du fichier êta
+
+    def add_eta(self, r, alpha):
+        pivot = alpha[r]
+        idx = np.flatnonzero(np.abs(alpha) > TOL)
+        idx = idx[idx != r]
+        self.etas.append((r, pivot, idx, alpha[idx].copy()))
+        self.nbytes += 2 * idx.nbytes
+
+    def ftran(self, x):
+        # Résout B w = x
+        w = np.array(x, dtype=float)
+        for r, pivot, idx, vals in self.etas:
+            t = w[r] / pivot
+            if t != 0.0:
+                w[idx] -= vals * t
+            w[r] = t
+        return w
+
+    def btran(self, y):
+        # Résout w^T B = y^T
+        w = np.array(y, dtype=float)
+        for r, pivot, idx, vals in reversed(self.etas):
+            w[r] = (w[r] - w[idx] @ vals) / pivot
+        return w
+
+
+def _structural_column(A, j, m):
+    col = np.zeros(m)
+    idx, vals = A.column(j)
+    col[idx] = vals
+    return col
+
+
+def _column(A, j, n, m):
+    # Colonne j de [A | I] : variables structurelles puis variables d'écart
+    if j < n:
+        return _structural_column(A, j, m)
+    col = np.zeros(m)
+    col[j - n] = 1.0
+    return col
+
+
+def _reinvert(A, basis, n, m):
+    # Réinversion produit-forme : les colonnes d'écart gardent leur ligne,
+    # les colonnes structurelles (les plus creuses d'abord) pivotent sur les lignes libres.
+    factor = BasisFactor(m)
+    structural = [j for j in basis if j < n]
+    free_rows = np.ones(m, dtype=bool)
+    free_rows[[j - n for j in basis if j >= n]] = False
+    new_basis = np.arange(n, n + m)
+    structural.sort(key=lambda j: A.indptr[j + 1] - A.indptr[j])
+    for j in structural:
+        alpha = factor.ftran(_structural_column(A, j, m))
+        candidates = np.where(free_rows, np.abs(alpha), -1.0)
+        r = int(np.argmax(candidates))
+        if candidates[r] <= TOL:
+            raise np.linalg.LinAlgError("Base singulière lors de la réinversion")
+        factor.add_eta(r, alpha)
+        free_rows[r] = False
+        new_basis[r] = j
+    return factor, new_basis
+
+
+def _dense_tableau(A, factor, basis, cost, x_B, n, m):
+    # Reconstruit le tableau dense (même disposition que simplex_manual) pour l'historique
+    B_inv = np.column_stack([factor.ftran(np.eye(m)[:, i]) for i in range(m)]) if m else np.zeros((0, 0))
+    body = np.hstack([B_inv @ A.toarray(), B_inv])
+    y = factor.btran(cost[basis])
+    tableau = np.zeros((m + 1, n + m + 2))
+    tableau[0, 0] = 1
+    tableau[0, 1:n + 1] = cost[:n] - A.rmatvec(y)
+    tableau[0, n + 1:n + m + 1] = -y
+    tableau[0, -1] = -cost[basis] @ x_B
+    tableau[1:, 1:-1] = body
+    tableau[1:, -1] = x_B
+    return tableau
+
+
+def simplex_revised(c, A, b, record_history=False, max_iter=None, refactor_frequency=REFACTOR_FREQUENCY,
+                    stats=None):
+    # Simplexe révisé : maximise c^T x sous A x <= b, x >= 0 (b >= 0, base d'écart initiale).
+    # A peut être une liste, un ndarray dense, une CSCMatrix ou une matrice scipy.sparse.
+    # Même contrat de retour que simplex_manual : (solution, z, historique).
+    # stats (SolveStats, optionnel) est rempli pendant la résolution ; la mémoire suivie est celle
+    # du fichier êta et de l'historique.
+    if stats is None or stats.running:
+        return _simplex_revised(c, A, b, record_history, max_iter, refactor_frequency, stats)
+    stats.begin()
+    try:
+        return _simplex_revised(c, A, b, record_history, max_iter, refactor_frequency, stats)
+    finally:
+        stats.end()
+
+
+def _simplex_revised(c, A, b, record_history, max_iter, refactor_frequency, stats):
+    b = np.asarray(b, dtype=float)
+    m = b.size
+    n = len(c)
+    A = CSCMatrix.from_any(A, n_cols=n)
+    if A.shape != (m, n):
+        raise ValueError(f"Dimensions incohérentes : A est {A.shape}, attendu {(m, n)}")
+    if np.any(b < 0):
+        raise ValueError("Le simplexe révisé suppose b >= 0 (base d'écart initiale)")
+
+    cost = np.concatenate([-np.asarray(c, dtype=float), np.zeros(m)])  # minimisation de -c^T x
+    basis = np.arange(n, n + m)
+    factor = BasisFactor(m)
+    x_B = b.copy()
+    history = []
+    history_bytes = 0
+    n_base_etas = 0
+    if max_iter is None:
+        max_iter = 50 * (n + m) + 100
+    if stats is not None:
+        stats.enter_phase("révisé")
+
+    for _ in range(max_iter):
+        if record_history:
+            history.append(_dense_tableau(A, factor, basis, cost, x_B, n, m))
+            history_bytes += history[-1].nbytes
+        if stats is not None:
+            stats.track_memory(factor.nbytes + history_bytes)
+            started = clock()
+
+        # Pricing vectorisé (règle de Dantzig)
+        y = factor.btran(cost[basis])
+        d = np.concatenate([cost[:n] - A.rmatvec(y), -y])
+        d[basis] = 0.0
+        q = int(np.argmin(d))
+        if stats is not None:
+            priced = clock()
+            stats.pricing_time += priced - started
+        if d[q] >= -TOL:
+            break
+
+        alpha = factor.ftran(_column(A, q, n, m))
+        eligible = alpha > TOL
+        if not np.any(eligible):
+            return None, None, UNBOUNDED
+        ratios = np.full(m, np.inf)
+        ratios[eligible] = x_B[eligible] / alpha[eligible]
+        r = int(np.argmin(ratios))
+        theta = ratios[r]
+        if stats is not None:
+            tested = clock()
+            stats.ratio_time += tested - priced
+            leaving = basis[r]
+
+        x_B -= theta * alpha
+        x_B[r] = theta
+        factor.add_eta(r, alpha)
+        basis[r] = q
+
+        if len(factor.etas) - n_base_etas >= refactor_frequency:
+            factor, basis = _reinvert(A, basis, n, m)
+            n_base_etas = len(factor.etas)
+            x_B = factor.ftran(b)
+        if stats is not None:
+            # Mise à jour de x_B et du fichier êta (réinversion comprise)
+            stats.elimination_time += clock() - tested
+            stats.record_pivot(basis, q, leaving, theta)
+    else:
+        return None, None, MAX_ITER_REACHED
+
+    solution = np.zeros(n + m)
+    solution[basis] = x_B
+    solution = solution[:n]
+    z = float(np.asarray(c, dtype=float) @ solution)
+    return solution, z, history
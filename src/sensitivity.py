@@ -0,0 +1,152 @@
+import numpy as np
+
+from src.simplex_solver import OPTIMAL, TOL, solve_tableau
+
+# Analyse de sensibilité lue dans la base optimale (max c^T x sous A x (<=, >=, =) b, x >= 0).
+# Colonnes du modèle standard : n variables puis une colonne logique sign_i * e_i par ligne
+# (+1 pour "<=" et "=", -1 pour ">="), comme dans WarmStartSolver.
+
+
+def _standard_form(c, A, b, senses):
+    c = np.asarray(c, dtype=float)
+    b = np.asarray(b, dtype=float)
+    A = np.asarray(A.toarray() if hasattr(A, "toarray") else A, dtype=float).reshape(b.size, c.size)
+    senses = np.array(["<="] * b.size if senses is None else senses, dtype="<U2")
+    M = np.hstack([A, np.diag(np.where(senses == ">=", -1.0, 1.0))])
+    costs = np.concatenate([c, np.zeros(b.size)])
+    fixed = np.concatenate([np.zeros(c.size, dtype=bool), senses == "="])
+    return c, A, b, senses, M, costs, fixed
+
+
+def _optimal_basis(c, A, b, senses):
+    status, _, _, _, basis = solve_tableau(c, A, b, senses)
+    if status != OPTIMAL:
+        raise ValueError(f"Analyse de sensibilité impossible : {status}")
+    return basis
+
+
+def _ratio_range(values, directions):
+    # Plus grand intervalle [lo, hi] de t tel que values + t * directions >= 0
+    lo, hi = -np.inf, np.inf
+    positive, negative = directions > TOL, directions < -TOL
+    if np.any(positive):
+        lo = np.max(-values[positive] / directions[positive])
+    if np.any(negative):
+        hi = np.min(-values[negative] / directions[negative])
+    return lo, hi
+
+
+def sensitivity_analysis(c, A, b, senses=None, basis=None):
+    # Retourne un dictionnaire :
+    #   shadow_prices   (m,)  variation de z par unité de b_i
+    #   rhs_ranges      (m, 2) plage de b_i sur laquelle la base reste optimale
+    #   reduced_costs   (n,)  hausse de c_j nécessaire pour qu'une variable hors base entre
+    #   objective_ranges (n, 2) plage de c_j sur laquelle la solution reste optimale
+    #   solution, objective, basis
+    c, A, b, senses, M, costs, fixed = _standard_form(c, A, b, senses)
+    n, m = c.size, b.size
+    basis = _optimal_basis(c, A, b, senses) if basis is None else np.asarray(basis)
+
+    B = M[:, basis]
+    B_inv = np.linalg.inv(B)
+    x_B = B_inv @ b
+    y = costs[basis] @ B_inv
+    T = B_inv @ M
+    d = costs[basis] @ T - costs
+    d[basis] = 0.0
+
+    rhs_ranges = np.empty((m, 2))
+    for i in range(m):
+        lo, hi = _ratio_range(x_B, B_inv[:, i])
+        rhs_ranges[i] = b[i] + lo, b[i] + hi
+
+    nonbasic = np.ones(n + m, dtype=bool)
+    nonbasic[basis] = False
+    nonbasic &= ~fixed
+    row_of = {j: r for r, j in enumerate(basis)}
+    objective_ranges = np.empty((n, 2))
+    for j in range(n):
+        if j in row_of:
+            lo, hi = _ratio_range(d[nonbasic], T[row_of[j], nonbasic])
+            objective_ranges[j] = c[j] + lo, c[j] + hi
+        else:
+            objective_ranges[j] = -np.inf, c[j] + d[j]
+
+    solution = np.zeros(n + m)
+    solution[basis] = x_B
+    return {
+        "shadow_prices": y,
+        "rhs_ranges": rhs_ranges,
+        "reduced_costs": d[:n],
+        "objective_ranges": objective_ranges,
+        "solution": solution[:n],
+        "objective": float(c @ solution[:n]),
+        "basis": basis,
+    }
+
+
+def dual_values(c, A, b, senses, basis):
+    # Prix duaux y = c_B B^-1 d'une base, sans le reste de l'analyse
+    c, A, b, senses, M, costs, _ = _standard_form(c, A, b, senses)
+    basis = np.asarray(basis)
+    return np.linalg.solve(M[:, basis].T, costs[basis])
+
+
+def parametric_rhs(c, A, b, row, target, senses=None, basis=None, max_segments=1000):
+    # Fait varier b[row] de sa valeur actuelle jusqu'à target en une seule passe : entre deux points
+    # de rupture la base est fixe et z est affine ; à chaque rupture, un pivot dual change la base.
+    # Retourne une liste de segments (b_debut, b_fin, z_debut, z_fin, prix_dual, solution_debut) ;
+    # la liste s'arrête avant target si le modèle devient infaisable au-delà du dernier segment.
+    c, A, b, senses, M, costs, fixed = _standard_form(c, A, b, senses)
+    n = c.size
+    basis = (_optimal_basis(c, A, b, senses) if basis is None else np.asarray(basis)).copy()
+    b = b.copy()
+    direction = 1.0 if target >= b[row] else -1.0
+    segments = []
+
+    for _ in range(max_segments):
+        B_inv = np.linalg.inv(M[:, basis])
+        x_B = B_inv @ b
+        g = direction * B_inv[:, row]
+        _, step = _ratio_range(x_B, g)
+        remaining = abs(target - b[row])
+        step = min(step, remaining)
+
+        y = costs[basis] @ B_inv
+        solution = np.zeros(M.shape[1])
+        solution[basis] = x_B
+        z_start = float(costs[basis] @ x_B)
+        if step > 0:
+            b_end = b[row] + direction * step
+            z_end = z_start + y[row] * direction * step
+            segments.append((float(b[row]), float(b_end), z_start, float(z_end), float(y[row]), solution[:n]))
+            b[row] = b_end
+        if step >= remaining:
+            break
+
+        # Point de rupture : la variable basique qui s'annule sort, test du ratio dual pour l'entrante
+        blocking = np.full(g.shape, np.inf)
+        np.divide(x_B, -g, out=blocking, where=g < -TOL)
+        r = int(np.argmin(blocking))
+        T = B_inv @ M
+        d = costs[basis] @ T - costs
+        eligible = (T[r] < -TOL) & ~fixed
+        eligible[basis] = False
+        if not np.any(eligible):
+            break  # infaisable au-delà de ce point
+        ratios = np.full(T.shape[1], np.inf)
+        ratios[eligible] = d[eligible] / -T[r, eligible]
+        basis[r] = int(np.argmin(ratios))
+    return segments
+
+
+def format_sensitivity(report, var_names, row_labels=None):
+    # Lignes de texte pour le panneau de résultats
+    lines = ["Contraintes (prix dual, plage du second membre) :"]
+    for i, (price, (lo, hi)) in enumerate(zip(report["shadow_prices"], report["rhs_ranges"])):
+        label = row_labels[i] if row_labels is not None else f"#{i + 1}"
+        lines.append(f"  {label}: prix dual {price:.4g}, b dans [{lo:.6g}, {hi:.6g}]")
+    lines.append("Variables (coût réduit, plage du coefficient objectif) :")
+    for name, reduced, (lo, hi) in zip(var_names, report["reduced_costs"], report["objective_ranges"]):
+        lines.append(f"  {name}: coût réduit {reduced:.4g}, c dans [{lo:.6g}, {hi:.6g}]")
+    return lines
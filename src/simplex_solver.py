@@ -1,64 +1,297 @@
 import numpy as np
-import pandas as pd
+from src.instrumentation import DEGENERATE_TOL, clock
+from src.model_parser import FORMAT_HELP, VariableIndex, parse_linear_constraint
+from src.pivoting import DEFAULT_PRICING, DEFAULT_RATIO_TEST, Pricer, check_rules, ratio_test
+from src.sparse import CSCMatrix
 
 def parse_constraint(constraint_str):
+    # Interface historique à 3 variables (x, y, z) et contraintes "<=" ; voir model_parser pour le cas général
+    index = VariableIndex(("x", "y", "z"))
+    cols, vals, sense, limit = parse_linear_constraint(constraint_str, index)
+    if sense != "<=" or len(index) > 3:
+        raise ValueError(FORMAT_HELP)
+    coeffs = [0, 0, 0]
+    for col, val in zip(cols, vals):
+        coeffs[col] = val
+    return coeffs, limit
+
+TOL = 1e-9
+OPTIMAL = "optimal"
+INFEASIBLE = "Problème infaisable"
+UNBOUNDED = "Problème non borné"
+MAX_ITER_REACHED = "Nombre maximal d'itérations atteint"
+
+class SolveCancelled(Exception):
+    # Levée par un rappel de progression pour interrompre une résolution en cours
+    pass
+
+def _pivot(tableau, pivot_row, pivot_col):
+    tableau[pivot_row, :] /= tableau[pivot_row, pivot_col]
+    # Élimination vectorisée sur toutes les autres lignes
+    factors = tableau[:, pivot_col].copy()
+    factors[pivot_row] = 0
+    tableau -= np.outer(factors, tableau[pivot_row, :])
+
+def _flip(tableau, col, bound):
+    # Variable hors base passée d'une borne à l'autre : x_j = bound - x'_j, où x'_j est nulle hors base
+    tableau[:, -1] -= bound * tableau[:, col]
+    tableau[:, col] *= -1
+
+def _run_phase(tableau, basis, objective_row, n_rows, n_cols, after_pivot, max_iter, stats=None,
+               pricing=DEFAULT_PRICING, ratio_rule=DEFAULT_RATIO_TEST, delta=0.0, upper=None, flipped=None):
+    # Itère le simplexe sur tableau[:n_rows] en utilisant objective_row pour le pricing ;
+    # seules les colonnes 1..n_cols peuvent entrer en base. Retourne "optimal", "unbounded" ou "max_iter".
+    # stats (SolveStats, optionnel) reçoit les temps de pricing, de test du ratio et d'élimination.
+    # pricing et ratio_rule : voir src.pivoting ; delta est la tolérance de faisabilité du test de Harris.
+    # upper (bornes supérieures de toutes les colonnes, inf si aucune) active les bornes implicites : une
+    # variable hors base à sa borne supérieure est remplacée par son complément (flipped[j] vrai), si bien
+    # que toutes les variables hors base restent nulles ; une entrante qui atteint sa borne avant toute
+    # sortante change simplement de borne, sans pivot.
+    work = tableau[:n_rows]
+    m = basis.size
+    pricer = Pricer(pricing, n_cols, TOL)
+    columns = lambda: tableau[1:m + 1, 1:n_cols + 1]
+    for _ in range(max_iter):
+        if stats is not None:
+            started = clock()
+        entering = pricer.choose(tableau[objective_row, 1:n_cols + 1], columns)
+        if stats is not None:
+            priced = clock()
+            stats.pricing_time += priced - started
+        if entering < 0:
+            return "optimal"
+        pivot_col = entering + 1
+        row, step = ratio_test(tableau[1:m + 1, pivot_col], tableau[1:m + 1, -1], TOL, ratio_rule, delta,
+                               basis if pricer.bland else None, None if upper is None else upper[basis])
+        if upper is not None and np.isfinite(upper[entering]) and upper[entering] <= step:
+            _flip(work, pivot_col, upper[entering])
+            flipped[entering] = not flipped[entering]
+            if stats is not None:
+                stats.ratio_time += clock() - priced
+                stats.bound_flips += 1
+            after_pivot()
+            continue
+        if row < 0:
+            return "unbounded"
+        pivot_row = row + 1
+        if stats is not None:
+            tested = clock()
+            stats.ratio_time += tested - priced
+        leaving = basis[row]
+        pivot_values = tableau[pivot_row, 1:n_cols + 1].copy() if pricer.weights is not None else None
+        at_upper = upper is not None and tableau[pivot_row, pivot_col] < 0
+        _pivot(work, pivot_row, pivot_col)
+        basis[row] = entering
+        if at_upper:
+            # La sortante quitte la base à sa borne supérieure
+            _flip(work, leaving + 1, upper[leaving])
+            flipped[leaving] = not flipped[leaving]
+        rhs = tableau[1:m + 1, -1]
+        rhs[(rhs < 0) & (rhs > -delta)] = 0.0  # violations tolérées par Harris ramenées à zéro
+        if upper is not None:
+            limit = upper[basis]
+            over = (rhs > limit) & (rhs < limit + delta)
+            rhs[over] = limit[over]
+        pricer.pivoted(entering, pivot_values, leaving if leaving < n_cols else -1, step, DEGENERATE_TOL)
+        if stats is not None:
+            stats.elimination_time += clock() - tested
+            stats.record_pivot(basis, entering, leaving, step)
+        after_pivot()
+    return "max_iter"
+
+def simplex_manual(c, A, b, senses=None, max_iter=None, progress=None, stats=None, pricing=DEFAULT_PRICING,
+                   ratio_test=DEFAULT_RATIO_TEST, lower=None, upper=None):
+    # Maximise c^T x sous A x (<=, >=, =) b, x >= 0 (ou lower <= x <= upper), en deux phases si nécessaire.
+    # Retourne (solution, z, tableaux) ou (None, None, message) en cas d'échec.
+    status, solution, z, tableaux, _ = solve_tableau(c, A, b, senses, max_iter, progress, stats, pricing,
+                                                     ratio_test, lower, upper)
+    if status != OPTIMAL:
+        return None, None, status
+    return solution, z, tableaux
+
+def solve_tableau(c, A, b, senses=None, max_iter=None, progress=None, stats=None, pricing=DEFAULT_PRICING,
+                  ratio_test=DEFAULT_RATIO_TEST, lower=None, upper=None):
+    # Cœur de simplex_manual. Retourne (statut, solution, z, tableaux, base) où statut vaut
+    # OPTIMAL ou un message d'erreur, et base donne pour chaque ligne l'indice de la variable
+    # basique : j < n pour une variable, n + i pour l'écart (ou l'artificielle) de la ligne i.
+    # progress(pivots, z) est appelé après chaque pivot ; il peut lever SolveCancelled.
+    # stats (SolveStats, optionnel) est rempli pendant la résolution.
+    # pricing (règle de la variable entrante) et ratio_test : voir src.pivoting.
+    # Un solveur appelant déjà chronométré (WarmStartSolver) garde la main sur stats.
+    # lower / upper : bornes des variables (0 et +inf par défaut), traitées dans le test du ratio sans
+    # ajouter de ligne au tableau ; une variable hors base de la base retournée est à l'une de ses bornes
+    # (voir bounds_as_rows et bounded_basis pour le modèle équivalent en lignes).
+    check_rules(pricing, ratio_test)
+    if stats is None or stats.running:
+        return _solve_tableau(c, A, b, senses, max_iter, progress, stats, pricing, ratio_test, lower, upper)
+    stats.begin()
     try:
-        left, right = constraint_str.split("<=")
-        # Split by + and handle each term
-        terms = [term.strip() for term in left.split("+")]
-        coeffs = [0, 0, 0]  # Initialize with 3 variables (x, y, z)
-        
-        for term in terms:
-            if 'x' in term:
-                coeffs[0] = float(term.replace("x", "").strip() or 1)
-            elif 'y' in term:
-                coeffs[1] = float(term.replace("y", "").strip() or 1)
-            elif 'z' in term:
-                coeffs[2] = float(term.replace("z", "").strip() or 1)
-        
-        limit = float(right.strip())
-        return coeffs, limit
-    except ValueError:
-        raise ValueError("Format invalide. Utilisez par ex. '500x + 800y + 600z <= 1500000'")
+        return _solve_tableau(c, A, b, senses, max_iter, progress, stats, pricing, ratio_test, lower, upper)
+    finally:
+        stats.end()
 
-def simplex_manual(c, A, b):
+def _solve_tableau(c, A, b, senses, max_iter, progress, stats, pricing, ratio_rule, lower=None, upper=None):
+    # Le tableau est préalloué une seule fois : Z, variables, écarts, artificielles, b,
+    # avec une ligne supplémentaire pour l'objectif de phase I.
     n_vars = len(c)
     n_constraints = len(b)
-    tableau = np.zeros((n_constraints + 1, n_vars + n_constraints + 2))  # Z, vars, slack, b
+    A = np.asarray(A, dtype=float).reshape(n_constraints, n_vars)
+    b = np.asarray(b, dtype=float)
+    senses = np.array(["<="] * n_constraints if senses is None else senses, dtype="<U2")
+    if max_iter is None:
+        max_iter = 50 * (n_vars + n_constraints) + 100
+    
+    # Bornes : changement de variable x = lower + x', avec 0 <= x' <= upper - lower
+    bounded = lower is not None or upper is not None
+    lower = np.zeros(n_vars) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n_vars, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    if np.any(upper < lower - TOL * np.maximum(1.0, np.abs(lower))):
+        return INFEASIBLE, None, None, [], n_vars + np.arange(n_constraints)
+    if np.any(lower != 0):
+        b = b - A @ lower
+    
+    # Second membre positif : on multiplie la ligne par -1 et on inverse le sens
+    negative = b < 0
+    A = np.where(negative[:, None], -A, A)
+    b = np.abs(b)
+    delta = TOL * max(1.0, b.max(initial=0.0))  # tolérance de faisabilité du test de Harris
+    senses = np.where(negative & (senses == "<="), ">=", np.where(negative & (senses == ">="), "<=", senses))
+    
+    artificial_rows = np.flatnonzero(senses != "<=")
+    n_art = artificial_rows.size
+    n_cols = n_vars + n_constraints  # colonnes admissibles en phase II
+    tableau = np.zeros((n_constraints + 2, n_cols + n_art + 2))  # Z, vars, slack, artificielles, b
     
     tableau[0, 1:n_vars + 1] = [-coeff for coeff in c]
     tableau[0, 0] = 1
     
-    for i in range(n_constraints):
-        tableau[i + 1, 1:n_vars + 1] = A[i]
-        tableau[i + 1, n_vars + 1 + i] = 1
-        tableau[i + 1, -1] = b[i]
+    rows = np.arange(n_constraints)
+    tableau[1:n_constraints + 1, 1:n_vars + 1] = A
+    tableau[rows + 1, n_vars + 1 + rows] = np.select([senses == "<=", senses == ">="], [1.0, -1.0], 0.0)
+    tableau[1:n_constraints + 1, -1] = b
+    basis = n_vars + rows  # base initiale : écarts, remplacés par les artificielles si besoin
     
-    tableaux = [tableau.copy()]
+    # Colonnes affichées dans l'historique (sans les artificielles ni la ligne de phase I)
+    visible = np.r_[0:n_cols + 1, tableau.shape[1] - 1]
+    tableaux = []
+    history_bytes = 0
+    if bounded:
+        column_upper = np.full(n_cols + n_art, np.inf)
+        column_upper[:n_vars] = np.maximum(upper - lower, 0.0)
+        flipped = np.zeros(n_cols + n_art, dtype=bool)
+    else:
+        column_upper = flipped = None
     
-    while np.any(tableau[0, 1:-1] < 0):
-        pivot_col = np.argmin(tableau[0, 1:-1]) + 1
-        ratios = [tableau[i, -1] / tableau[i, pivot_col] if tableau[i, pivot_col] > 0 else np.inf for i in range(1, tableau.shape[0])]
-        if all(r == np.inf for r in ratios):
-            return None, None, "Problème non borné"
-        pivot_row = np.argmin(ratios) + 1
-        
-        pivot_value = tableau[pivot_row, pivot_col]
-        tableau[pivot_row, :] /= pivot_value
-        
-        for i in range(tableau.shape[0]):
-            if i != pivot_row:
-                factor = tableau[i, pivot_col]
-                tableau[i, :] -= factor * tableau[pivot_row, :]
+    def snapshot():
+        nonlocal history_bytes
+        tableaux.append(tableau[:n_constraints + 1, visible])
+        if stats is not None:
+            history_bytes += tableaux[-1].nbytes
+            stats.track_memory(tableau.nbytes + history_bytes)
+    
+    pivots = 0
+    
+    def after_pivot():
+        nonlocal pivots
+        pivots += 1
+        snapshot()
+        if progress is not None:
+            progress(pivots, tableau[0, -1])
+    
+    snapshot()
+    
+    if n_art:
+        # Phase I : minimiser la somme des artificielles (ligne W = dernière ligne)
+        art_cols = n_cols + 1 + np.arange(n_art)
+        tableau[artificial_rows + 1, art_cols] = 1
+        basis[artificial_rows] = art_cols - 1
+        tableau[-1, :] = -tableau[artificial_rows + 1, :].sum(axis=0)
+        tableau[-1, art_cols] = 0
+        if stats is not None:
+            stats.enter_phase("phase I")
+        status = _run_phase(tableau, basis, -1, n_constraints + 2, n_cols + n_art, after_pivot, max_iter, stats,
+                            pricing, ratio_rule, delta, column_upper, flipped)
+        if status == "max_iter":
+            return MAX_ITER_REACHED, None, None, tableaux, basis
+        if tableau[-1, -1] < -TOL * max(1.0, np.abs(b).max()):
+            return INFEASIBLE, None, None, tableaux, basis
         
-        tableaux.append(tableau.copy())
+        # Faire sortir de la base les artificielles restées à zéro
+        for row in np.flatnonzero(basis >= n_cols):
+            candidates = np.flatnonzero(np.abs(tableau[row + 1, 1:n_cols + 1]) > TOL)
+            if candidates.size:
+                if stats is not None:
+                    started, leaving = clock(), basis[row]
+                _pivot(tableau, row + 1, candidates[0] + 1)
+                basis[row] = candidates[0]
+                if stats is not None:
+                    stats.elimination_time += clock() - started
+                    stats.record_pivot(basis, candidates[0], leaving, 0.0)
+                after_pivot()
+            # sinon la ligne est redondante : l'artificielle reste en base à zéro
     
-    solution = np.zeros(n_vars)
-    for j in range(n_vars):
-        col = tableau[:, j + 1]
-        if np.sum(col != 0) == 1 and col[0] == 0:
-            row = np.where(col != 0)[0][0]
-            solution[j] = tableau[row, -1]
+    # Phase II sur la ligne Z, artificielles exclues
+    if stats is not None:
+        stats.enter_phase("phase II")
+    status = _run_phase(tableau, basis, 0, n_constraints + 1, n_cols, after_pivot, max_iter, stats,
+                        pricing, ratio_rule, delta, column_upper, flipped)
+    if status == "unbounded":
+        return UNBOUNDED, None, None, tableaux, basis
+    if status == "max_iter":
+        return MAX_ITER_REACHED, None, None, tableaux, basis
     
+    solution = np.zeros(n_cols + n_art)
+    solution[basis] = tableau[1:n_constraints + 1, -1]
+    solution = solution[:n_vars]
     z = tableau[0, -1]
-    return solution, z, tableaux
\ No newline at end of file
+    if bounded:
+        solution = lower + np.where(flipped[:n_vars], column_upper[:n_vars] - solution, solution)
+        z += float(np.dot(c, lower))
+    
+    # Une artificielle restée en base (ligne redondante) est rapportée à l'écart de sa ligne
+    if n_art:
+        remaining = basis >= n_cols
+        basis[remaining] = n_vars + artificial_rows[basis[remaining] - n_cols]
+    
+    return OPTIMAL, solution, z, tableaux, basis
+
+def bounds_as_rows(c, A, b, senses=None, lower=None, upper=None):
+    # Modèle équivalent sans bornes (les variables restent >= 0) : une ligne x_j >= l_j par borne
+    # inférieure non nulle, puis une ligne x_j <= u_j par borne supérieure finie. A dense ou CSCMatrix.
+    n, m = len(c), len(b)
+    lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    if np.any(lower < 0):
+        raise ValueError("Borne inférieure négative : non représentable par une ligne (x >= 0)")
+    cols = np.concatenate([np.flatnonzero(lower > 0), np.flatnonzero(np.isfinite(upper))])
+    n_lower = np.count_nonzero(lower > 0)
+    rhs = np.concatenate([np.asarray(b, dtype=float), lower[cols[:n_lower]], upper[cols[n_lower:]]])
+    senses = np.array(["<="] * m if senses is None else senses, dtype="<U2")
+    senses = np.concatenate([senses, np.full(n_lower, ">="), np.full(cols.size - n_lower, "<=")]).astype("<U2")
+    if isinstance(A, CSCMatrix):
+        rows = A.indices
+        A = CSCMatrix.from_coo(np.concatenate([rows, m + np.arange(cols.size)]),
+                               np.concatenate([A._col_of_nz, cols]),
+                               np.concatenate([A.data, np.ones(cols.size)]), (m + cols.size, n))
+    else:
+        bound = np.zeros((cols.size, n))
+        bound[np.arange(cols.size), cols] = 1.0
+        A = np.vstack([np.asarray(A, dtype=float).reshape(m, n), bound])
+    return c, A, rhs, senses
+
+def bounded_basis(basis, solution, m, lower=None, upper=None):
+    # Base du modèle de bounds_as_rows à partir d'une base de solve_tableau avec bornes : une variable hors
+    # base à une borne non nulle entre en base à la place de l'écart de la ligne de cette borne ; les
+    # écarts des autres lignes de bornes sont en base
+    n = solution.size
+    lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    cols = np.concatenate([np.flatnonzero(lower > 0), np.flatnonzero(np.isfinite(upper))])
+    is_upper = np.arange(cols.size) >= np.count_nonzero(lower > 0)
+    nonbasic = np.ones(n, dtype=bool)
+    nonbasic[basis[basis < n]] = False
+    tol = TOL * np.maximum(1.0, np.abs(solution))
+    at_upper = nonbasic & np.isfinite(upper) & (solution >= upper - tol)
+    at_lower = nonbasic & ~at_upper & (lower > 0)
+    active = np.where(is_upper, at_upper[cols], at_lower[cols])
+    return np.concatenate([basis, cols[active], n + m + np.flatnonzero(~active)]).astype(int)
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.simplex_solver import OPTIMAL, solve_tableau
+
+# Cache de solutions adressé par le contenu du modèle : (c, A, b, sens) normalisés, lignes triées
+# canoniquement, puis hachés. Un même modèle saisi dans un autre ordre de contraintes tombe sur la
+# même entrée. La base finale est stockée dans l'indexation canonique pour servir de départ à chaud
+# aux modèles de même structure (même A et mêmes sens, b ou c différents).
+
+DEFAULT_CAPACITY = 256
+
+
+def _normalize(c, A, b, senses):
+    c = np.ascontiguousarray(c, dtype=float) + 0.0  # + 0.0 ramène -0.0 à 0.0
+    b = np.ascontiguousarray(b, dtype=float) + 0.0
+    A = np.ascontiguousarray(A, dtype=float).reshape(b.size, c.size) + 0.0
+    senses = np.array(["<="] * b.size if senses is None else senses, dtype="<U2")
+    return c, A, b, senses
+
+
+def canonical_order(A, b, senses):
+    # Permutation des lignes triées par coefficients, puis sens, puis second membre
+    keys = [b, senses] + [A[:, j] for j in range(A.shape[1] - 1, -1, -1)]
+    return np.lexsort(keys)
+
+
+def _digest(*arrays):
+    h = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+def model_keys(c, A, b, senses=None):
+    # Retourne (clé du modèle, clé de structure, permutation canonique des lignes)
+    c, A, b, senses = _normalize(c, A, b, senses)
+    order = canonical_order(A, b, senses)
+    structure_key = _digest(A[order], senses[order].astype("S2"))
+    model_key = _digest(c, A[order], b[order], senses[order].astype("S2"))
+    return model_key, structure_key, order
+
+
+def _to_canonical_basis(basis, order, n):
+    # Les colonnes logiques n + i suivent leur ligne dans l'ordre canonique
+    position = np.empty_like(order)
+    position[order] = np.arange(order.size)
+    basis = np.asarray(basis, dtype=np.int64)
+    return np.sort(np.where(basis >= n, n + position[np.maximum(basis - n, 0)], basis))
+
+
+def _from_canonical_basis(basis, order, n):
+    basis = np.asarray(basis, dtype=np.int64)
+    return np.where(basis >= n, n + order[np.maximum(basis - n, 0)], basis)
+
+
+class SolutionCache:
+    # LRU en mémoire, doublé d'un stockage sqlite optionnel qui survit aux redémarrages
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None):
+        self.capacity = capacity
+        self.path = path
+        self._memory = OrderedDict()
+        self._structures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, status TEXT, "
+                             "objective REAL, solution BLOB, basis BLOB)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS structures (key TEXT PRIMARY KEY, basis BLOB)")
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, table, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.capacity:
+            table.popitem(last=False)
+
+    def _lookup(self, key):
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT status, objective, solution, basis FROM solutions WHERE key = ?",
+                               (key,)).fetchone()
+        if row is None:
+            return None
+        status, objective, solution, basis = row
+        entry = (status, objective,
+                 None if solution is None else np.frombuffer(solution, dtype=float).copy(),
+                 None if basis is None else np.frombuffer(basis, dtype=np.int64).copy())
+        self._remember(self._memory, key, entry)
+        return entry
+
+    def get(self, c, A, b, senses=None):
+        # Retourne (statut, z, solution, base) dans l'indexation de l'appelant, ou None
+        model_key, _, order = model_keys(c, A, b, senses)
+        with self._lock:
+            entry = self._lookup(model_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        status, objective, solution, basis = entry
+        if basis is not None:
+            basis = _from_canonical_basis(basis, order, len(c))
+        return status, objective, solution, basis
+
+    def flush(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.commit()
+
+    def put(self, c, A, b, senses, status, objective, solution, basis, commit=True):
+        # commit=False regroupe les écritures sqlite jusqu'au prochain flush()
+        model_key, structure_key, order = model_keys(c, A, b, senses)
+        n = len(c)
+        basis = None if basis is None or status != OPTIMAL else _to_canonical_basis(basis, order, n)
+        solution = None if solution is None else np.asarray(solution, dtype=float).copy()
+        entry = (status, None if objective is None else float(objective), solution, basis)
+        with self._lock:
+            self._remember(self._memory, model_key, entry)
+            if basis is not None:
+                self._remember(self._structures, structure_key, basis)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)",
+                                 (model_key, status, entry[1],
+                                  None if solution is None else solution.tobytes(),
+                                  None if basis is None else basis.tobytes()))
+                if basis is not None:
+                    self._db.execute("INSERT OR REPLACE INTO structures VALUES (?, ?)",
+                                     (structure_key, basis.tobytes()))
+                if commit:
+                    self._db.commit()
+
+    def warm_basis(self, c, A, b, senses=None):
+        # Dernière base optimale connue pour un modèle de même structure (A et sens identiques)
+        _, structure_key, order = model_keys(c, A, b, senses)
+        with self._lock:
+            basis = self._structures.get(structure_key)
+            if basis is None and self._db is not None:
+                row = self._db.execute("SELECT basis FROM structures WHERE key = ?", (structure_key,)).fetchone()
+                if row is not None:
+                    basis = np.frombuffer(row[0], dtype=np.int64).copy()
+                    self._remember(self._structures, structure_key, basis)
+        if basis is None:
+            return None
+        return _from_canonical_basis(basis, order, len(c))
+
+    def solve(self, c, A, b, senses=None):
+        # Comme simplex_manual, sans historique : (solution, z, []) ou (None, None, message)
+        hit = self.get(c, A, b, senses)
+        if hit is None:
+            status, solution, z, _, basis = solve_tableau(c, A, b, senses)
+            self.put(c, A, b, senses, status, z, solution, basis)
+        else:
+            status, z, solution, _ = hit
+        if status != OPTIMAL:
+            return None, None, status
+        return solution, z, []
@@ -0,0 +1,173 @@
+import math
+
+import numpy as np
+
+from src.branch_and_bound import FEASIBLE, NO_INTEGER_SOLUTION, _mask, branch_and_bound
+from src.instrumentation import SolveStats
+from src.model_io import load_model, read_lp, read_mps, to_text, write_lp, write_model, write_mps
+from src.model_parser import parse_model, parse_model_file
+from src.presolve import Postsolve, presolve as presolve_model
+from src.pivoting import DEFAULT_PRICING, DEFAULT_RATIO_TEST, PRICING_RULES, RATIO_TESTS
+from src.revised_simplex import simplex_revised
+from src.sensitivity import dual_values, format_sensitivity, parametric_rhs, sensitivity_analysis
+from src.simplex_solver import (INFEASIBLE, MAX_ITER_REACHED, OPTIMAL, UNBOUNDED, SolveCancelled,
+                                bounded_basis, bounds_as_rows, simplex_manual, solve_tableau)
+from src.solution_cache import SolutionCache
+from src.warm_start import WarmStartSolver
+
+# Cœur de résolution sans interface : n'importe que NumPy (et la bibliothèque standard),
+# jamais Tkinter, matplotlib ni pandas. Chaîne d'appel : parse -> solve -> report.
+
+METHODS = ("tableau", "revised")
+
+
+def parse(objective, constraints, variables=()):
+    # Retourne (c, A, b, senses, names) ; voir model_parser.parse_model
+    return parse_model(objective, constraints, variables=variables)
+
+
+def solve(c, A, b, senses=None, names=None, method="tableau", sensitivity=False, record_history=False,
+          stats=None, pricing=DEFAULT_PRICING, ratio_test=DEFAULT_RATIO_TEST, integer=None, binary=None,
+          time_limit=None, workers=1, presolve=False, lower=None, upper=None):
+    # Résout le modèle et retourne un dictionnaire : status, objective, solution, names, tableaux,
+    # sensitivity (rapport de sensitivity_analysis) si demandé et si le modèle est optimal,
+    # et stats (le SolveStats fourni, rempli pendant la résolution, ou None).
+    # pricing et ratio_test (voir src.pivoting) ne concernent que la méthode "tableau".
+    # integer / binary (masque booléen, noms ou indices) passent en séparation et évaluation : le résultat
+    # contient alors milp (nœuds, borne, écart, durée) et ni tableaux ni sensibilité ; stats et presolve
+    # ne s'appliquent pas à ce chemin et sont refusés (ValueError).
+    # presolve=True résout le modèle réduit par src.presolve : solution, objectif et sensibilité sont
+    # rapportés au modèle d'origine, les tableaux restent ceux du modèle réduit (colonnes nommées par
+    # result["presolve"].labels(names)). Avec la méthode "tableau", les bornes supérieures trouvées par
+    # la présolution restent des bornes du simplexe au lieu de redevenir des lignes.
+    # lower / upper : bornes des variables (0 et +inf par défaut). La méthode "tableau" sans présolution
+    # les traite dans le test du ratio ; sinon, et pour l'analyse de sensibilité, elles deviennent des
+    # lignes (voir bounds_as_rows), rapportées après les contraintes du modèle.
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue '{method}' (attendu : {', '.join(METHODS)})")
+    names = list(names) if names is not None else [f"x{j + 1}" for j in range(len(c))]
+    integer, binary = _variable_mask(integer, names), _variable_mask(binary, names)
+    milp = integer.any() or binary.any()
+    if milp and (stats is not None or presolve):
+        raise ValueError("Statistiques et présolution ne sont pas disponibles avec des variables entières")
+    bounded = lower is not None or upper is not None
+    if bounded and (presolve or method == "revised" or milp):
+        c, A, b, senses = bounds_as_rows(c, A, b, senses, lower, upper)
+        bounded = False
+    if milp:
+        status, solution, objective, info = branch_and_bound(
+            c, A, b, senses, integer=integer, binary=binary, time_limit=time_limit, workers=workers)
+        return {"status": status, "objective": None if objective is None else float(objective),
+                "solution": solution, "names": names, "tableaux": [], "sensitivity": None, "stats": None,
+                "presolve": None, "milp": info}
+    post = None
+    model = (c, A, b, senses)
+    if presolve:
+        model, post = presolve_model(c, A, b, senses, bounds=method == "tableau")
+        lower, upper = None, post.upper
+    if post is not None and post.status is not None:
+        status, solution, objective, tableaux, basis = post.status, None, None, [], None
+    elif post is not None and model[0].size == 0:
+        # Modèle entièrement résolu par la présolution
+        status, solution, objective, tableaux, basis = OPTIMAL, np.zeros(0), 0.0, [], np.zeros(0, dtype=int)
+    else:
+        lp_method = method
+        if post is not None and method == "revised" and np.any(model[3] != "<="):
+            # Le révisé part de la base d'écart et n'a pas de phase I : un modèle réduit avec des lignes
+            # ">=" ou "=" (lignes retournées après décalage des bornes) passe par le tableau
+            reduced_A = model[1].toarray() if hasattr(model[1], "toarray") else model[1]
+            model, lp_method = (model[0], reduced_A, model[2], model[3]), "tableau"
+        status, solution, objective, tableaux, basis = _solve_lp(*model, lp_method, record_history, stats,
+                                                                 pricing, ratio_test, lower, upper)
+    if post is not None and status == OPTIMAL:
+        solution, objective = post.solution(solution), post.objective(objective)
+        if basis is not None:
+            duals = post.duals(dual_values(*model, basis), c, A)
+            basis = post.basis(basis, solution, duals)
+    result = {
+        "status": status,
+        "objective": None if objective is None else float(objective),
+        "solution": solution,
+        "names": names,
+        "tableaux": tableaux if status == OPTIMAL else [],
+        "sensitivity": None,
+        "stats": stats,
+        "presolve": post,
+        "milp": None,
+    }
+    if sensitivity and status == OPTIMAL:
+        if bounded:
+            basis = bounded_basis(basis, solution, len(b), lower, upper)
+            c, A, b, senses = bounds_as_rows(c, A, b, senses, lower, upper)
+        if hasattr(A, "toarray"):
+            A = A.toarray()  # l'analyse de sensibilité travaille sur le tableau dense
+        result["sensitivity"] = sensitivity_analysis(c, A, b, senses, basis=basis)
+    return result
+
+
+def _solve_lp(c, A, b, senses, method, record_history, stats, pricing, ratio_test, lower=None, upper=None):
+    # Retourne (statut, solution, z, tableaux, base) ; base vaut None pour la méthode révisée, qui ne
+    # reçoit pas de bornes
+    if method == "revised":
+        if senses is not None and np.any(np.asarray(senses) != "<="):
+            raise ValueError("La méthode révisée ne prend en charge que les contraintes '<='")
+        solution, objective, tableaux = simplex_revised(c, A, b, record_history=record_history, stats=stats)
+        return (OPTIMAL if solution is not None else tableaux), solution, objective, tableaux, None
+    status, solution, objective, tableaux, basis = solve_tableau(c, A, b, senses, stats=stats, pricing=pricing,
+                                                                 ratio_test=ratio_test, lower=lower, upper=upper)
+    return status, solution, objective, tableaux if record_history else [], basis
+
+
+def _variable_mask(variables, names):
+    # Masque booléen des variables désignées par un masque, leurs noms ou leurs indices (None : aucune)
+    n = len(names)
+    if variables is None:
+        return np.zeros(n, dtype=bool)
+    if np.asarray(variables).dtype == bool:
+        if np.asarray(variables).shape != (n,):
+            raise ValueError(f"Masque de {np.asarray(variables).size} variables, attendu {n}")
+        return _mask(variables, n)
+    indices = []
+    for variable in np.asarray(variables, dtype=object).reshape(-1):
+        if isinstance(variable, str):
+            if variable not in names:
+                raise ValueError(f"Variable inconnue '{variable}'")
+            variable = names.index(variable)
+        if not 0 <= int(variable) < n:
+            raise ValueError(f"Indice de variable {int(variable)} hors de [0, {n})")
+        indices.append(int(variable))
+    return _mask(np.array(indices, dtype=int), n)
+
+
+def report(result):
+    # Rapport texte d'un résultat de solve()
+    stats = result.get("stats")
+    post = result.get("presolve")
+    if result["solution"] is None:
+        lines = [f"Échec : {result['status']}"]
+        if post is not None:
+            lines.append(post.summary())
+        if stats is not None:
+            lines.append(f"Statistiques : {stats.summary()}")
+        return "\n".join(lines)
+    lines = ["Solution optimale :" if result["status"] == OPTIMAL else f"{result['status']} :"]
+    for name, value in zip(result["names"], result["solution"]):
+        lines.append(f"  {name} = {value:.6g}")
+    lines.append(f"Objectif : {result['objective']:.6g}")
+    if result["sensitivity"] is not None:
+        lines.append("Analyse de sensibilité :")
+        lines.extend(format_sensitivity(result["sensitivity"], result["names"]))
+    if result.get("milp") is not None:
+        lines.append(format_milp(result["milp"]))
+    if post is not None:
+        lines.append(post.summary())
+    if stats is not None:
+        lines.append(f"Statistiques : {stats.summary()}")
+    return "\n".join(lines)
+
+
+def format_milp(info):
+    # Ligne de synthèse d'une séparation et évaluation (infos retournées par branch_and_bound)
+    gap = "sans solution entière" if math.isinf(info["gap"]) else f"écart {info['gap']:.2%}"
+    return (f"Séparation et évaluation : {info['nodes']} nœuds, borne {info['bound']:.6g}, {gap}, "
+            f"{info['seconds']:.2f} s")
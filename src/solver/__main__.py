@@ -0,0 +1,87 @@
+import argparse
+import json
+import math
+import sys
+
+from data.marrakech_data import OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT
+from src.solver import (DEFAULT_PRICING, DEFAULT_RATIO_TEST, FEASIBLE, METHODS, OPTIMAL, PRICING_RULES, RATIO_TESTS,
+                        SolveStats, load_model, parse, report, solve, write_model)
+
+# python -m src.solver [modele.txt] : résolution en ligne de commande, sans affichage graphique
+
+
+def _json_safe(value):
+    # JSON strict : les bornes et plages infinies (ou NaN) deviennent null
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.solver",
+                                     description="Résout un modèle linéaire (maximisation) sans interface graphique")
+    parser.add_argument("model", nargs="?", help="Fichier de modèle .lp, .mps ou texte (objectif puis une "
+                                                 "contrainte par ligne) ; par défaut les données de Marrakech")
+    parser.add_argument("--method", choices=METHODS, default="tableau", help="Variante du simplexe")
+    parser.add_argument("--pricing", choices=PRICING_RULES, default=DEFAULT_PRICING,
+                        help="Règle de choix de la variable entrante (méthode tableau)")
+    parser.add_argument("--ratio-test", choices=RATIO_TESTS, default=DEFAULT_RATIO_TEST,
+                        help="Test du ratio (méthode tableau)")
+    parser.add_argument("--presolve", action="store_true",
+                        help="Réduire le modèle (bornes, lignes redondantes, mise à l'échelle) avant la résolution")
+    parser.add_argument("--sensitivity", action="store_true", help="Ajouter l'analyse de sensibilité")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON au lieu du rapport texte")
+    parser.add_argument("--integer", nargs="+", default=(), metavar="VAR", help="Variables entières")
+    parser.add_argument("--binary", nargs="+", default=(), metavar="VAR", help="Variables binaires (0 ou 1)")
+    parser.add_argument("--time-limit", type=float, help="Durée maximale de la séparation et évaluation (s)")
+    parser.add_argument("--workers", type=int, default=1, help="Processus explorant des sous-arbres en parallèle")
+    parser.add_argument("--cache", action="store_true",
+                        help="Relire le modèle depuis son cache binaire (créé à côté du fichier)")
+    parser.add_argument("--export", metavar="FICHIER", help="Écrire le modèle (.lp, .mps ou texte) sans le résoudre")
+    parser.add_argument("--stats", action="store_true", help="Mesurer pivots, temps par étape et mémoire")
+    args = parser.parse_args(argv)
+
+    integer = list(args.integer)
+    if args.model is None:
+        c, A, b, senses, names = parse(OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT, variables=("x", "y", "z"))
+    else:
+        # Le simplexe révisé travaille sur A creuse ; le tableau a besoin de A dense
+        c, A, b, senses, names, declared = load_model(args.model, sparse=args.method == "revised" or bool(args.export),
+                                                      cache=args.cache)
+        integer += [name for name in declared if name not in integer]
+    if args.export:
+        write_model(args.export, c, A, b, senses, names, integer)
+        return 0
+    if (integer or args.binary) and (args.stats or args.presolve):
+        parser.error("--stats et --presolve ne s'appliquent pas aux variables entières (--integer, --binary "
+                     "ou section General/Binary du modèle)")
+    result = solve(c, A, b, senses, names=names, method=args.method, sensitivity=args.sensitivity,
+                   stats=SolveStats() if args.stats else None, pricing=args.pricing, ratio_test=args.ratio_test,
+                   integer=integer, binary=args.binary, time_limit=args.time_limit, workers=args.workers,
+                   presolve=args.presolve)
+
+    if args.json:
+        sensitivity = result["sensitivity"]
+        print(json.dumps(_json_safe({
+            "status": result["status"],
+            "objective": result["objective"],
+            "solution": None if result["solution"] is None else dict(zip(names, result["solution"].tolist())),
+            "sensitivity": None if sensitivity is None else {
+                key: sensitivity[key].tolist()
+                for key in ("shadow_prices", "rhs_ranges", "reduced_costs", "objective_ranges")
+            },
+            "stats": None if result["stats"] is None else result["stats"].as_dict(),
+            "milp": result.get("milp"),
+            "presolve": None if result["presolve"] is None else result["presolve"].summary(),
+        }), indent=2, allow_nan=False))
+    else:
+        print(report(result))
+    return 0 if result["status"] in (OPTIMAL, FEASIBLE) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
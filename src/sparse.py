@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class CSCMatrix:
+    # Matrice creuse stockée par colonnes (format CSC), uniquement avec NumPy.
+    # Accepte aussi en entrée les matrices scipy.sparse (via .tocsc()) sans en dépendre.
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        # Indice de colonne de chaque non-zéro, pour le pricing vectorisé
+        self._col_of_nz = np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        keep = vals != 0
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+        order = np.lexsort((rows, cols))
+        rows, cols, vals = rows[order], cols[order], vals[order]
+        indptr = np.zeros(shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=shape[1]), out=indptr[1:])
+        return cls(vals, rows, indptr, shape)
+
+    @classmethod
+    def from_any(cls, A, n_cols=None):
+        if isinstance(A, cls):
+            return A
+        if hasattr(A, "tocsc"):
+            A = A.tocsc()
+            return cls(A.data, A.indices, A.indptr, A.shape)
+        dense = np.asarray(A, dtype=float)
+        if dense.size == 0:
+            return cls([], [], np.zeros((n_cols or 0) + 1), (0, n_cols or 0))
+        dense = np.atleast_2d(dense)
+        rows, cols = np.nonzero(dense)
+        return cls.from_coo(rows, cols, dense[rows, cols], dense.shape)
+
+    @property
+    def nnz(self):
+        return self.data.size
+
+    def column(self, j):
+        start, end = self.indptr[j], self.indptr[j + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def dense_column(self, j):
+        col = np.zeros(self.shape[0])
+        idx, vals = self.column(j)
+        col[idx] = vals
+        return col
+
+    def matvec(self, x):
+        # A @ x
+        return np.bincount(self.indices, weights=self.data * x[self._col_of_nz], minlength=self.shape[0])
+
+    def rmatvec(self, y):
+        # y^T A, calculé pour toutes les colonnes en une seule passe
+        return np.bincount(self._col_of_nz, weights=self.data * y[self.indices], minlength=self.shape[1])
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        dense[self.indices, self._col_of_nz] = self.data
+        return dense
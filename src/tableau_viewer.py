@@ -0,0 +1,114 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+# Affichage paginé de l'historique des tableaux : seuls les tableaux de la page visible sont formatés,
+# en largeur fixe directement depuis NumPy (sans passer par pandas).
+
+
+def format_tableau(tableau, column_names, precision=2):
+    cells = np.char.mod(f"%.{precision}f", np.asarray(tableau, dtype=float))
+    widths = np.maximum(np.char.str_len(cells).max(axis=0, initial=0),
+                        [len(name) for name in column_names])
+    header = " ".join(name.rjust(width) for name, width in zip(column_names, widths))
+    rows = [" ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in cells.tolist()]
+    return "\n".join([header] + rows)
+
+
+def select_tableaux(count, keep_every=None):
+    # Indices conservés : tous, ou le premier, le dernier et un sur keep_every
+    if not keep_every or keep_every <= 1:
+        return list(range(count))
+    indices = list(range(0, count, keep_every))
+    if count and indices[-1] != count - 1:
+        indices.append(count - 1)
+    return indices
+
+
+class TableauViewer(ttk.Frame):
+
+    def __init__(self, master, page_size=3, height=15, **kwargs):
+        super().__init__(master, **kwargs)
+        self.page_size = page_size
+        self.tableaux = []
+        self.column_names = []
+        self.indices = []
+        self.page = 0
+        self._cache = {}
+
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(controls, text="◀ Précédent", command=self.previous_page,
+                   style='Secondary.TButton').pack(side=tk.LEFT)
+        ttk.Button(controls, text="Suivant ▶", command=self.next_page,
+                   style='Secondary.TButton').pack(side=tk.LEFT, padx=(5, 10))
+        self.page_label = ttk.Label(controls, text="Aucun tableau")
+        self.page_label.pack(side=tk.LEFT)
+
+        ttk.Label(controls, text="Afficher 1 tableau sur").pack(side=tk.LEFT, padx=(15, 5))
+        self.keep_every = tk.IntVar(value=1)
+        keep_spin = ttk.Spinbox(controls, from_=1, to=1000, width=5, textvariable=self.keep_every,
+                                command=self._reselect)
+        keep_spin.pack(side=tk.LEFT)
+        keep_spin.bind("<Return>", lambda event: self._reselect())
+
+        self.text = tk.Text(self, height=height, width=80, font=("Consolas", 9), bg="#ffffff",
+                            relief="flat", wrap=tk.NONE)
+        x_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=x_scrollbar.set, padx=10, pady=10)
+        self.text.tag_configure("table_title", font=("Segoe UI", 10, "italic"), foreground="#616161")
+        self.text.tag_configure("table_content", font=("Consolas", 9))
+        self.text.pack(fill=tk.BOTH, expand=True)
+        x_scrollbar.pack(fill=tk.X)
+
+    def set_tableaux(self, tableaux, column_names):
+        self.tableaux = tableaux
+        self.column_names = list(column_names)
+        self._cache.clear()
+        self._reselect()
+
+    def clear(self):
+        self.set_tableaux([], [])
+
+    def _reselect(self):
+        try:
+            keep_every = max(1, int(self.keep_every.get()))
+        except (tk.TclError, ValueError):
+            keep_every = 1
+        self.indices = select_tableaux(len(self.tableaux), keep_every)
+        self.page = 0
+        self._render()
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.indices) // self.page_size))
+
+    def next_page(self):
+        if self.page + 1 < self.page_count:
+            self.page += 1
+            self._render()
+
+    def previous_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self._render()
+
+    def _formatted(self, index):
+        if index not in self._cache:
+            self._cache[index] = format_tableau(self.tableaux[index], self.column_names)
+        return self._cache[index]
+
+    def _render(self):
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        if not self.indices:
+            self.page_label.configure(text="Aucun tableau")
+        else:
+            visible = self.indices[self.page * self.page_size:(self.page + 1) * self.page_size]
+            self.page_label.configure(
+                text=f"Page {self.page + 1}/{self.page_count} ({len(self.tableaux)} tableaux)")
+            for index in visible:
+                self.text.insert(tk.END, f"Tableau {index + 1}:\n", "table_title")
+                self.text.insert(tk.END, f"{self._formatted(index)}\n\n", "table_content")
+        self.text.configure(state=tk.DISABLED)
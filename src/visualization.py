@@ -1,188 +1,271 @@
+import math
+
 import numpy as np
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from matplotlib import cm
-
-def plot_solution(solution, A, b, canvas, fig):
-    # Déterminer le nombre de variables non nulles dans la solution
-    non_zero_vars = sum(1 for val in solution if val > 0.001)
-    x, y, z = solution
-    fig.clf()
-    
-    # Set modern style for the plot
-    plt.style.use('seaborn-v0_8-whitegrid')
-    
-    # Choisir entre visualisation 2D ou 3D en fonction du nombre de variables non nulles
-    if non_zero_vars <= 2:
-        # Créer un subplot 2D avec un look moderne
-        ax = fig.add_subplot(111, facecolor='#f8f9fa')
-    else:
-        # Show message for 3 variables
-        ax = fig.add_subplot(111, facecolor='#f8f9fa')
-        ax.text(0.5, 0.5, '3D visualization not available\nPlease use 2 variables for visualization', 
-               horizontalalignment='center', verticalalignment='center', 
-               fontsize=12, color='#212121', transform=ax.transAxes)
-        return
-    
-    # Ajuster la taille de la figure pour plus de clarté et assurer la visibilité dans le conteneur scrollable
-    fig.set_size_inches(10, 6)  # Taille optimale pour la visualisation
-    fig.tight_layout(pad=2.5)  # Améliorer l'espacement pour éviter les chevauchements
-    
-    # Modern color palette
-    colors = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#E91E63', '#3F51B5']
-    
-    if non_zero_vars <= 2:
-        # Visualisation 2D pour 2 variables ou moins
-        # Déterminer quelles variables sont non nulles
-        active_vars = []
-        if x > 0.001:
-            active_vars.append(0)  # x est actif
-        if y > 0.001:
-            active_vars.append(1)  # y est actif
-        if z > 0.001:
-            active_vars.append(2)  # z est actif
-            
-        # Si une seule variable est active, on ajoute une deuxième pour la visualisation
-        if len(active_vars) == 1:
-            if active_vars[0] != 0:
-                active_vars.insert(0, 0)  # Ajouter x comme deuxième variable
+
+from src.polytope import feasible_polytope
+
+# Tracé persistant : les axes, la légende et les artistes sont créés une fois, puis seules leurs
+# données changent. Les artistes animés (contraintes en 2D, marqueur de la solution) sont redessinés
+# par blitting sur un fond mémorisé ; le canvas n'est redessiné entièrement que lorsque les bornes des
+# axes, les variables tracées, le mode 2D/3D ou le nombre de contraintes changent.
+# En 3D, le polyèdre réalisable est calculé une fois par modèle (src.polytope) et rendu en une seule
+# Poly3DCollection ; tourner la vue ou déplacer la solution ne le recalcule pas.
+
+VARIABLE_NAMES = ["Recyclage (x)", "Incinération (y)", "Compostage (z)"]
+COLORS = ['#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#E91E63', '#3F51B5']
+BOUNDARY_COLOR = '#bdbdbd'  # faces x >= 0 et coupe d'un domaine non borné
+MIN_BOUNDS = (800, 600, 400)  # bornes minimales des axes, en tonnes
+MARGIN = 100  # marge autour de la solution, en tonnes
+BOUNDS_STEP = 250  # pas d'arrondi des bornes des axes, en tonnes
+N_POINTS = 100
+
+
+def active_pair(solution, tol=0.001):
+    # Les deux variables tracées : les non nulles, complétées par x puis y ; None au-delà de deux
+    active = [j for j, value in enumerate(solution) if value > tol]
+    if len(active) > 2:
+        return None
+    if len(active) == 0:
+        return 0, 1
+    if len(active) == 1:
+        return (0, active[0]) if active[0] != 0 else (0, 1)
+    return active[0], active[1]
+
+
+def constraint_curves(A, b, pair, x_max, n_points=N_POINTS):
+    # Abscisses communes et ordonnées de chaque contrainte (NaN hors du quadrant positif) ;
+    # une contrainte sans coefficient sur la seconde variable n'est pas tracée (ligne à False)
+    i, j = pair
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    xs = np.linspace(0, x_max, n_points)
+    drawable = A[:, j] != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ys = (b[:, None] - A[:, i, None] * xs) / A[:, j, None]
+    ys[~drawable] = np.nan
+    ys[ys < 0] = np.nan
+    return xs, ys, drawable
+
+
+def _axis_limit(needed, minimum, current):
+    # Borne d'un axe arrondie au pas supérieur. Hystérésis : la borne courante est gardée tant qu'elle
+    # couvre le besoin sans dépasser le double, pour que de petits déplacements de la solution restent
+    # sur le chemin du blitting au lieu de recalculer les graduations.
+    if current is not None and current / 2 < needed <= current:
+        return current
+    if needed <= minimum:
+        return minimum
+    return max(minimum, BOUNDS_STEP * math.ceil(needed / BOUNDS_STEP))
+
+
+def _legend_handles(count):
+    handles = [plt.Line2D([0], [0], color=COLORS[i % len(COLORS)], lw=2, label=f"Contrainte {i+1}")
+               for i in range(count)]
+    handles.append(plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#E91E63',
+                              markersize=10, label="Solution optimale"))
+    return handles
+
+
+class PlotController:
+
+    def __init__(self, fig, canvas):
+        self.fig = fig
+        self.canvas = canvas
+        self.mode = None
+        self.ax = None
+        self._background = None
+        self._cid = canvas.mpl_connect('draw_event', self._on_draw)
+        fig.set_size_inches(10, 6)
+        fig.patch.set_facecolor('#f8f9fa')
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+
+    def _reset(self, mode):
+        # Changement de mode 2D/3D : seul cas où les axes sont reconstruits
+        self.fig.clf()
+        self.mode = mode
+        self.lines = []
+        self.legend = None
+        self.pair = None
+        self.bounds = None
+        self.polytope = None
+        self._model = None
+        self._background = None
+        with plt.style.context('seaborn-v0_8-whitegrid'):
+            if mode == "3d":
+                self.ax = self.fig.add_subplot(111, projection='3d', facecolor='#f8f9fa')
             else:
-                active_vars.append(1)  # Ajouter y comme deuxième variable
-        
-        # Extraire les deux variables actives
-        var1_idx, var2_idx = active_vars[0], active_vars[1]
-        var_names = ["Recyclage (x)", "Incinération (y)", "Compostage (z)"]
-        var_values = [x, y, z]
-        
-        # Définir les limites des axes avec une marge plus large
-        var1_max = max(800, var_values[var1_idx] + 100)  # Marge de 100 tonnes
-        var2_max = max(600, var_values[var2_idx] + 100)  # Marge de 100 tonnes
-        
-        # Créer un espace de points pour le tracé
-        var1_range = np.linspace(0, var1_max, 100)
-        
-        # Tracer chaque contrainte comme une ligne
-        for i, (coeffs, limit) in enumerate(zip(A, b)):
-            color = colors[i % len(colors)]
-            
-            # Calculer var2 en fonction de var1 à partir de l'équation de contrainte
-            if coeffs[var2_idx] != 0:
-                var2_values = (limit - coeffs[var1_idx] * var1_range) / coeffs[var2_idx]
-                # Filtrer les valeurs négatives (non réalisables)
-                valid_indices = var2_values >= 0
-                ax.plot(var1_range[valid_indices], var2_values[valid_indices], 
-                         color=color, linewidth=2, label=f"Contrainte {i+1}")
-        
-        # Ajouter la solution optimale avec un marqueur plus visible
-        ax.scatter([var_values[var1_idx]], [var_values[var2_idx]], marker='o', s=100, 
-                   color='#E91E63', edgecolor='white', linewidth=2, label="Solution optimale")
-        
-        # Ajouter une annotation pour la solution optimale
-        ax.text(var_values[var1_idx], var_values[var2_idx], 
-                f'({var_values[var1_idx]:.1f}, {var_values[var2_idx]:.1f})', 
-                color='#212121', fontsize=10, fontweight='bold')
-        
-        # Définir les limites et ajouter des marges
-        ax.set_xlim(0, var1_max)
-        ax.set_ylim(0, var2_max)
-        
-        # Améliorer la lisibilité avec un style moderne
-        ax.set_xlabel(f"{var_names[var1_idx]}, tonnes", fontsize=10, fontweight='bold', color='#424242')
-        ax.set_ylabel(f"{var_names[var2_idx]}, tonnes", fontsize=10, fontweight='bold', color='#424242')
-        ax.set_title("Optimisation des déchets à Marrakech (2D)", fontsize=14, fontweight='bold', color='#212121', pad=15)
-        
-        # Ajouter une légende personnalisée
-        legend_elements = []
-        for i in range(len(A)):
-            color = colors[i % len(colors)]
-            legend_elements.append(plt.Line2D([0], [0], color=color, lw=2, label=f"Contrainte {i+1}"))
-        legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#E91E63', 
-                                         markersize=10, label="Solution optimale"))
-    else:
-        # Visualisation 3D pour 3 variables
-        # Définir les limites des axes avec une marge plus large
-        x_max = max(800, x + 100)  # Marge de 100 tonnes
-        y_max = max(600, y + 100)  # Marge de 100 tonnes
-        z_max = max(400, z + 100)  # Marge de 100 tonnes
-        
-        # Create a meshgrid for 3D plotting
-        X = np.linspace(0, x_max, 20)
-        Y = np.linspace(0, y_max, 20)
-        X, Y = np.meshgrid(X, Y)
-        
-        # Plot each constraint as a 3D plane
-        for i, (coeffs, limit) in enumerate(zip(A, b)):
-            color = colors[i % len(colors)]
-            
-            # Calculate Z values from the constraint equation: ax + by + cz = d
-            # If coefficient of z is 0, we need to handle it differently
-            if coeffs[2] != 0:
-                Z = (limit - coeffs[0] * X - coeffs[1] * Y) / coeffs[2]
-                # Clip negative values (not feasible)
-                Z = np.maximum(Z, 0)
-                # Plot the surface
-                surf = ax.plot_surface(X, Y, Z, alpha=0.3, color=color, label=f"Contrainte {i+1}")
-                surf._facecolors2d = surf._facecolor3d
-                surf._edgecolors2d = surf._edgecolor3d
+                self.ax = self.fig.add_subplot(111, facecolor='#f8f9fa')
+        self.ax.set_title(f"Optimisation des déchets à Marrakech ({mode.upper()})", fontsize=14,
+                          fontweight='bold', color='#212121', pad=15)
+        self.ax.tick_params(colors='#616161', labelsize=9)
+        label_style = dict(fontsize=10, fontweight='bold', color='#424242')
+        if mode == "3d":
+            self.ax.set_xlabel("Recyclage (x, tonnes)", **label_style)
+            self.ax.set_ylabel("Incinération (y, tonnes)", **label_style)
+            self.ax.set_zlabel("Compostage (z, tonnes)", **label_style)
+            self.ax.view_init(elev=30, azim=45)
+            self.marker, = self.ax.plot([], [], [], linestyle='none', marker='o', markersize=10,
+                                        color='#E91E63', markeredgecolor='white', markeredgewidth=2,
+                                        animated=True)
+            self.annotation = self.ax.text(0, 0, 0, '', color='#212121', fontsize=10, fontweight='bold',
+                                           animated=True)
+        else:
+            self.ax.grid(True, linestyle='--', alpha=0.4, color='#9e9e9e')
+            self.marker, = self.ax.plot([], [], linestyle='none', marker='o', markersize=10, color='#E91E63',
+                                        markeredgecolor='white', markeredgewidth=2, animated=True, zorder=5)
+            self.annotation = self.ax.text(0, 0, '', color='#212121', fontsize=10, fontweight='bold',
+                                           animated=True, clip_on=True)
+        self._label_style = label_style
+        # Dimensionné pour la légende placée à droite des axes ; pas de tight_layout à chaque tracé
+        self.fig.subplots_adjust(left=0.09, right=0.76, bottom=0.1, top=0.9)
+
+    def _animated(self):
+        return self.lines + [self.marker, self.annotation]
+
+    def _on_draw(self, event):
+        # Après chaque rendu complet (rotation 3D et redimensionnement compris) : nouveau fond,
+        # puis artistes animés par-dessus
+        if self.ax is None:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated():
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+
+    def _set_legend(self, count):
+        # La légende n'est refaite que si le nombre de contraintes change
+        if self.legend is not None and len(self.legend.get_texts()) == count + 1:
+            return False
+        if self.legend is not None:
+            self.legend.remove()
+        self.legend = self.ax.legend(handles=_legend_handles(count), loc='upper left', bbox_to_anchor=(1.05, 1),
+                                     fontsize=9, frameon=True, framealpha=0.9)
+        return True
+
+    def _model_changed(self, A, b, senses):
+        model = (np.array(A, dtype=float), np.array(b, dtype=float),
+                 None if senses is None else np.array(senses, dtype="<U2"))
+        previous = self._model
+        if previous is not None and all(
+                (old is None and new is None) or (old is not None and new is not None and np.array_equal(old, new))
+                for old, new in zip(previous, model)):
+            return False
+        self._model = model
+        return True
+
+    def update(self, solution, A, b, senses=None):
+        solution = np.asarray(solution, dtype=float)
+        pair = active_pair(solution)
+        if pair is None:
+            self._update_3d(solution, A, b, senses)
+        else:
+            self._update_2d(solution, A, b, pair)
+
+    def _update_2d(self, solution, A, b, pair):
+        full_redraw = False
+        if self.mode != "2d":
+            self._reset("2d")
+            full_redraw = True
+        i, j = pair
+        current = self.bounds if pair == self.pair else (None, None)
+        bounds = tuple(_axis_limit(max(MIN_BOUNDS[k], solution[k] + MARGIN), MIN_BOUNDS[k], limit)
+                       for k, limit in zip(pair, current))
+
+        # Une ligne par contrainte, créée une fois
+        while len(self.lines) < len(b):
+            color = COLORS[len(self.lines) % len(COLORS)]
+            line, = self.ax.plot([], [], color=color, linewidth=2, animated=True)
+            self.lines.append(line)
+        while len(self.lines) > len(b):
+            self.lines.pop().remove()
+        full_redraw |= self._set_legend(len(b))
+        if pair != self.pair:
+            self.pair = pair
+            self.ax.set_xlabel(f"{VARIABLE_NAMES[i]}, tonnes", **self._label_style)
+            self.ax.set_ylabel(f"{VARIABLE_NAMES[j]}, tonnes", **self._label_style)
+            full_redraw = True
+        if bounds != self.bounds:
+            # Rescale uniquement quand les bornes changent : les graduations sont alors à recalculer
+            self.bounds = bounds
+            self.ax.set_xlim(0, bounds[0])
+            self.ax.set_ylim(0, bounds[1])
+            full_redraw = True
+
+        xs, ys, drawable = constraint_curves(A, b, pair, bounds[0])
+        for line, y, visible in zip(self.lines, ys, drawable):
+            line.set_data(xs, y)
+            line.set_visible(bool(visible))
+        self.marker.set_data([solution[i]], [solution[j]])
+        self.annotation.set_position((solution[i], solution[j]))
+        self.annotation.set_text(f'({solution[i]:.1f}, {solution[j]:.1f})')
+        self._finish(full_redraw)
+
+    def _update_3d(self, solution, A, b, senses):
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+        full_redraw = False
+        if self.mode != "3d":
+            self._reset("3d")
+            full_redraw = True
+        if self._model_changed(A, b, senses):
+            # Géométrie recalculée uniquement quand le modèle change
+            vertices, faces, owners = feasible_polytope(A, b, senses, margin=MARGIN)
+            colors = [COLORS[k % len(COLORS)] if k >= 0 else BOUNDARY_COLOR for k in owners]
+            if self.polytope is None:
+                self.polytope = Poly3DCollection(faces, facecolors=colors, edgecolors='#424242',
+                                                 linewidths=0.6, alpha=0.35)
+                self.ax.add_collection3d(self.polytope)
             else:
-                # If z coefficient is 0, we have a vertical plane
-                if coeffs[1] != 0:
-                    # Calculate Y from X (when Z can be any value)
-                    Y_plane = (limit - coeffs[0] * X) / coeffs[1]
-                    Z_plane = np.zeros_like(X) + z_max/2  # Plot at middle of z-axis
-                    ax.plot_surface(X, Y_plane, Z_plane, alpha=0.3, color=color)
-                elif coeffs[0] != 0:
-                    # Calculate X from Y (when Z can be any value)
-                    X_plane = (limit - coeffs[1] * Y) / coeffs[0]
-                    Z_plane = np.zeros_like(X) + z_max/2  # Plot at middle of z-axis
-                    ax.plot_surface(X_plane, Y, Z_plane, alpha=0.3, color=color)
-        
-        # Ajouter la solution optimale with a more prominent marker
-        ax.scatter([x], [y], [z], marker='o', s=100, color='#E91E63', 
-                   edgecolor='white', linewidth=2, label="Solution optimale")
-        
-        # Add annotation for the optimal solution
-        ax.text(x, y, z, f'({x:.1f}, {y:.1f}, {z:.1f})', 
-                color='#212121', fontsize=10, fontweight='bold')
-        
-        # Définir les limites et ajouter des marges
-        ax.set_xlim(0, x_max)
-        ax.set_ylim(0, y_max)
-        ax.set_zlim(0, z_max)
-        
-        # Améliorer la lisibilité with modern styling
-        ax.set_xlabel("Recyclage (x, tonnes)", fontsize=10, fontweight='bold', color='#424242')
-        ax.set_ylabel("Incinération (y, tonnes)", fontsize=10, fontweight='bold', color='#424242')
-        ax.set_zlabel("Compostage (z, tonnes)", fontsize=10, fontweight='bold', color='#424242')
-        ax.set_title("Optimisation des déchets à Marrakech (3D)", fontsize=14, fontweight='bold', color='#212121', pad=15)
-        
-        # Set a good viewing angle for 3D
-        ax.view_init(elev=30, azim=45)
-        
-        # Add a custom legend
-        legend_elements = []
-        for i in range(len(A)):
-            color = colors[i % len(colors)]
-            legend_elements.append(plt.Line2D([0], [0], color=color, lw=4, label=f"Contrainte {i+1}"))
-        legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#E91E63', 
-                                         markersize=10, label="Solution optimale"))
-    
-    # Ajouter la légende
-    ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.05, 1), 
-              fontsize=9, frameon=True, framealpha=0.9)
-    
-    # Improve grid appearance
-    ax.grid(True, linestyle='--', alpha=0.4, color='#9e9e9e')
-    
-    # Style the ticks
-    ax.tick_params(colors='#616161', labelsize=9)
-    
-    # Add a subtle background color to the entire figure
-    fig.patch.set_facecolor('#f8f9fa')
-    
-    # Ajuster l'agencement pour éviter les chevauchements et assurer une bonne visibilité
-    plt.tight_layout(pad=2.0)
-    
-    # Mettre à jour le canvas et s'assurer que le graphique est visible
-    canvas.draw()
-    canvas.flush_events()
\ No newline at end of file
+                self.polytope.set_verts(faces)
+                self.polytope.set_facecolor(colors)
+            self._extent = vertices.max(axis=0) if vertices.shape[0] else np.zeros(3)
+            full_redraw = True
+        full_redraw |= self._set_legend(len(b))
+        current = self.bounds if self.bounds is not None else (None,) * 3
+        bounds = tuple(_axis_limit(max(MIN_BOUNDS[k], solution[k] + MARGIN, self._extent[k]), MIN_BOUNDS[k],
+                                   current[k]) for k in range(3))
+        if bounds != self.bounds:
+            self.bounds = bounds
+            self.ax.set_xlim(0, bounds[0])
+            self.ax.set_ylim(0, bounds[1])
+            self.ax.set_zlim(0, bounds[2])
+            full_redraw = True
+
+        x, y, z = solution
+        self.marker.set_data_3d([x], [y], [z])
+        self.annotation.set_position_3d((x, y, z))
+        self.annotation.set_text(f'({x:.1f}, {y:.1f}, {z:.1f})')
+        self._finish(full_redraw)
+
+    def _finish(self, full_redraw):
+        if full_redraw:
+            self.canvas.draw()  # _on_draw mémorise le nouveau fond et dessine les artistes animés
+        else:
+            self._blit()
+
+
+def plot_solution(solution, A, b, canvas, fig, senses=None):
+    # Compatibilité : un contrôleur est attaché à la figure au premier appel puis réutilisé
+    controller = getattr(fig, "_plot_controller", None)
+    if controller is None or controller.canvas is not canvas:
+        if controller is not None:
+            controller.disconnect()
+        controller = PlotController(fig, canvas)
+        fig._plot_controller = controller
+    controller.update(solution, A, b, senses)
+    return controller
@@ -0,0 +1,349 @@
+import numpy as np
+
+from src.instrumentation import DEGENERATE_TOL, clock
+from src.pivoting import DEFAULT_PRICING, DEFAULT_RATIO_TEST, Pricer, check_rules
+from src.simplex_solver import (INFEASIBLE, MAX_ITER_REACHED, OPTIMAL, TOL, UNBOUNDED,
+                                solve_tableau)
+
+
+class WarmStartSolver:
+    # Solveur persistant : garde la base optimale et ré-optimise à partir d'elle
+    # (simplexe dual après un changement de second membre ou l'ajout d'une contrainte,
+    # simplexe primal après un changement d'objectif) au lieu de tout recalculer.
+    #
+    # Colonnes du modèle standard : n variables puis une colonne logique par ligne,
+    # sign_i * e_i avec sign = +1 pour "<=" et "=", -1 pour ">=". La logique d'une
+    # ligne "=" est fixée à zéro : elle ne peut jamais entrer en base.
+
+    def __init__(self, c, A, b, senses=None, record_history=False, max_iter=None, progress=None, basis=None,
+                 stats=None, pricing=DEFAULT_PRICING, ratio_test=DEFAULT_RATIO_TEST):
+        # progress(pivots, z) est appelé après chaque pivot, comme pour solve_tableau ;
+        # basis (optionnelle) est une base connue d'un modèle voisin, utilisée comme point de départ ;
+        # stats (SolveStats, optionnel) est remis à zéro puis rempli à chaque résolution ;
+        # pricing sert au simplexe primal et, avec ratio_test, aux résolutions à froid (voir src.pivoting)
+        check_rules(pricing, ratio_test)
+        self.record_history = record_history
+        self.max_iter = max_iter
+        self.progress = progress
+        self.stats = stats
+        self.pricing = pricing
+        self.ratio_test = ratio_test
+        self.pivots = 0
+        self._load(c, A, b, senses)
+        if basis is None:
+            self.solve()
+        else:
+            self.solve_from_basis(basis)
+
+    def _load(self, c, A, b, senses):
+        self.c = np.asarray(c, dtype=float).copy()
+        self.b = np.asarray(b, dtype=float).copy()
+        self.A = np.asarray(A, dtype=float).reshape(self.b.size, self.c.size).copy()
+        self.senses = np.array(["<="] * self.b.size if senses is None else senses, dtype="<U2")
+
+    @property
+    def n_vars(self):
+        return self.c.size
+
+    @property
+    def n_constraints(self):
+        return self.b.size
+
+    def _signs(self):
+        return np.where(self.senses == ">=", -1.0, 1.0)
+
+    def _fixed(self):
+        # Colonnes interdites d'entrée : logiques des lignes "="
+        fixed = np.zeros(self.n_vars + self.n_constraints, dtype=bool)
+        fixed[self.n_vars:] = self.senses == "="
+        return fixed
+
+    def _standard_matrix(self):
+        return np.hstack([self.A, np.diag(self._signs())])
+
+    def _costs(self):
+        return np.concatenate([self.c, np.zeros(self.n_constraints)])
+
+    def _refresh(self):
+        # Recalcule tableau, second membre et coûts réduits à partir de la base courante
+        B = self._standard_matrix()[:, self.basis]
+        solved = np.linalg.solve(B, np.column_stack([self._standard_matrix(), self.b]))
+        self.T, self.rhs = solved[:, :-1], solved[:, -1]
+        self._price()
+
+    def _price(self):
+        costs = self._costs()
+        self.d = costs[self.basis] @ self.T - costs
+        self.z = costs[self.basis] @ self.rhs
+
+    def _snapshot(self):
+        if not self.record_history:
+            if self.stats is not None:
+                self.stats.track_memory(self.T.nbytes)
+            return
+        m = self.n_constraints
+        tableau = np.zeros((m + 1, self.T.shape[1] + 2))
+        tableau[0, 0] = 1
+        tableau[0, 1:-1] = self.d
+        tableau[0, -1] = self.z
+        tableau[1:, 1:-1] = self.T
+        tableau[1:, -1] = self.rhs
+        self.tableaux.append(tableau)
+        if self.stats is not None:
+            self._history_bytes += tableau.nbytes
+            self.stats.track_memory(self.T.nbytes + self._history_bytes)
+
+    def _pivot(self, r, q, step):
+        stats = self.stats
+        if stats is not None:
+            started, leaving = clock(), self.basis[r]
+        pivot = self.T[r, q]
+        self.T[r] /= pivot
+        self.rhs[r] /= pivot
+        factors = self.T[:, q].copy()
+        factors[r] = 0
+        self.T -= np.outer(factors, self.T[r])
+        self.rhs -= factors * self.rhs[r]
+        self.z -= self.d[q] * self.rhs[r]
+        self.d -= self.d[q] * self.T[r]
+        self.basis[r] = q
+        self.pivots += 1
+        if stats is not None:
+            stats.elimination_time += clock() - started
+            stats.record_pivot(self.basis, q, leaving, step)
+        self._snapshot()
+        if self.progress is not None:
+            self.progress(self.pivots, self.z)
+
+    def _primal_simplex(self):
+        fixed = self._fixed()
+        stats = self.stats
+        if stats is not None:
+            stats.enter_phase("primal")
+        pricer = Pricer(self.pricing, fixed.size, TOL)
+        for _ in range(self._iteration_limit()):
+            if stats is not None:
+                started = clock()
+            q = pricer.choose(np.where(fixed, np.inf, self.d), lambda: self.T)
+            if stats is not None:
+                priced = clock()
+                stats.pricing_time += priced - started
+            if q < 0:
+                return OPTIMAL
+            column = self.T[:, q]
+            ratios = np.full(column.shape, np.inf)
+            np.divide(self.rhs, column, out=ratios, where=column > TOL)
+            # Une logique fixée encore en base ne doit pas quitter zéro
+            ratios[fixed[self.basis] & (np.abs(column) > TOL)] = 0.0
+            if np.all(ratios == np.inf):
+                return UNBOUNDED
+            r = int(np.argmin(ratios))
+            if pricer.bland:
+                # Règle de Bland : parmi les ratios minimaux, la sortante de plus petit indice
+                ties = np.flatnonzero(ratios <= ratios[r] + TOL * max(1.0, ratios[r]))
+                r = int(ties[np.argmin(self.basis[ties])])
+            if stats is not None:
+                stats.ratio_time += clock() - priced
+            leaving = self.basis[r]
+            pivot_values = self.T[r].copy() if pricer.weights is not None else None
+            self._pivot(r, q, ratios[r])
+            pricer.pivoted(q, pivot_values, leaving, ratios[r], DEGENERATE_TOL)
+        return MAX_ITER_REACHED
+
+    def _dual_simplex(self):
+        fixed = self._fixed()
+        stats = self.stats
+        if stats is not None:
+            stats.enter_phase("dual")
+        for _ in range(self._iteration_limit()):
+            if stats is not None:
+                started = clock()
+            # Infaisabilité primale : x_B < 0, ou logique fixée non nulle (pricing dual)
+            infeasibility = np.where(fixed[self.basis], np.abs(self.rhs), -self.rhs)
+            r = int(np.argmax(infeasibility))
+            if stats is not None:
+                priced = clock()
+                stats.pricing_time += priced - started
+            if infeasibility[r] <= TOL * max(1.0, np.abs(self.b).max(initial=0.0)):
+                return OPTIMAL
+            # La variable sortante décroît vers zéro si elle est positive, croît sinon
+            row = self.T[r] if self.rhs[r] < 0 else -self.T[r]
+            eligible = (row < -TOL) & ~fixed
+            eligible[self.basis] = False
+            if not np.any(eligible):
+                return INFEASIBLE
+            ratios = np.full(row.shape, np.inf)
+            ratios[eligible] = self.d[eligible] / -row[eligible]
+            q = int(np.argmin(ratios))
+            if stats is not None:
+                stats.ratio_time += clock() - priced
+            # Pas dual : un pas nul laisse l'objectif inchangé (pivot dégénéré)
+            self._pivot(r, q, ratios[q])
+        return MAX_ITER_REACHED
+
+    def _iteration_limit(self):
+        if self.max_iter is not None:
+            return self.max_iter
+        return 50 * (self.n_vars + self.n_constraints) + 100
+
+    def _result(self, status):
+        # Fin d'une résolution : statut et temps total mis à jour
+        self.status = status
+        if self.stats is not None:
+            self.stats.lap()
+        return self.result()
+
+    def result(self):
+        # Dernier résultat, au même format que simplex_manual
+        if self.status != OPTIMAL:
+            return None, None, self.status
+        solution = np.zeros(self.n_vars + self.n_constraints)
+        solution[self.basis] = self.rhs
+        return solution[:self.n_vars], self.z, self.tableaux
+
+    def _start(self):
+        self.tableaux = []
+        self.pivots = 0
+        self._history_bytes = 0
+        if self.stats is not None:
+            self.stats.begin()
+
+    def solve(self):
+        # Résolution à froid (deux phases) ; la base finale sert aux ré-optimisations suivantes
+        self._start()
+        status, solution, z, tableaux, basis = solve_tableau(self.c, self.A, self.b, self.senses, self.max_iter,
+                                                          self.progress, self.stats, self.pricing, self.ratio_test)
+        if self.record_history:
+            self.tableaux = tableaux
+        self.pivots = max(len(tableaux) - 1, 0)
+        if status != OPTIMAL:
+            return self._result(status)
+        self.basis = basis.copy()
+        self._refresh()
+        return self._result(OPTIMAL)
+
+    def solve_from_basis(self, basis):
+        # Départ à chaud depuis une base quelconque : simplexe primal si elle est primale-réalisable,
+        # dual si elle est duale-réalisable, sinon résolution à froid
+        self._start()
+        basis = np.asarray(basis, dtype=np.int64)
+        if basis.size != self.n_constraints or np.unique(basis).size != basis.size \
+                or np.any(basis < 0) or np.any(basis >= self.n_vars + self.n_constraints):
+            return self.solve()
+        self.basis = basis.copy()
+        try:
+            self._refresh()
+        except np.linalg.LinAlgError:
+            return self.solve()
+        fixed = self._fixed()
+        scale = max(1.0, np.abs(self.b).max(initial=0.0))
+        primal_feasible = np.all(np.where(fixed[self.basis], np.abs(self.rhs), -self.rhs) <= TOL * scale)
+        nonbasic = ~fixed
+        nonbasic[self.basis] = False
+        dual_feasible = np.all(self.d[nonbasic] >= -TOL)
+        self._snapshot()
+        if primal_feasible:
+            return self._result(self._primal_simplex())
+        if dual_feasible:
+            return self._result(self._dual_simplex())
+        return self.solve()
+
+    def set_rhs(self, b, basis=None):
+        # Nouveau second membre (vecteur complet) : la base reste duale-réalisable.
+        # basis (optionnelle) remplace la base courante comme point de départ (voir solve_from_basis).
+        self._start()
+        if basis is None:
+            return self._apply_rhs(b)
+        b = np.asarray(b, dtype=float)
+        if b.shape != self.b.shape:
+            raise ValueError(f"Second membre de taille {b.size}, attendu {self.b.size}")
+        self.b = b.copy()
+        return self.solve_from_basis(basis)
+
+    def _apply_rhs(self, b):
+        b = np.asarray(b, dtype=float)
+        if b.shape != self.b.shape:
+            raise ValueError(f"Second membre de taille {b.size}, attendu {self.b.size}")
+        self.b = b.copy()
+        if self.status != OPTIMAL:
+            return self.solve()
+        B = self._standard_matrix()[:, self.basis]
+        self.rhs = np.linalg.solve(B, self.b)
+        self._price()
+        self._snapshot()
+        return self._result(self._dual_simplex())
+
+    def set_rhs_entry(self, i, value):
+        b = self.b.copy()
+        b[i] = value
+        return self.set_rhs(b)
+
+    def set_objective(self, c):
+        # Nouvel objectif : la base reste primale-réalisable
+        self._start()
+        return self._apply_objective(c)
+
+    def _apply_objective(self, c):
+        c = np.asarray(c, dtype=float)
+        if c.shape != self.c.shape:
+            raise ValueError(f"Objectif de taille {c.size}, attendu {self.c.size}")
+        self.c = c.copy()
+        if self.status != OPTIMAL:
+            return self.solve()
+        self._price()
+        self._snapshot()
+        return self._result(self._primal_simplex())
+
+    def add_constraint(self, coeffs, sense, rhs):
+        # Nouvelle ligne : sa logique entre en base, puis simplexe dual si elle est violée
+        self._start()
+        return self._apply_constraint(coeffs, sense, rhs)
+
+    def _apply_constraint(self, coeffs, sense, rhs):
+        coeffs = np.asarray(coeffs, dtype=float)
+        previous_status = self.status
+        n, m = self.n_vars, self.n_constraints
+        self.A = np.vstack([self.A, coeffs])
+        self.b = np.append(self.b, float(rhs))
+        self.senses = np.append(self.senses, sense)
+        if previous_status != OPTIMAL:
+            return self.solve()
+        sign = -1.0 if sense == ">=" else 1.0
+
+        # Nouvelle colonne logique (indice n + m, la dernière), la ligne est exprimée dans la base
+        # courante : les colonnes de base du tableau forment l'identité, une seule combinaison suffit
+        self.T = np.hstack([self.T, np.zeros((m, 1))])
+        self.d = np.append(self.d, 0.0)
+        row = np.concatenate([coeffs, np.zeros(m), [sign]])
+        factors = row[self.basis]
+        row -= factors @ self.T
+        value = float(rhs) - factors @ self.rhs
+        self.T = np.vstack([self.T, row / sign])
+        self.rhs = np.append(self.rhs, value / sign)
+        self.basis = np.append(self.basis, n + m)
+        self._snapshot()
+        return self._result(self._dual_simplex())
+
+    def update(self, c, A, b, senses=None):
+        # Choisit le chemin le moins coûteux en comparant au modèle courant :
+        # contraintes ajoutées, second membre ou objectif modifiés ; sinon résolution à froid.
+        c = np.asarray(c, dtype=float)
+        b = np.asarray(b, dtype=float)
+        A = np.asarray(A, dtype=float).reshape(b.size, c.size)
+        senses = np.array(["<="] * b.size if senses is None else senses, dtype="<U2")
+        m = self.n_constraints
+        same_structure = c.size == self.n_vars and b.size >= m and np.array_equal(A[:m], self.A) \
+            and np.array_equal(senses[:m], self.senses)
+        if not same_structure:
+            self._load(c, A, b, senses)
+            return self.solve()
+
+        self._start()
+        result = self.result()
+        if not np.array_equal(c, self.c):
+            result = self._apply_objective(c)
+        if not np.array_equal(b[:m], self.b):
+            result = self._apply_rhs(b[:m])
+        for i in range(m, b.size):
+            result = self._apply_constraint(A[i], senses[i], b[i])
+        return result
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Les tests importent les modules comme l'application : src.*, data.* depuis la racine du dépôt
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def optimize():
+    # Référence scipy (linprog, milp) : absente de requirements.txt, seuls les tests qui la demandent
+    # sont ignorés sans elle
+    return pytest.importorskip("scipy.optimize")
+
+
+def random_model(rng, n=(2, 7), m=(2, 9), coeffs=(-3, 8), rhs=(0, 30), costs=None, senses=(0.7, 0.2, 0.1),
+                 zeros=0.4):
+    # Modèle aléatoire (c, A, b, sens) à coefficients entiers. n, m, coeffs, rhs et costs (coeffs par
+    # défaut) sont des intervalles [bas, haut) ; senses : probabilités de "<=", ">=" et "=" ; zeros :
+    # proportion de coefficients mis à zéro
+    n, m = rng.integers(*n), rng.integers(*m)
+    A = rng.integers(*coeffs, (m, n)).astype(float)
+    A[rng.random((m, n)) < zeros] = 0
+    b = rng.integers(*rhs, m).astype(float)
+    c = rng.integers(*(costs or coeffs), n).astype(float)
+    return c, A, b, rng.choice(["<=", ">=", "="], m, p=senses)
+
+
+def _bounds(n, lower, upper):
+    lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+    upper = np.full(n, np.inf) if upper is None else np.asarray(upper, dtype=float)
+    return lower, upper
+
+
+def feasible(x, A, b, senses, lower=None, upper=None, tol=1e-6):
+    # x respecte les contraintes et les bornes (0 et +inf par défaut) à tol près
+    lower, upper = _bounds(len(x), lower, upper)
+    lhs = np.asarray(A) @ x
+    return bool(np.all(x >= lower - tol) and np.all(x <= upper + tol)
+                and np.all(lhs[senses == "<="] <= b[senses == "<="] + tol)
+                and np.all(lhs[senses == ">="] >= b[senses == ">="] - tol)
+                and np.all(np.abs(lhs - b)[senses == "="] <= tol))
+
+
+def linprog(optimize, c, A, b, senses, lower=None, upper=None):
+    # Référence HiGHS de max c x sous A x (<=, >=, =) b, lower <= x <= upper
+    lower, upper = _bounds(len(c), lower, upper)
+    A, b, senses = np.asarray(A, dtype=float), np.asarray(b, dtype=float), np.asarray(senses)
+    inequalities, equalities = senses != "=", senses == "="
+    A_ub = np.vstack([A[senses == "<="], -A[senses == ">="]])
+    b_ub = np.concatenate([b[senses == "<="], -b[senses == ">="]])
+    return optimize.linprog(-np.asarray(c, dtype=float),
+                            A_ub=A_ub if inequalities.any() else None, b_ub=b_ub if inequalities.any() else None,
+                            A_eq=A[equalities] if equalities.any() else None,
+                            b_eq=b[equalities] if equalities.any() else None,
+                            bounds=[(l, u if np.isfinite(u) else None) for l, u in zip(lower, upper)],
+                            method="highs")
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from data.marrakech_data import CONSTRAINTS_DEFAULT, OBJECTIVE_DEFAULT
+from src.sensitivity import dual_values, sensitivity_analysis
+from src.simplex_solver import OPTIMAL, bounded_basis, bounds_as_rows, solve_tableau
+from src.solver import parse, solve
+
+from conftest import feasible, linprog, random_model
+
+
+def _bounded_model(rng, lower_min=-3):
+    # Modèle aléatoire et bornes : environ 30 % de bornes inférieures non nulles, 60 % de bornes supérieures
+    c, A, b, senses = random_model(rng, n=(1, 7), m=(0, 6), coeffs=(-5, 6), rhs=(-10, 30),
+                                   senses=(0.6, 0.25, 0.15), zeros=0)
+    n = c.size
+    lower = np.where(rng.random(n) < 0.3, rng.integers(lower_min, 4, n), 0).astype(float)
+    upper = np.where(rng.random(n) < 0.6, lower + rng.integers(0, 8, n), np.inf)
+    return c, A, b, senses, lower, upper
+
+
+@pytest.mark.parametrize("ratio_test", ["textbook", "harris"])
+@pytest.mark.parametrize("pricing", ["dantzig", "bland", "steepest", "devex", "partial"])
+def test_matches_linprog(optimize, pricing, ratio_test):
+    rng = np.random.default_rng(len(pricing) + len(ratio_test))
+    for _ in range(60):
+        c, A, b, senses, lower, upper = _bounded_model(rng)
+        status, x, z, _, _ = solve_tableau(c, A, b, senses, lower=lower, upper=upper, pricing=pricing,
+                                           ratio_test=ratio_test)
+        reference = linprog(optimize, c, A, b, senses, lower, upper)
+        # HiGHS peut déclarer infaisable un modèle non borné : seuls les optimums sont comparés
+        assert (status == OPTIMAL) == (reference.status == 0)
+        if status == OPTIMAL:
+            assert z == pytest.approx(-reference.fun, abs=1e-6)
+            assert feasible(x, A, b, senses, lower, upper)
+
+
+def test_bounds_as_rows_basis():
+    rng = np.random.default_rng(1)
+    checked = 0
+    for _ in range(500):
+        c, A, b, senses, lower, upper = _bounded_model(rng, lower_min=0)
+        status, x, z, _, basis = solve_tableau(c, A, b, senses, lower=lower, upper=upper)
+        if status != OPTIMAL:
+            continue
+        c2, A2, b2, senses2 = bounds_as_rows(c, A, b, senses, lower, upper)
+        rows_basis = bounded_basis(basis, x, b.size, lower, upper)
+        assert rows_basis.size == b2.size and np.unique(rows_basis).size == b2.size
+        y = dual_values(c2, A2, b2, senses2, rows_basis)
+        assert y @ b2 == pytest.approx(z, abs=1e-6)
+        report = sensitivity_analysis(c2, A2, b2, senses2, basis=rows_basis)
+        assert report["objective"] == pytest.approx(z, abs=1e-6)
+        checked += 1
+    assert checked > 100
+
+
+def test_solve_methods_agree():
+    rng = np.random.default_rng(5)
+    for _ in range(100):
+        c, A, b, _ = random_model(rng, n=(2, 6), m=(1, 5), coeffs=(0, 6), costs=(-2, 8), senses=(1, 0, 0),
+                                  zeros=0)
+        n = c.size
+        upper = np.where(rng.random(n) < 0.7, rng.integers(0, 6, n), np.inf)
+        results = [solve(c, A, b, method=method, upper=upper, sensitivity=True) for method in ("tableau", "revised")]
+        results.append(solve(c, A, b, upper=upper, presolve=True, sensitivity=True))
+        statuses = {result["status"] for result in results}
+        assert len(statuses) == 1
+        if OPTIMAL not in statuses:
+            continue
+        z = results[0]["objective"]
+        for result in results:
+            assert result["objective"] == pytest.approx(z, abs=1e-6)
+            assert result["sensitivity"]["objective"] == pytest.approx(z, abs=1e-6)
+            assert np.all(result["solution"] <= upper + 1e-7)
+        milp = solve(c, A, b, upper=upper, integer=list(range(n)))
+        if milp["solution"] is not None:
+            x = milp["solution"]
+            assert np.allclose(x, np.round(x)) and np.all(x <= upper + 1e-7) and np.all(A @ x <= b + 1e-6)
+            assert milp["objective"] <= z + 1e-6
+
+
+def test_marrakech_capacities_as_bounds():
+    c, A, b, senses, names = parse(OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT)
+    keep = [0, 4]  # budget et production ; les capacités passent en bornes
+    result = solve(c, A[keep], b[keep], senses[keep], names=names, upper=[800, 600, 400], sensitivity=True)
+    assert result["objective"] == pytest.approx(1644.0)
+    assert result["sensitivity"]["objective"] == pytest.approx(1644.0)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src.branch_and_bound import NO_INTEGER_SOLUTION, branch_and_bound
+from src.simplex_solver import INFEASIBLE, OPTIMAL
+from src.solver import solve
+from src.sparse import CSCMatrix
+
+from conftest import random_model
+
+
+def _random_milp(rng):
+    c, A, b, _ = random_model(rng, n=(2, 6), m=(1, 5), coeffs=(1, 9), rhs=(5, 40), costs=(1, 10),
+                              senses=(1, 0, 0), zeros=0)
+    return c, A, b
+
+
+def _reference(optimize, c, A, b, integrality, upper=np.inf):
+    return optimize.milp(-c, constraints=optimize.LinearConstraint(A, -np.inf, b), integrality=integrality,
+                         bounds=optimize.Bounds(0, upper))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_scipy_milp(optimize, seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(25):
+        c, A, b = _random_milp(rng)
+        integer = rng.random(c.size) < 0.7
+        status, solution, z, info = branch_and_bound(c, A, b, integer=integer)
+        reference = _reference(optimize, c, A, b, integer.astype(int))
+        assert reference.status == 0 and status == OPTIMAL
+        assert z == pytest.approx(-reference.fun, rel=1e-6, abs=1e-6)
+        assert np.all(A @ solution <= b + 1e-7)
+        assert np.allclose(solution[integer], np.round(solution[integer]))
+        assert info["gap"] <= 1e-6
+
+
+def test_binary_knapsack(optimize):
+    rng = np.random.default_rng(7)
+    values, weights = rng.integers(5, 30, 12).astype(float), rng.integers(3, 20, 12).astype(float)
+    capacity = np.array([weights.sum() / 2])
+    status, solution, z, _ = branch_and_bound(values, weights[None, :], capacity, binary=range(12))
+    reference = _reference(optimize, values, weights[None, :], capacity, np.ones(12), upper=1)
+    assert status == OPTIMAL
+    assert z == pytest.approx(-reference.fun)
+    assert set(np.round(solution).tolist()) <= {0.0, 1.0}
+
+
+def test_infeasible_and_node_limit():
+    # 2 x = 1 n'a pas de solution entière ; la relaxation est réalisable
+    status, solution, _, _ = branch_and_bound([1.0], [[2.0]], [1.0], senses=["="], integer=[0])
+    assert status == INFEASIBLE and solution is None
+    c, A, b = [1.0, 1.0], [[2.0, 2.0]], [3.0]
+    status, _, _, info = branch_and_bound(c, A, b, senses=["="], node_limit=1)
+    assert status in (INFEASIBLE, NO_INTEGER_SOLUTION)
+    assert info["nodes"] <= 2
+
+
+def test_parallel_workers_and_sparse_input():
+    rng = np.random.default_rng(11)
+    c, A, b = _random_milp(rng)
+    sequential = branch_and_bound(c, A, b)
+    parallel = branch_and_bound(c, CSCMatrix.from_any(A), b, workers=2)
+    assert parallel[0] == sequential[0] == OPTIMAL
+    assert parallel[2] == pytest.approx(sequential[2])
+
+
+def test_solve_rejects_options_without_integer_support():
+    with pytest.raises(ValueError):
+        solve([1.0], [[1.0]], [2.5], integer=[0], presolve=True)
+    result = solve([1.0], [[1.0]], [2.5], integer=[0])
+    assert result["solution"][0] == pytest.approx(2.0)
+    assert result["presolve"] is None and result["milp"]["nodes"] >= 1
+
+
+@pytest.mark.parametrize("integer", [np.array([True, False]), [True, False], np.array([0]), [0], ["x1"], (0,)])
+def test_solve_integer_selection_forms(integer):
+    # Seule x1 est entière : x1 = 1, x2 = 0.5
+    result = solve([1.0, 1.0], [[2.0, 2.0]], [3.0], integer=integer)
+    assert result["milp"] is not None
+    assert result["objective"] == pytest.approx(1.5)
+    assert result["solution"][0] == pytest.approx(round(result["solution"][0]))
+
+
+@pytest.mark.parametrize("integer", [None, [], np.array([], dtype=int), [False, False]])
+def test_solve_without_integer_selection(integer):
+    result = solve([1.0, 1.0], [[2.0, 2.0]], [3.0], integer=integer)
+    assert result["milp"] is None and result["objective"] == pytest.approx(1.5)
+
+
+def test_solve_rejects_bad_integer_selection():
+    with pytest.raises(ValueError):
+        solve([1.0, 1.0], [[2.0, 2.0]], [3.0], integer=[True])
+    with pytest.raises(ValueError):
+        solve([1.0, 1.0], [[2.0, 2.0]], [3.0], integer=[2])
+    with pytest.raises(ValueError):
+        solve([1.0, 1.0], [[2.0, 2.0]], [3.0], integer=["w"])
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.model_io import cache_path, load_model, read_lp, read_mps, to_text, write_model
+from src.solver import parse, solve
+from src.sparse import CSCMatrix
+
+from conftest import random_model
+
+
+def _random_model(rng):
+    # Coefficients et seconds membres au demi près, écrits et relus exactement
+    c, A, b, senses = random_model(rng, m=(1, 6), coeffs=(-4, 6), rhs=(-5, 30), costs=(-3, 8),
+                                   senses=(1 / 3, 1 / 3, 1 / 3), zeros=0.3)
+    m, n = A.shape
+    A, b = A / 2, b / 2
+    A[np.arange(m), rng.integers(0, n, m)] = rng.integers(1, 5, m)  # aucune ligne vide
+    c[c == 0] = 1.0  # chaque variable apparaît dans l'objectif, même si sa colonne est vide
+    names = [f"v{j}" for j in range(n)]
+    integer = [name for name in names if rng.random() < 0.3]
+    return c, A, b, senses, names, integer
+
+
+def _dense(A):
+    return A.toarray() if isinstance(A, CSCMatrix) else np.asarray(A)
+
+
+def _reorder(c, A, names, expected):
+    # Les formats LP et texte numérotent les variables dans leur ordre d'apparition
+    order = [list(names).index(name) for name in expected]
+    return np.asarray(c)[order], _dense(A)[:, order]
+
+
+@pytest.mark.parametrize("extension", [".lp", ".mps", ".txt"])
+def test_round_trip(tmp_path, extension):
+    rng = np.random.default_rng(len(extension))
+    for k in range(30):
+        c, A, b, senses, names, integer = _random_model(rng)
+        if extension == ".txt":
+            integer = []  # le format texte ne déclare pas d'entiers
+        path = str(tmp_path / f"model{k}{extension}")
+        write_model(path, c, A, b, senses, names, integer)
+        for sparse in (True, False):
+            c2, A2, b2, senses2, names2, integer2 = load_model(path, sparse=sparse)
+            assert isinstance(A2, CSCMatrix) == sparse
+            assert sorted(names2) == sorted(names) and sorted(integer2) == sorted(integer)
+            c2, A2 = _reorder(c2, A2, names2, names)
+            assert np.array_equal(c2, c) and np.array_equal(b2, b)
+            assert np.array_equal(A2, A) and list(senses2) == list(senses)
+
+
+def test_lp_bounds_become_rows(tmp_path):
+    path = tmp_path / "bounds.lp"
+    path.write_text("Minimize\n obj: - x - 2 y\nSubject To\n c1: x + y <= 10\nBounds\n 1 <= x <= 4\n y <= 3\n"
+                    "Binary\n z\nEnd\n")
+    c, A, b, senses, names, integer = read_lp(str(path), sparse=False)
+    assert names == ["x", "y", "z"] and integer == ["z"]
+    assert np.array_equal(c, [1.0, 2.0, 0.0])  # minimisation ramenée à une maximisation
+    result = solve(c, A, b, senses, names=names)
+    assert result["objective"] == pytest.approx(10.0)
+    assert result["solution"][:2] == pytest.approx([4.0, 3.0])
+
+
+def test_lp_and_mps_agree(tmp_path):
+    rng = np.random.default_rng(3)
+    c, A, b, senses, names, integer = _random_model(rng)
+    write_model(str(tmp_path / "m.lp"), c, A, b, senses, names, integer)
+    write_model(str(tmp_path / "m.mps"), c, A, b, senses, names, integer)
+    c1, A1, b1, senses1, names1, integer1 = read_lp(str(tmp_path / "m.lp"), sparse=False)
+    c2, A2, b2, senses2, names2, integer2 = read_mps(str(tmp_path / "m.mps"), sparse=False)
+    assert names2 == names and sorted(integer1) == sorted(integer2)
+    c1, A1 = _reorder(c1, A1, names1, names2)
+    assert np.array_equal(c1, c2) and np.array_equal(A1, A2) and np.array_equal(b1, b2)
+    assert list(senses1) == list(senses2)
+
+
+def test_cache_round_trip_and_invalidation(tmp_path):
+    rng = np.random.default_rng(5)
+    c, A, b, senses, names, integer = _random_model(rng)
+    path = str(tmp_path / "m.lp")
+    write_model(path, c, A, b, senses, names, integer)
+    first = load_model(path, sparse=False, cache=True)
+    assert os.path.isdir(cache_path(path))
+    cached = load_model(path, sparse=False, cache=True)
+    for left, right in zip(first, cached):
+        assert np.array_equal(np.asarray(left), np.asarray(right))
+    # Fichier modifié : le cache est périmé et réécrit
+    write_model(path, c * 2, A, b, senses, names, integer)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert np.array_equal(load_model(path, sparse=False, cache=True)[0], c * 2)
+
+
+def test_to_text_is_parsed_back():
+    rng = np.random.default_rng(9)
+    c, A, b, senses, names, _ = _random_model(rng)
+    objective, constraints = to_text(c, A, b, senses, names)
+    c2, A2, b2, senses2, names2 = parse(objective, constraints, variables=names)
+    assert sorted(names2) == sorted(names)
+    c2, A2 = _reorder(c2, A2, names2, names)
+    assert np.array_equal(c2, c) and np.array_equal(A2, A) and np.array_equal(b2, b)
+    assert list(senses2) == list(senses)
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_integer_only_variable_is_declared(tmp_path, sparse):
+    path = tmp_path / "general.lp"
+    path.write_text("Maximize\n obj: x\nSubject To\n c1: x <= 3\nGeneral\n w\nEnd\n")
+    c, A, b, senses, names, integer = read_lp(str(path), sparse=sparse)
+    assert names == ["x", "w"] and integer == ["w"]
+    assert c.shape == (2,) and _dense(A).shape == (1, 2)
+    result = solve(c, A, b, senses, names=names, integer=integer)
+    assert result["objective"] == pytest.approx(3.0)
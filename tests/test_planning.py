@@ -0,0 +1,113 @@
+import csv
+
+import numpy as np
+import pytest
+
+from data.marrakech_data import PRODUCTION_ROW
+from src.batch import default_model
+from src.planning import RollingHorizon, horizon_model, main, plan_horizon
+from src.simplex_solver import OPTIMAL, solve_tableau
+from src.warm_start import WarmStartSolver
+
+from conftest import linprog, random_model
+
+STORAGE = [(np.inf, 0.0), (500, 0.01), (300, 0.5)]
+
+
+def _forecasts(b, days, seed=0):
+    rng = np.random.default_rng(seed)
+    forecasts = np.tile(b, (days, 1))
+    forecasts[:, PRODUCTION_ROW] = rng.integers(1300, 2300, days)
+    forecasts[:, 0] = rng.integers(900000, 1600000, days)
+    return forecasts
+
+
+@pytest.mark.parametrize("capacity, holding", STORAGE)
+def test_plan_horizon_matches_linprog(optimize, capacity, holding):
+    c, A, b, senses, names = default_model()
+    forecasts = _forecasts(b, 7)
+    model = horizon_model(c, A, b, senses, forecasts, [PRODUCTION_ROW], 100, capacity, holding, names)
+    reference = linprog(optimize, *model[:4])
+    assert reference.status == 0
+    for options in ({}, {"method": "revised"}, {"presolve": True}):
+        result = plan_horizon(c, A, b, senses, forecasts, carried=[PRODUCTION_ROW], initial_stock=100,
+                              storage_capacity=capacity, holding_cost=holding, names=names, **options)
+        assert result["status"] == OPTIMAL
+        assert result["objective"] == pytest.approx(-reference.fun, rel=1e-9)
+        assert result["decisions"].shape == (7, 3) and result["stock"].shape == (7, 1)
+        assert np.all(result["stock"] <= capacity + 1e-6)
+
+
+@pytest.mark.parametrize("shift_basis", [True, False])
+@pytest.mark.parametrize("capacity, holding", STORAGE)
+def test_rolling_matches_cold_solve(capacity, holding, shift_basis):
+    c, A, b, senses, names = default_model()
+    forecasts = _forecasts(b, 20, seed=1)
+    for window in (3, 7):
+        planner = RollingHorizon(c, A, b, senses, forecasts, window, carried=[PRODUCTION_ROW], initial_stock=100,
+                                 storage_capacity=capacity, holding_cost=holding, names=names,
+                                 shift_basis=shift_basis)
+        for _ in range(forecasts.shape[0] - 1):
+            plan = planner.advance()
+            model = horizon_model(c, A, b, senses, planner._window_forecasts(), [PRODUCTION_ROW], planner.stock,
+                                  capacity, holding)
+            status, _, z, _, _ = solve_tableau(*model[:4])
+            assert plan["status"] == status
+            if status == OPTIMAL:
+                assert plan["objective"] == pytest.approx(z, rel=1e-9)
+        assert len(planner.committed) == forecasts.shape[0] - 1
+
+
+def test_integer_planning():
+    # Production 2.5 puis 3 par jour, report du surplus : y doit rester entier chaque jour
+    c, A, b, senses = [1.0, 1.0], np.array([[1.0, 0.0], [0.0, 1.0]]), [2.0, 10.0], ["<=", "<="]
+    forecasts = [[2.0, 2.5], [2.0, 3.0]]
+    relaxed = plan_horizon(c, A, b, senses, forecasts, carried=[1], names=["x", "y"])
+    result = plan_horizon(c, A, b, senses, forecasts, carried=[1], names=["x", "y"], integer=["y"])
+    assert result["status"] == OPTIMAL and result["milp"] is not None
+    assert np.allclose(result["decisions"][:, 1], np.round(result["decisions"][:, 1]))
+    assert result["objective"] <= relaxed["objective"] + 1e-9
+    assert result["objective"] == pytest.approx(9.0)
+
+
+def test_set_rhs_with_basis_matches_cold_solve():
+    rng = np.random.default_rng(4)
+    for _ in range(100):
+        c, A, b, _ = random_model(rng, n=(2, 6), m=(2, 6), coeffs=(1, 8), rhs=(5, 40), costs=(1, 9),
+                                  senses=(1, 0, 0), zeros=0)
+        n, m = c.size, b.size
+        solver = WarmStartSolver(c, A, b)
+        basis = solver.basis.copy()
+        for _ in range(3):
+            new_b = rng.integers(0, 40, m).astype(float)
+            # Départ depuis une base quelconque (éventuellement celle d'un autre second membre)
+            solution, z, _ = solver.set_rhs(new_b, basis if rng.random() < 0.5 else rng.permutation(n + m)[:m])
+            cold_status, cold_x, cold_z, _, _ = solve_tableau(c, A, new_b)
+            assert solver.status == cold_status
+            if cold_status == OPTIMAL:
+                assert z == pytest.approx(cold_z, abs=1e-6)
+                assert np.all(A @ solution <= new_b + 1e-6) and np.all(solution >= -1e-7)
+
+
+@pytest.mark.parametrize("window", [None, 3])
+def test_day_objectives_include_holding_cost(tmp_path, window):
+    # Les objectifs journaliers du plan écrit s'additionnent à l'objectif optimisé sur l'horizon
+    c, A, b, senses, names = default_model()
+    forecasts = np.tile(b, (5, 1))
+    # Production au-delà puis en deçà de la capacité de traitement (1800) : du stock est reporté
+    forecasts[:, PRODUCTION_ROW] = [2500, 1000, 2500, 1000, 1000]
+    path = tmp_path / "prevues.csv"
+    path.write_text("\n".join([",".join(f"b{i + 1}" for i in range(b.size))]
+                              + [",".join(f"{value:g}" for value in row) for row in forecasts]))
+    output = tmp_path / "plan.csv"
+    argv = ["--forecasts", str(path), "--days", "5", "--holding-cost", "0.5", "--output", str(output)]
+    assert main(argv + ([] if window is None else ["--window", str(window)])) == 0
+    rows = list(csv.DictReader(output.open(encoding="utf-8")))
+    stock = np.array([float(row["stock5"]) for row in rows])
+    objectives = np.array([float(row["objectif"]) for row in rows])
+    decisions = np.array([[float(row[name]) for name in names] for row in rows])
+    assert np.any(stock > 0)
+    assert objectives == pytest.approx(decisions @ c - 0.5 * stock)
+    if window is None:
+        result = plan_horizon(c, A, b, senses, forecasts, carried=[PRODUCTION_ROW], holding_cost=0.5, names=names)
+        assert objectives.sum() == pytest.approx(result["objective"])
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from data.marrakech_data import CONSTRAINTS_DEFAULT, OBJECTIVE_DEFAULT
+from src.presolve import _FLIP, presolve
+from src.sensitivity import dual_values, sensitivity_analysis
+from src.simplex_solver import INFEASIBLE, OPTIMAL, solve_tableau
+from src.solver import parse, solve
+from src.sparse import CSCMatrix
+
+from conftest import feasible, random_model
+
+
+def _reducible_model(rng):
+    # Modèle aléatoire complété de lignes singletons et d'une ligne parallèle, pour que la présolution
+    # ait quelque chose à retirer
+    c, A, b, senses = random_model(rng, costs=(-3, 9))
+    n = c.size
+    for _ in range(rng.integers(0, 4)):
+        row = np.zeros(n)
+        row[rng.integers(n)] = rng.choice([1, 2, -1, 0.5])
+        A, b = np.vstack([A, row]), np.r_[b, rng.integers(-2, 12)]
+        senses = np.append(senses, rng.choice(["<=", ">=", "="], p=[0.6, 0.3, 0.1]))
+    if rng.random() < 0.5:
+        i, f = rng.integers(b.size), rng.choice([2.0, -1.0, 0.5])
+        A, b = np.vstack([A, A[i] * f]), np.r_[b, b[i] * f + rng.integers(-2, 3)]
+        senses = np.append(senses, senses[i] if f > 0 else _FLIP[senses[i]])
+    return c, A, b, senses
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_matches_cold_solve(sparse):
+    rng = np.random.default_rng(3)
+    optimal = 0
+    for _ in range(300):
+        c, A, b, senses = _reducible_model(rng)
+        status, _, z, _, _ = solve_tableau(c, A, b, senses)
+        (rc, rA, rb, rs), post = presolve(c, CSCMatrix.from_any(A) if sparse else A, b, senses)
+        if post.status is not None:
+            assert status == INFEASIBLE
+            continue
+        rA = rA.toarray() if sparse else rA
+        if rc.size == 0:
+            reduced = (OPTIMAL, np.zeros(0), 0.0, [], np.zeros(0, dtype=int))
+        else:
+            reduced = solve_tableau(rc, rA, rb, rs)
+        assert reduced[0] == status
+        if status != OPTIMAL:
+            continue
+        optimal += 1
+        x, objective = post.solution(reduced[1]), post.objective(reduced[2])
+        assert objective == pytest.approx(z, abs=1e-6)
+        assert feasible(x, A, b, senses)
+        y = post.duals(dual_values(rc, rA, rb, rs, reduced[4]) if rb.size else np.zeros(0), c, A)
+        assert y @ b == pytest.approx(z, abs=1e-6)
+        basis = post.basis(reduced[4], x, y)
+        assert basis.size == b.size and np.unique(basis).size == basis.size
+        report = sensitivity_analysis(c, A, b, senses, basis=basis)
+        assert report["objective"] == pytest.approx(z, abs=1e-6)
+        assert np.allclose(report["shadow_prices"], y, atol=1e-6)
+    assert optimal > 50
+
+
+@pytest.mark.parametrize("method", ["tableau", "revised"])
+def test_solve_with_presolve(method):
+    rng = np.random.default_rng(7)
+    for _ in range(300):
+        c, A, b, senses = _reducible_model(rng)
+        if method == "revised":
+            senses = np.full(b.size, "<=")
+            b = np.abs(b)
+        cold = solve(c, A, b, senses, method=method)
+        warm = solve(c, A, b, senses, method=method, presolve=True, sensitivity=True)
+        assert warm["status"] == cold["status"]
+        if cold["status"] == OPTIMAL:
+            assert warm["objective"] == pytest.approx(cold["objective"], abs=1e-6)
+            assert feasible(warm["solution"], A, b, senses)
+            assert warm["sensitivity"]["objective"] == pytest.approx(cold["objective"], abs=1e-6)
+
+
+def test_bounds_stay_in_simplex():
+    rng = np.random.default_rng(11)
+    for _ in range(200):
+        c, A, b, senses = _reducible_model(rng)
+        status, _, z, _, _ = solve_tableau(c, A, b, senses)
+        (rc, rA, rb, rs), post = presolve(c, A, b, senses, bounds=True)
+        if post.status is not None or rc.size == 0:
+            continue
+        reduced = solve_tableau(rc, rA, rb, rs, upper=post.upper)
+        assert reduced[0] == status
+        if status == OPTIMAL:
+            assert post.objective(reduced[2]) == pytest.approx(z, abs=1e-6)
+            assert feasible(post.solution(reduced[1]), A, b, senses)
+
+
+def test_revised_with_negative_reduced_rhs():
+    # Le décalage de la borne x >= 3 rend b négatif dans le modèle réduit
+    c, A, b = [-1.0, 1.0], [[-1.0, 0.0], [1.0, -1.0], [0.0, 1.0]], [-3.0, 1.0, 10.0]
+    result = solve(c, A, b, method="revised", presolve=True)
+    assert result["status"] == OPTIMAL
+    assert result["objective"] == pytest.approx(7.0)
+
+
+def test_marrakech_budget_row_removed():
+    c, A, b, senses, names = parse(OBJECTIVE_DEFAULT, CONSTRAINTS_DEFAULT)
+    result = solve(c, A, b, senses, names=names, presolve=True, sensitivity=True)
+    assert result["objective"] == pytest.approx(1644.0)
+    # Les capacités deviennent des lignes x' <= u, sauf si le simplexe garde les bornes (tableau)
+    assert presolve(c, A, b, senses)[1].summary().startswith("Présolution : 5 -> 4 lignes")
+    assert result["presolve"].summary().startswith("Présolution : 5 -> 1 lignes")
+
+
+def test_infeasible_summary():
+    _, post = presolve([1.0], [[1.0], [1.0]], [5.0, 8.0], ["<=", ">="])
+    assert post.status == INFEASIBLE
+    assert post.summary() == f"Présolution : {INFEASIBLE}"